@@ -15,6 +15,10 @@ from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts/strings"))
+
+from i18n_core import YAML_LOADER, flatten_items, load_locale, stringify_value  # noqa: E402
+
 DEFAULT_ENGLISH_PATH = "@en.yaml"
 
 
@@ -110,28 +114,8 @@ def collect_unique_keys(root: Node | None) -> List[str]:
     return sorted(set(result))
 
 
-def flatten_data(data: Any, prefix: str = "") -> List[tuple[str, str]]:
-    flattened: List[tuple[str, str]] = []
-    if isinstance(data, dict):
-        for key, value in data.items():
-            next_prefix = f"{prefix}.{key}" if prefix else str(key)
-            flattened.extend(flatten_data(value, next_prefix))
-    elif isinstance(data, list):
-        for index, item in enumerate(data):
-            next_prefix = f"{prefix}[{index}]" if prefix else f"[{index}]"
-            flattened.extend(flatten_data(item, next_prefix))
-    else:
-        if prefix:
-            flattened.append((prefix, stringify_value(data)))
-    return flattened
-
-
-def stringify_value(value: Any) -> str:
-    if value is None:
-        return "null"
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    return str(value).strip()
+def flatten_data(data: Any) -> List[tuple[str, str]]:
+    return [(path, stringify_value(value)) for path, value in flatten_items(data)]
 
 
 def group_values(pairs: List[tuple[str, str]]) -> dict[str, List[str]]:
@@ -150,7 +134,7 @@ def format_value(value: str) -> str:
 
 def detect_duplicates(yaml_path: Path) -> List[DuplicateEntry]:
     content = yaml_path.read_text(encoding="utf-8")
-    root = yaml.compose(content, Loader=yaml.SafeLoader)
+    root = yaml.compose(content, Loader=YAML_LOADER)
     if root is None:
         return []
 
@@ -197,8 +181,8 @@ def main() -> None:
     print_duplicates(duplicates, args.json)
 
     primary_content = target_path.read_text(encoding="utf-8")
-    primary_root = yaml.compose(primary_content, Loader=yaml.SafeLoader)
-    primary_data = yaml.safe_load(primary_content) or {}
+    primary_root = yaml.compose(primary_content, Loader=YAML_LOADER)
+    primary_data = load_locale(target_path)
     primary_keys = collect_unique_keys(primary_root)
 
     if args.compare:
@@ -207,8 +191,8 @@ def main() -> None:
             raise FileNotFoundError(f"Comparison YAML file not found: {compare_path}")
 
         secondary_content = compare_path.read_text(encoding="utf-8")
-        secondary_root = yaml.compose(secondary_content, Loader=yaml.SafeLoader)
-        secondary_data = yaml.safe_load(secondary_content) or {}
+        secondary_root = yaml.compose(secondary_content, Loader=YAML_LOADER)
+        secondary_data = load_locale(compare_path)
 
         secondary_keys = collect_unique_keys(secondary_root)
         common_keys = sorted(set(primary_keys) & set(secondary_keys))
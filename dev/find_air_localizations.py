@@ -1,23 +1,43 @@
 #!/usr/bin/env python3
-"""Generate a usage table for mobile localization keys across iOS and Android codebases."""
+"""Generate a usage table for mobile localization keys across iOS and Android codebases.
+
+With --index, lang() calls and LocaleController references come from the shared SQLite source
+index (mobile/ios/Air/scripts/source_index.py): sources are extracted once for all keys, and
+only files changed since the last run are read again.
+
+--trace OUT.json and --profile show where a run spends its time (see mobile/ios/Air/scripts/tracing.py).
+"""
 
 from __future__ import annotations
 
 import argparse
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
-
-import yaml
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts/strings"))
+sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts"))
+
+from byte_scan import decode, read_bytes  # noqa: E402
+from find_unused_localization_keys import LANG_CALLS_EXTRACTOR  # noqa: E402
+from i18n_core import flatten_items, load_locale  # noqa: E402
+from source_index import DEFAULT_INDEX_PATH, Extractor, Fact, LineCounter, SourceIndex  # noqa: E402
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
+
 DEFAULT_YAML_PATH = PROJECT_ROOT / "src/i18n/en.yaml"
 IOS_ROOT = PROJECT_ROOT / "mobile/ios"
 ANDROID_ROOT = PROJECT_ROOT / "mobile/android"
 DEFAULT_OUTPUT_PATH = PROJECT_ROOT / "dev" / "find_mobile_localizations_table.md"
 
+LOCALE_CONTROLLER = "LocaleController"
+# Characters build_android_pattern allows between LocaleController and the quoted key.
+LOCALE_CONTROLLER_WINDOW = 200
+
 
 @dataclass
 class UsageMatch:
@@ -56,49 +76,62 @@ def parse_args() -> argparse.Namespace:
         default=str(ANDROID_ROOT),
         help="Root directory to scan for Android Kotlin files.",
     )
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_INDEX_PATH,
+        metavar="DB",
+        help="Answer from the shared SQLite source index instead of rescanning sources for every key.",
+    )
+    tracing.add_arguments(parser)
     return parser.parse_args()
 
 
 def flatten_localizations(data: Dict, prefix: str = "") -> List[Tuple[str, str]]:
     """Flatten nested localization dictionaries into dot-separated keys."""
-    items: List[Tuple[str, str]] = []
-    for key, value in data.items():
-        next_prefix = f"{prefix}.{key}" if prefix else str(key)
-        if isinstance(value, dict):
-            items.extend(flatten_localizations(value, next_prefix))
-        elif isinstance(value, list):
-            for index, item in enumerate(value):
-                list_prefix = f"{next_prefix}[{index}]"
-                if isinstance(item, dict):
-                    items.extend(flatten_localizations(item, list_prefix))
-                else:
-                    items.append((list_prefix, stringify_value(item)))
-        else:
-            items.append((next_prefix, stringify_value(value)))
-    return items
+    return [(path, stringify_value(value)) for path, value in flatten_items(data, prefix)]
 
 
 def stringify_value(value) -> str:
     return str(value).strip()
 
 
-def find_matches(root: Path, pattern: re.Pattern, extension: str, label: str) -> List[UsageMatch]:
+def find_matches(
+    root: Path,
+    pattern: re.Pattern,
+    extension: str,
+    label: str,
+    needle: Optional[bytes] = None,
+) -> List[UsageMatch]:
+    """
+    Every match of `pattern` in the *extension files under `root`. When every match must contain
+    `needle`, files whose raw bytes lack it are skipped without being decoded.
+    """
     matches: List[UsageMatch] = []
-    files = sorted(root.rglob(f"*{extension}"))
-    print(f"[{label}] Scanning {len(files)} *{extension} files with pattern {pattern.pattern!r}")
-    for file_path in files:
-        # print(f"[{label}] Reading {file_path}")
-        try:
-            content = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-        file_matches = 0
-        for match in pattern.finditer(content):
-            line = content.count("\n", 0, match.start()) + 1
-            matches.append(UsageMatch(path=file_path.relative_to(PROJECT_ROOT), line=line))
-            file_matches += 1
-        if file_matches > 0:
-            print(f"[{label}] Found {file_matches} matches in {file_path}")
+    with span("walk", root=str(root), extension=extension):
+        files = sorted(root.rglob(f"*{extension}"))
+    matched_files = 0
+    decoded_files = 0
+    with span("match", label=label, pattern=pattern.pattern, files=len(files)) as info:
+        for file_path in files:
+            data = read_bytes(file_path)
+            if needle is not None and data.find(needle) == -1:
+                continue
+            decoded_files += 1
+            try:
+                content = decode(data, errors="strict")
+            except UnicodeDecodeError:
+                content = decode(data)
+            file_matches = 0
+            for match in pattern.finditer(content):
+                line = content.count("\n", 0, match.start()) + 1
+                matches.append(UsageMatch(path=file_path.relative_to(PROJECT_ROOT), line=line))
+                file_matches += 1
+            matched_files += file_matches > 0
+        info["decoded_files"] = decoded_files
+        info["matches"] = len(matches)
+    print(f"[{label}] {len(matches)} matches in {matched_files} of {len(files)} *{extension} files")
     return matches
 
 
@@ -122,8 +155,64 @@ def build_android_pattern(key: str) -> re.Pattern:
     return re.compile(rf'LocaleController[\s\S]{{0,200}}?"{escaped_key}"', re.MULTILINE)
 
 
+def build_key_needle(key: str) -> bytes:
+    """The quoted key, which every iOS and Android pattern match contains."""
+    return f'"{key}"'.encode("utf-8")
+
+
+def iter_locale_controller_facts(content: str, file_path: str = "") -> Iterable[Fact]:
+    """
+    Yield every quoted run that build_android_pattern could match after a LocaleController:
+    the text between two consecutive quotes opening at most LOCALE_CONTROLLER_WINDOW characters
+    after it. `start` is the LocaleController offset (the match start), `end` the closing quote.
+    """
+    line_of = LineCounter(content)
+    position = content.find(LOCALE_CONTROLLER)
+    while position != -1:
+        window_start = position + len(LOCALE_CONTROLLER)
+        line = line_of(position)
+        opening = content.find('"', window_start, window_start + LOCALE_CONTROLLER_WINDOW + 1)
+        while opening != -1:
+            closing = content.find('"', opening + 1)
+            if closing == -1:
+                break
+            yield Fact(content[opening + 1:closing], line, position, closing + 1)
+            opening = closing if closing <= window_start + LOCALE_CONTROLLER_WINDOW else -1
+        position = content.find(LOCALE_CONTROLLER, window_start)
+
+
+LOCALE_CONTROLLER_EXTRACTOR = Extractor("kotlin_locale_controller_refs", (".kt",), iter_locale_controller_facts)
+
+
+def index_matches(
+    index: SourceIndex,
+    root: Path,
+    extractor: Extractor,
+    label: str,
+) -> Dict[str, List[UsageMatch]]:
+    """
+    Usage matches for every key at once, in the order find_matches reports them.
+    Within a file, a key's next match starts after the end of its previous one, like finditer.
+    """
+    files, stats = index.refresh(root, [extractor])
+    print(f"[{label}] Source index: {stats.describe()}")
+    with span("read", kind=extractor.kind, files=len(files)):
+        facts = index.facts(extractor.kind, files)
+    matches: Dict[str, List[UsageMatch]] = {}
+    with span("match", label=label):
+        for path in sorted(files, key=Path):
+            relative_path = Path(path).relative_to(PROJECT_ROOT)
+            cursors: Dict[str, int] = {}
+            for fact in facts.get(path) or ():
+                if fact.start < cursors.get(fact.value, 0):
+                    continue
+                cursors[fact.value] = fact.end
+                matches.setdefault(fact.value, []).append(UsageMatch(path=relative_path, line=fact.line))
+    return matches
+
+
 def load_localizations(yaml_path: Path) -> List[Tuple[str, str]]:
-    data = yaml.safe_load(yaml_path.read_text(encoding="utf-8"))
+    data = load_locale(yaml_path)
     if not isinstance(data, dict):
         raise ValueError(f"Expected a dictionary at the top level of {yaml_path}")
     return flatten_localizations(data)
@@ -141,22 +230,39 @@ def create_table(rows: List[Tuple[str, str, str, str]]) -> str:
 
 def main() -> None:
     args = parse_args()
+    with tracing.session(args, "find_air_localizations"):
+        run(args)
 
+
+def run(args: argparse.Namespace) -> None:
     yaml_path = Path(args.yaml_path)
     ios_root = Path(args.ios_root)
     android_root = Path(args.android_root)
     output_path = Path(args.output_path)
 
-    localizations = load_localizations(yaml_path)
+    with span("parse_yaml", path=str(yaml_path)):
+        localizations = load_localizations(yaml_path)
     print(f"Loaded {len(localizations)} localization keys from {yaml_path}")
     print(f"iOS root: {ios_root}")
     print(f"Android root: {android_root}")
 
+    ios_index: Optional[Dict[str, List[UsageMatch]]] = None
+    android_index: Optional[Dict[str, List[UsageMatch]]] = None
+    if args.index is not None:
+        with SourceIndex(args.index) as index:
+            ios_index = index_matches(index, ios_root, LANG_CALLS_EXTRACTOR, "iOS")
+            android_index = index_matches(index, android_root, LOCALE_CONTROLLER_EXTRACTOR, "Android")
+
     table_rows: List[Tuple[str, str, str, str]] = []
     for key, value in localizations:
-        print(f"Processing key: {key}")
-        ios_matches = find_matches(ios_root, build_ios_pattern(key), ".swift", "iOS")
-        android_matches = find_matches(android_root, build_android_pattern(key), ".kt", "Android")
+        if ios_index is not None and android_index is not None:
+            ios_matches = ios_index.get(key, [])
+            android_matches = android_index.get(key, [])
+        else:
+            print(f"Processing key: {key}")
+            needle = build_key_needle(key)
+            ios_matches = find_matches(ios_root, build_ios_pattern(key), ".swift", "iOS", needle)
+            android_matches = find_matches(android_root, build_android_pattern(key), ".kt", "Android", needle)
 
         table_rows.append(
             (
@@ -167,9 +273,11 @@ def main() -> None:
             )
         )
 
-    table_content = create_table(table_rows)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(table_content, encoding="utf-8")
+    with span("serialize", rows=len(table_rows)):
+        table_content = create_table(table_rows)
+    with span("write", path=str(output_path)):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(table_content, encoding="utf-8")
     print(f"Wrote localization usage table to {output_path}")
 
 
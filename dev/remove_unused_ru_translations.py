@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Any, List
 
@@ -11,6 +12,10 @@ import yaml
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts/strings"))
+
+from i18n_core import flatten_items, load_locale  # noqa: E402
+
 DEFAULT_ENGLISH_PATH = "@en.yaml"
 DEFAULT_RUSSIAN_PATH = "@ru.yaml"
 
@@ -53,18 +58,7 @@ def resolve_localization_path(raw_path: str) -> Path:
 
 
 def flatten_keys(node: Any, prefix: str) -> List[str]:
-    keys: List[str] = []
-    if isinstance(node, dict):
-        for key, value in node.items():
-            next_prefix = f"{prefix}.{key}" if prefix else str(key)
-            keys.extend(flatten_keys(value, next_prefix))
-    elif isinstance(node, list):
-        for index, item in enumerate(node):
-            next_prefix = f"{prefix}[{index}]"
-            keys.extend(flatten_keys(item, next_prefix))
-    elif prefix:
-        keys.append(prefix)
-    return keys
+    return [path for path, _ in flatten_items(node, prefix)]
 
 
 def prune_missing_entries(ru_node: Any, en_node: Any, prefix: str, removed: List[str]) -> bool:
@@ -118,9 +112,7 @@ def prune_missing_entries(ru_node: Any, en_node: Any, prefix: str, removed: List
 
 
 def load_yaml_data(path: Path) -> Any:
-    content = path.read_text(encoding="utf-8")
-    data = yaml.safe_load(content) or {}
-    return data
+    return load_locale(path) or {}
 
 
 def write_yaml_data(path: Path, data: Any) -> None:
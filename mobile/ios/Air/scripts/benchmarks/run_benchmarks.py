@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Benchmark the i18n and asset scripts on synthetic trees and compare against a baseline.
+
+Each size preset from synthetic_repo.py is generated once, then every benchmark runs
+`--repeat` times against it. A benchmark's setup (priming caches, clearing outputs) is not
+timed; only the call into the tool is. Output the tools print is discarded.
+
+Results go to .cache/benchmarks/latest.json; --save-baseline also copies them to
+.cache/benchmarks/baseline.json, which later runs compare against by the fastest run of each
+benchmark. Everything runs offline.
+
+Usage:
+    python3 run_benchmarks.py                            # small tree, compare to baseline
+    python3 run_benchmarks.py --sizes small,medium --save-baseline
+    python3 run_benchmarks.py --only find_matches,load_locales --fail-on-regression
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCRIPTS_ROOT = SCRIPT_DIR.parent
+PROJECT_ROOT = SCRIPTS_ROOT.parents[3]
+for path in (SCRIPTS_ROOT, SCRIPTS_ROOT / "strings", SCRIPTS_ROOT / "dependency_graph", PROJECT_ROOT / "dev"):
+    sys.path.insert(0, str(path))
+
+import check_localization_completeness  # noqa: E402
+import detect_en_duplicates  # noqa: E402
+import find_air_localizations  # noqa: E402
+import find_unused_assets  # noqa: E402
+import find_unused_localization_keys  # noqa: E402
+import i18n_core  # noqa: E402
+import import_localizations  # noqa: E402
+import json_to_yaml  # noqa: E402
+import make_dict  # noqa: E402
+from build_dependency_graph import SWIFT_IMPORTS_EXTRACTOR, DependencyGraphBuilder  # noqa: E402
+from source_index import SourceIndex  # noqa: E402
+import synthetic_repo  # noqa: E402
+from synthetic_repo import SIZES, SyntheticRepo, add_spec_arguments, spec_from_args  # noqa: E402
+
+DEFAULT_RESULTS_DIR = SCRIPTS_ROOT / ".cache" / "benchmarks"
+DEFAULT_OUTPUT_PATH = DEFAULT_RESULTS_DIR / "latest.json"
+DEFAULT_BASELINE_PATH = DEFAULT_RESULTS_DIR / "baseline.json"
+RESULTS_VERSION = 1
+# Differences below this many seconds are noise, whatever the ratio.
+MIN_REGRESSION_SECONDS = 0.005
+# Keys looked up one at a time by the find_matches benchmarks.
+FIND_MATCHES_KEYS = 10
+
+Thunk = Callable[[], object]
+
+
+@dataclass
+class BenchmarkContext:
+    repo: SyntheticRepo
+    scratch: Path
+    jobs: int
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Thunk]] = {}
+
+
+def benchmark(name: str):
+    """Register a setup function; it runs untimed before every repetition and returns what to time."""
+    def register(setup: Callable[[BenchmarkContext], Thunk]):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def locale_paths(repo: SyntheticRepo) -> List[Path]:
+    return [repo.i18n_dir / f"{locale}.yaml" for locale in repo.locales]
+
+
+def fresh_dir(path: Path) -> Path:
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+    return path
+
+
+@benchmark("load_locales.parse")
+def bench_load_locales_parse(ctx: BenchmarkContext) -> Thunk:
+    return lambda: i18n_core.load_locales(locale_paths(ctx.repo), cache_dir=None)
+
+
+@benchmark("load_locales.snapshot")
+def bench_load_locales_snapshot(ctx: BenchmarkContext) -> Thunk:
+    cache_dir = ctx.scratch / "locale-snapshots"
+    i18n_core.load_locales(locale_paths(ctx.repo), cache_dir=cache_dir)
+    return lambda: i18n_core.load_locales(locale_paths(ctx.repo), cache_dir=cache_dir)
+
+
+@benchmark("detect_duplicates")
+def bench_detect_duplicates(ctx: BenchmarkContext) -> Thunk:
+    return lambda: detect_en_duplicates.detect_duplicates(ctx.repo.i18n_dir / "en.yaml")
+
+
+@benchmark("check_all_locales")
+def bench_check_all_locales(ctx: BenchmarkContext) -> Thunk:
+    base_keys = i18n_core.flatten_keys(i18n_core.load_locale(ctx.repo.i18n_dir / "en.yaml", cache_dir=None))
+    files = [str(path) for path in locale_paths(ctx.repo)[1:]]
+    return lambda: check_localization_completeness.check_all_locales(base_keys, files, ctx.jobs)
+
+
+@benchmark("extract_all_keys_from_swift")
+def bench_extract_all_keys(ctx: BenchmarkContext) -> Thunk:
+    return lambda: find_unused_localization_keys.extract_all_keys_from_swift(str(ctx.repo.ios_root), jobs=ctx.jobs)
+
+
+def bench_find_matches(ctx: BenchmarkContext, root: Path, build_pattern, extension: str) -> Thunk:
+    # find_matches reports paths relative to the checkout it lives in.
+    find_air_localizations.PROJECT_ROOT = ctx.repo.root
+    keys = ctx.repo.keys[:FIND_MATCHES_KEYS]
+
+    def run():
+        for key in keys:
+            needle = find_air_localizations.build_key_needle(key)
+            find_air_localizations.find_matches(root, build_pattern(key), extension, "bench", needle)
+    return run
+
+
+@benchmark("find_matches.ios")
+def bench_find_matches_ios(ctx: BenchmarkContext) -> Thunk:
+    return bench_find_matches(ctx, ctx.repo.ios_root, find_air_localizations.build_ios_pattern, ".swift")
+
+
+@benchmark("find_matches.android")
+def bench_find_matches_android(ctx: BenchmarkContext) -> Thunk:
+    return bench_find_matches(ctx, ctx.repo.android_root, find_air_localizations.build_android_pattern, ".kt")
+
+
+@benchmark("index_matches.cold")
+def bench_index_matches_cold(ctx: BenchmarkContext) -> Thunk:
+    find_air_localizations.PROJECT_ROOT = ctx.repo.root
+    index_path = fresh_dir(ctx.scratch / "index") / "source_index.sqlite"
+
+    def run():
+        with SourceIndex(index_path) as index:
+            find_air_localizations.index_matches(
+                index, ctx.repo.android_root, find_air_localizations.LOCALE_CONTROLLER_EXTRACTOR, "bench"
+            )
+    return run
+
+
+@benchmark("collect_asset_names")
+def bench_collect_asset_names(ctx: BenchmarkContext) -> Thunk:
+    asset_types = find_unused_assets.normalize_asset_types(find_unused_assets.DEFAULT_ASSET_TYPES)
+    return lambda: find_unused_assets.collect_asset_names(ctx.repo.assets_path, asset_types)
+
+
+@benchmark("find_asset_usage")
+def bench_find_asset_usage(ctx: BenchmarkContext) -> Thunk:
+    asset_types = find_unused_assets.normalize_asset_types(find_unused_assets.DEFAULT_ASSET_TYPES)
+    assets = find_unused_assets.collect_asset_names(ctx.repo.assets_path, asset_types)
+    extensions = find_unused_assets.normalize_exts(find_unused_assets.DEFAULT_FILE_EXTENSIONS)
+
+    def run():
+        scan_files = find_unused_assets.iter_scan_files(
+            [ctx.repo.air_root], extensions, find_unused_assets.DEFAULT_EXCLUDED_DIRS
+        )
+        return find_unused_assets.find_asset_usage(assets, scan_files)
+    return run
+
+
+@benchmark("measure_asset_sizes")
+def bench_measure_asset_sizes(ctx: BenchmarkContext) -> Thunk:
+    asset_types = find_unused_assets.normalize_asset_types(find_unused_assets.DEFAULT_ASSET_TYPES)
+    assets = find_unused_assets.collect_asset_names(ctx.repo.assets_path, asset_types)
+    return lambda: find_unused_assets.measure_asset_sizes(assets)
+
+
+def load_per_locale(ctx: BenchmarkContext) -> dict:
+    locale_files = {locale.lower(): [path] for locale, path in zip(ctx.repo.locales, locale_paths(ctx.repo))}
+    return import_localizations.load_locale_files(locale_files, jobs=1)
+
+
+@benchmark("build_strings_map")
+def bench_build_strings_map(ctx: BenchmarkContext) -> Thunk:
+    per_locale = load_per_locale(ctx)
+    return lambda: import_localizations.build_strings_map(per_locale, "en", list(per_locale))
+
+
+@benchmark("build_compiled_tables")
+def bench_build_compiled_tables(ctx: BenchmarkContext) -> Thunk:
+    per_locale = load_per_locale(ctx)
+    strings = import_localizations.build_strings_map(per_locale, "en", list(per_locale))
+    return lambda: import_localizations.build_compiled_tables(strings)
+
+
+@benchmark("write_catalog")
+def bench_write_catalog(ctx: BenchmarkContext) -> Thunk:
+    per_locale = load_per_locale(ctx)
+    strings = import_localizations.build_strings_map(per_locale, "en", list(per_locale))
+    output_path = fresh_dir(ctx.scratch / "catalog") / "Localizable.xcstrings"
+    return lambda: import_localizations.write_catalog(output_path, "en", strings)
+
+
+@benchmark("dependency_graph.extract_imports")
+def bench_extract_imports(ctx: BenchmarkContext) -> Thunk:
+    def run():
+        builder = DependencyGraphBuilder(str(ctx.repo.submodules_dir))
+        builder.scan_modules()
+        builder.find_swift_files()
+        builder.extract_imports()
+    return run
+
+
+@benchmark("dependency_graph.detect_cycles")
+def bench_detect_cycles(ctx: BenchmarkContext) -> Thunk:
+    builder = DependencyGraphBuilder(str(ctx.repo.submodules_dir))
+    builder.scan_modules()
+    builder.find_swift_files()
+    builder.extract_imports()
+    return builder.detect_cycles
+
+
+@benchmark("source_index.refresh.cold")
+def bench_source_index_cold(ctx: BenchmarkContext) -> Thunk:
+    index_path = fresh_dir(ctx.scratch / "index") / "source_index.sqlite"
+
+    def run():
+        with SourceIndex(index_path) as index:
+            index.refresh(ctx.repo.submodules_dir, [SWIFT_IMPORTS_EXTRACTOR], jobs=ctx.jobs)
+    return run
+
+
+@benchmark("source_index.refresh.warm")
+def bench_source_index_warm(ctx: BenchmarkContext) -> Thunk:
+    index_path = fresh_dir(ctx.scratch / "index") / "source_index.sqlite"
+    with SourceIndex(index_path) as index:
+        index.refresh(ctx.repo.submodules_dir, [SWIFT_IMPORTS_EXTRACTOR], jobs=ctx.jobs)
+
+    def run():
+        with SourceIndex(index_path) as index:
+            index.refresh(ctx.repo.submodules_dir, [SWIFT_IMPORTS_EXTRACTOR], jobs=ctx.jobs)
+    return run
+
+
+@benchmark("make_dict.parse_strings")
+def bench_parse_strings(ctx: BenchmarkContext) -> Thunk:
+    text = ctx.repo.strings_file.read_text(encoding="utf-8")
+    return lambda: make_dict.parse_strings(text)
+
+
+@benchmark("json_to_yaml")
+def bench_json_to_yaml(ctx: BenchmarkContext) -> Thunk:
+    data = i18n_core.load_locale(ctx.repo.i18n_dir / "en.yaml", cache_dir=None)
+    return lambda: json_to_yaml.json_to_yaml(data)
+
+
+def time_benchmark(setup: Callable[[BenchmarkContext], Thunk], ctx: BenchmarkContext, repeat: int) -> List[float]:
+    """Seconds taken by each of `repeat` runs, with the collector off while timing, like timeit."""
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            thunk = setup(ctx)
+            gc.collect()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                thunk()
+                runs.append(time.perf_counter() - started)
+            finally:
+                gc.enable()
+    return runs
+
+
+def prepare_repo(size: str, args: argparse.Namespace, workdir: Path) -> SyntheticRepo:
+    """Generate the tree for `size`, reusing one left in `workdir` by an identical spec."""
+    spec = spec_from_args(size, args)
+    root = workdir / size
+    repo = synthetic_repo.load(root)
+    if repo is not None and repo.spec == spec:
+        print(f"[{size}] Reusing synthetic tree: {repo.root}")
+        return repo
+    shutil.rmtree(root, ignore_errors=True)
+    started = time.perf_counter()
+    repo = synthetic_repo.generate(root, spec)
+    print(f"[{size}] Generated synthetic tree in {time.perf_counter() - started:.1f}s: {repo.root}")
+    return repo
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_all(args: argparse.Namespace, names: List[str], workdir: Path) -> dict:
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "yaml_loader": i18n_core.YAML_LOADER.__name__,
+            "repeat": args.repeat,
+            "jobs": args.jobs,
+        },
+        "sizes": {},
+    }
+    for size in args.sizes:
+        repo = prepare_repo(size, args, workdir)
+        ctx = BenchmarkContext(repo=repo, scratch=fresh_dir(workdir / f".{size}-scratch"), jobs=args.jobs)
+        size_results = {}
+        for name in names:
+            runs = time_benchmark(BENCHMARKS[name], ctx, args.repeat)
+            size_results[name] = {
+                "min": min(runs),
+                "median": statistics.median(runs),
+                "runs": runs,
+            }
+            print(f"[{size}] {name:<36} min {min(runs) * 1000:9.1f} ms   median {statistics.median(runs) * 1000:9.1f} ms")
+        results["sizes"][size] = {"spec": asdict(repo.spec), "benchmarks": size_results}
+    return results
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print current vs baseline fastest runs and return the regressions."""
+    regressions = []
+    print(f"\nCompared with baseline from {baseline['meta'].get('date')} ({baseline['meta'].get('revision') or 'unknown revision'}):")
+    print(f"  {'size':<8} {'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for size, size_results in current["sizes"].items():
+        baseline_size = baseline.get("sizes", {}).get(size)
+        if baseline_size is None:
+            print(f"  {size:<8} (not in baseline)")
+            continue
+        if baseline_size["spec"] != size_results["spec"]:
+            print(f"  {size:<8} (baseline used a different synthetic tree; skipped)")
+            continue
+        for name, result in size_results["benchmarks"].items():
+            previous = baseline_size["benchmarks"].get(name)
+            if previous is None:
+                print(f"  {size:<8} {name:<36} {'—':>10} {result['min'] * 1000:>8.1f}ms {'new':>8}")
+                continue
+            old, new = previous["min"], result["min"]
+            change = (new - old) / old if old else 0.0
+            regressed = change > threshold and new - old > MIN_REGRESSION_SECONDS
+            marker = "  REGRESSION" if regressed else ""
+            print(f"  {size:<8} {name:<36} {old * 1000:>8.1f}ms {new * 1000:>8.1f}ms {change:>+8.1%}{marker}")
+            if regressed:
+                regressions.append(f"{size}/{name}: {old * 1000:.1f}ms -> {new * 1000:.1f}ms ({change:+.1%})")
+    return regressions
+
+
+def write_results(path: Path, results: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the i18n and asset scripts on synthetic trees.")
+    parser.add_argument("--sizes", type=parse_list, default=["small"],
+                        help=f"Comma-separated size presets ({', '.join(SIZES)}; default: small)")
+    parser.add_argument("--only", type=parse_list,
+                        help="Comma-separated benchmarks to run; a name matches itself and its dotted variants")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker count passed to tools that take one (default: 1, the least noisy)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_PATH,
+                        help="Where to write the results JSON (default: .cache/benchmarks/latest.json)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH,
+                        help="Baseline results to compare against (default: .cache/benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on any regression")
+    parser.add_argument("--workdir", type=Path,
+                        help="Keep synthetic trees here and reuse them across runs (default: a temporary directory)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+    unknown_sizes = [size for size in args.sizes if size not in SIZES]
+    if unknown_sizes:
+        print(f"Error: unknown size(s): {', '.join(unknown_sizes)}", file=sys.stderr)
+        return 2
+    names = list(BENCHMARKS)
+    if args.only:
+        names = [name for name in names if any(name == only or name.startswith(f"{only}.") for only in args.only)]
+        if not names:
+            print(f"Error: no benchmark matches {', '.join(args.only)}", file=sys.stderr)
+            return 2
+
+    if args.workdir is not None:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        results = run_all(args, names, args.workdir.resolve())
+    else:
+        with tempfile.TemporaryDirectory(prefix="air-benchmarks-") as workdir:
+            results = run_all(args, names, Path(workdir))
+
+    write_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+
+    regressions = []
+    if args.baseline.exists() and args.baseline.resolve() != args.output.resolve():
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
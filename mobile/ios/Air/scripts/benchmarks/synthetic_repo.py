@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic checkout for benchmarking the i18n and asset scripts.
+
+The tree mirrors the real layout, so every tool finds things where it expects them:
+
+    src/i18n/<locale>.yaml                               N keys x M locales (some plural, some multiline)
+    mobile/ios/Air/SubModules/<Module>/**/*.swift        K Swift files with imports, lang() calls,
+                                                         asset names and filler literals
+    mobile/ios/Air/SubModules/WalletResources/Resources/Assets.xcassets
+                                                         A imagesets (1x/2x/3x PNGs) and colorsets
+    mobile/android/air/SubModules/<Module>/**/*.kt       Kotlin files with LocaleController lookups
+    mobile/ios/Air/Localizable.strings                   the en values, for make_dict.py
+
+Output is deterministic for a given size and seed.
+
+Usage:
+    python3 synthetic_repo.py /tmp/synthetic --size medium
+    python3 synthetic_repo.py /tmp/synthetic --keys 5000 --swift-files 3000 --lang-density 0.2
+"""
+
+import argparse
+import json
+import random
+import struct
+import sys
+import zlib
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+LOCALE_NAMES = (
+    "ar", "de", "es", "fa", "fr", "it", "ja", "ko", "nl", "pl",
+    "pt", "ru", "th", "tr", "uk", "vi", "zh-Hans", "zh-Hant", "id", "he",
+)
+WORDS = (
+    "wallet", "token", "send", "receive", "stake", "swap", "balance", "network", "address", "fee",
+    "confirm", "cancel", "account", "backup", "ledger", "history", "price", "amount", "settings", "secure",
+)
+ASSETS_RELATIVE_PATH = Path("mobile/ios/Air/SubModules/WalletResources/Resources/Assets.xcassets")
+MANIFEST_NAME = "synthetic.json"
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    keys: int
+    locales: int
+    swift_files: int
+    kotlin_files: int
+    assets: int
+    # Chance that a source line calls lang() / LocaleController, or names an asset.
+    lang_density: float = 0.08
+    locale_controller_density: float = 0.06
+    asset_density: float = 0.02
+    lines_per_file: int = 120
+    # Share of lang() calls using a key absent from en.yaml, and of keys missing per locale.
+    missing_key_ratio: float = 0.02
+    untranslated_ratio: float = 0.01
+    seed: int = 1
+
+
+SIZES: Dict[str, RepoSpec] = {
+    "small": RepoSpec(keys=500, locales=4, swift_files=200, kotlin_files=100, assets=60),
+    "medium": RepoSpec(keys=2000, locales=12, swift_files=1300, kotlin_files=950, assets=280),
+    "large": RepoSpec(keys=8000, locales=20, swift_files=5000, kotlin_files=4000, assets=1000),
+}
+
+
+@dataclass
+class SyntheticRepo:
+    """Paths of a generated tree plus what went into it."""
+    root: Path
+    spec: RepoSpec
+    keys: List[str] = field(default_factory=list)
+    locales: List[str] = field(default_factory=list)
+    modules: List[str] = field(default_factory=list)
+    assets: List[str] = field(default_factory=list)
+
+    @property
+    def i18n_dir(self) -> Path:
+        return self.root / "src/i18n"
+
+    @property
+    def ios_root(self) -> Path:
+        return self.root / "mobile/ios"
+
+    @property
+    def air_root(self) -> Path:
+        return self.root / "mobile/ios/Air"
+
+    @property
+    def submodules_dir(self) -> Path:
+        return self.air_root / "SubModules"
+
+    @property
+    def android_root(self) -> Path:
+        return self.root / "mobile/android"
+
+    @property
+    def assets_path(self) -> Path:
+        return self.root / ASSETS_RELATIVE_PATH
+
+    @property
+    def strings_file(self) -> Path:
+        return self.air_root / "Localizable.strings"
+
+
+def tiny_png(width: int, height: int, rgba: bool) -> bytes:
+    """A valid, solid-colored PNG of the given size."""
+    channels = 4 if rgba else 3
+    row = b"\x00" + b"\x80" * (width * channels)
+    raw = zlib.compress(row * height)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6 if rgba else 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+def make_value(rng: random.Random, index: int) -> object:
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 9)))
+    roll = rng.random()
+    if roll < 0.05:
+        return {"oneValue": f"%count% {words}", "otherValue": f"%count% {words}s"}
+    if roll < 0.15:
+        return f"{words.capitalize()} %amount% to %address%"
+    if roll < 0.20:
+        return f"{words.capitalize()}.\n\nLine {index} of the explanation."
+    return words.capitalize()
+
+
+def make_key(rng: random.Random, index: int) -> str:
+    if index % 3 == 0:
+        return f"$key_{index}_{rng.choice(WORDS)}"
+    return f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {index}"
+
+
+def write_locales(repo: SyntheticRepo, rng: random.Random):
+    spec = repo.spec
+    repo.keys = [make_key(rng, index) for index in range(spec.keys)]
+    en = {key: make_value(rng, index) for index, key in enumerate(repo.keys)}
+    repo.locales = ["en"] + list(LOCALE_NAMES[:max(0, spec.locales - 1)])
+    repo.i18n_dir.mkdir(parents=True, exist_ok=True)
+
+    for locale in repo.locales:
+        if locale == "en":
+            data = en
+        else:
+            data = {}
+            for key, value in en.items():
+                if rng.random() < spec.untranslated_ratio:
+                    continue
+                if isinstance(value, dict):
+                    data[key] = {form: f"[{locale}] {text}" for form, text in value.items()}
+                else:
+                    data[key] = f"[{locale}] {value}"
+            data[f"$extraneous_{locale}"] = f"[{locale}] only here"
+        with open(repo.i18n_dir / f"{locale}.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(data, f, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False, width=120)
+
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    repo.strings_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(repo.strings_file, "w", encoding="utf-8") as f:
+        f.write("/* Generated by synthetic_repo.py */\n\n")
+        for key, value in en.items():
+            text = value["otherValue"] if isinstance(value, dict) else value
+            f.write(f'"{escape(key)}" = "{escape(text)}";\n')
+
+
+def write_assets(repo: SyntheticRepo, rng: random.Random):
+    catalog = repo.assets_path
+    catalog.mkdir(parents=True, exist_ok=True)
+    (catalog / "Contents.json").write_text('{"info": {"author": "xcode", "version": 1}}\n')
+    pngs = {scale: tiny_png(8 * scale, 8 * scale, rgba=True) for scale in (1, 2, 3)}
+    for index in range(repo.spec.assets):
+        name = f"Icon{rng.choice(WORDS).capitalize()}{index}"
+        repo.assets.append(name)
+        if index % 10 == 9:
+            folder = catalog / f"{name}.colorset"
+            folder.mkdir(exist_ok=True)
+            (folder / "Contents.json").write_text(
+                '{"colors": [{"idiom": "universal", "color": {"color-space": "srgb", '
+                '"components": {"red": "0.5", "green": "0.5", "blue": "0.5", "alpha": "1"}}}]}\n'
+            )
+            continue
+        folder = catalog / f"{name}.imageset"
+        folder.mkdir(exist_ok=True)
+        images = []
+        for scale, data in pngs.items():
+            filename = f"{name}@{scale}x.png"
+            (folder / filename).write_bytes(data)
+            images.append(f'{{"idiom": "universal", "filename": "{filename}", "scale": "{scale}x"}}')
+        (folder / "Contents.json").write_text(f'{{"images": [{", ".join(images)}], "info": {{"version": 1}}}}\n')
+
+
+def swift_line(repo: SyntheticRepo, rng: random.Random, index: int) -> str:
+    spec = repo.spec
+    roll = rng.random()
+    if roll < spec.lang_density:
+        if rng.random() < spec.missing_key_ratio:
+            return f'        label{index}.text = lang("Missing {rng.choice(WORDS)} {rng.randint(0, spec.keys)}")'
+        return f'        label{index}.text = lang("{rng.choice(repo.keys)}")'
+    roll -= spec.lang_density
+    if roll < spec.asset_density:
+        # The last fifth of the catalog is never referenced, so there are unused assets to find.
+        return f'        image{index}.image = UIImage(named: "{rng.choice(repo.assets[:len(repo.assets) * 4 // 5 or 1])}")'
+    roll -= spec.asset_density
+    if roll < 0.1:
+        return f'        let id{index} = "{rng.choice(WORDS)}_\\({index})"'
+    return f"        let value{index} = compute{index % 7}(value{index - 1}, {rng.randint(0, 999)})"
+
+
+def write_swift(repo: SyntheticRepo, rng: random.Random):
+    spec = repo.spec
+    module_count = max(4, spec.swift_files // 45)
+    repo.modules = [f"Module{index:03d}" for index in range(module_count)]
+    for index in range(spec.swift_files):
+        module_index = index % module_count
+        module = repo.modules[module_index]
+        folder = repo.submodules_dir / module / f"Group{index % 5}"
+        folder.mkdir(parents=True, exist_ok=True)
+        # Only import lower-numbered modules so the graph stays acyclic, like the real one.
+        imports = ["UIKit", "SwiftUI"] + sorted(
+            {repo.modules[rng.randrange(module_index)] for _ in range(min(module_index, 3))}
+        )
+        lines = [f"import {name}" for name in imports]
+        lines += ["", f"final class Screen{index}: UIViewController {{", "    func setup() {"]
+        lines += [swift_line(repo, rng, line) for line in range(spec.lines_per_file)]
+        lines += ["    }", "}", ""]
+        (folder / f"Screen{index}.swift").write_text("\n".join(lines), encoding="utf-8")
+
+
+def write_kotlin(repo: SyntheticRepo, rng: random.Random):
+    spec = repo.spec
+    for index in range(spec.kotlin_files):
+        folder = (
+            repo.android_root / "air/SubModules" / f"Module{index % 20:02d}"
+            / "src/main/java/org/mytonwallet/app_air" / f"feature{index % 7}"
+        )
+        folder.mkdir(parents=True, exist_ok=True)
+        lines = [f"package org.mytonwallet.app_air.feature{index % 7}", "", f"class View{index} {{", "    fun bind() {"]
+        for line in range(spec.lines_per_file):
+            if rng.random() < spec.locale_controller_density:
+                lines.append(f'        title{line}.text = LocaleController.getString("{rng.choice(repo.keys)}")')
+            else:
+                lines.append(f'        val value{line} = compute("{rng.choice(WORDS)}", {rng.randint(0, 999)})')
+        lines += ["    }", "}", ""]
+        (folder / f"View{index}.kt").write_text("\n".join(lines), encoding="utf-8")
+
+
+def generate(root: Path, spec: RepoSpec) -> SyntheticRepo:
+    """Write a synthetic tree for `spec` under `root`, which should be empty or absent."""
+    repo = SyntheticRepo(root=Path(root).resolve(), spec=spec)
+    rng = random.Random(spec.seed)
+    write_locales(repo, rng)
+    write_assets(repo, rng)
+    write_swift(repo, rng)
+    write_kotlin(repo, rng)
+    manifest = {"spec": asdict(spec), "keys": repo.keys, "locales": repo.locales, "modules": repo.modules,
+                "assets": repo.assets}
+    (repo.root / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False) + "\n", encoding="utf-8")
+    return repo
+
+
+def load(root: Path) -> Optional[SyntheticRepo]:
+    """A tree generate() left under `root`, or None if there is none."""
+    try:
+        manifest = json.loads((Path(root) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return SyntheticRepo(
+        root=Path(root).resolve(),
+        spec=RepoSpec(**manifest["spec"]),
+        keys=manifest["keys"],
+        locales=manifest["locales"],
+        modules=manifest["modules"],
+        assets=manifest["assets"],
+    )
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    """Overrides for the generated tree, shared with run_benchmarks.py."""
+    for name in ("keys", "locales", "swift_files", "kotlin_files", "assets", "lines_per_file", "seed"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"Override {name} of every size")
+    for name in ("lang_density", "locale_controller_density", "asset_density"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, help=f"Override {name} of every size")
+
+
+def spec_from_args(size: str, args: argparse.Namespace) -> RepoSpec:
+    overrides = {
+        name: value for name, value in vars(args).items()
+        if name in RepoSpec.__dataclass_fields__ and value is not None
+    }
+    return replace(SIZES[size], **overrides)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic tree for benchmarking the i18n/asset scripts.")
+    parser.add_argument("output", type=Path, help="Directory to create (must not exist or be empty)")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Preset to start from (default: small)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if args.output.exists() and any(args.output.iterdir()):
+        print(f"Error: {args.output} is not empty", file=sys.stderr)
+        return 1
+    spec = spec_from_args(args.size, args)
+    repo = generate(args.output, spec)
+    print(f"Generated {repo.root}: " + ", ".join(f"{name}={value}" for name, value in asdict(spec).items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Bytes-level file access for the bulk source scanners.
+
+The scanners match compiled bytes regexes against raw file contents and decode only the slices
+they keep, instead of decoding every Swift/Kotlin/xib/plist file into str before matching.
+Per-key searches first check for the key's bytes with find(), so files that cannot match are
+never decoded or regex-scanned at all.
+
+read_bytes() memory-maps files of MMAP_MIN_SIZE bytes or more, so large generated files are
+scanned in place rather than copied into the Python heap. Smaller files, which is nearly every
+source file, are read in one call: mapping them measured slower than reading them. It is a
+context manager, and a map is closed when the block exits, so keep every use of the buffer
+inside the block:
+
+    with read_bytes(path) as data:
+        matches = PATTERN.findall(data)
+
+decode() translates \\r\\n and lone \\r the way text-mode reads do, so for UTF-8 sources the results
+equal those of the str scanners.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+MMAP_MIN_SIZE = 1 << 20
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def read_bytes(path: Union[str, Path]) -> Iterator[Buffer]:
+    """Contents of `path`, memory-mapped read-only when it is MMAP_MIN_SIZE bytes or larger."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            data = f.read()
+            mapped = None
+        else:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped is None:
+        yield data
+        return
+    with mapped:
+        yield mapped
+
+
+def decode(data: Buffer, errors: str = "ignore") -> str:
+    """UTF-8 text of `data`, with line breaks translated the way text-mode reads translate them."""
+    if not isinstance(data, bytes):
+        data = data[:]
+    text = data.decode("utf-8", errors=errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
@@ -4,20 +4,46 @@ Swift Module Dependency Graph Builder
 
 This script scans the Air/SubModules directory to build a dependency graph
 based on import statements in Swift files.
+
+With --index, imports come from the shared SQLite source index (../source_index.py)
+and only Swift files changed since the last run are read again.
+
+--trace OUT.json and --profile report where the time goes (../tracing.py).
 """
 
 import os
 import re
+import sys
 import json
 import argparse
 from pathlib import Path
 from collections import defaultdict, deque
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Iterable, Optional, Set, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from byte_scan import decode, read_bytes  # noqa: E402
+from source_index import DEFAULT_INDEX_PATH, Extractor, Fact, LineCounter, SourceIndex  # noqa: E402
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
+
+IMPORT_PATTERN = re.compile(r'^\s*import\s+([A-Za-z_][A-Za-z0-9_]*)', re.MULTILINE)
+IMPORT_BYTES_PATTERN = re.compile(IMPORT_PATTERN.pattern.encode('ascii'), re.MULTILINE)
+
+
+def iter_import_facts(content: str, file_path: str = "") -> Iterable[Fact]:
+    line_of = LineCounter(content)
+    for match in IMPORT_PATTERN.finditer(content):
+        yield Fact(match.group(1), line_of(match.start(1)), match.start(), match.end())
+
+
+SWIFT_IMPORTS_EXTRACTOR = Extractor("swift_imports", (".swift",), iter_import_facts)
 
 
 class DependencyGraphBuilder:
-    def __init__(self, submodules_path: str):
+    def __init__(self, submodules_path: str, index_path: Optional[Path] = None):
         self.submodules_path = Path(submodules_path)
+        self.index_path = index_path
         self.modules = {}  # module_name -> module_info
         self.dependencies = defaultdict(set)  # module_name -> set of dependencies
         self.reverse_dependencies = defaultdict(set)  # module_name -> set of dependents
@@ -43,6 +69,10 @@ class DependencyGraphBuilder:
     
     def find_swift_files(self) -> None:
         """Find all Swift files in each module."""
+        if self.index_path is not None:
+            self._find_swift_files_in_index()
+            return
+
         for module_name, module_info in self.modules.items():
             swift_files = []
             module_path = module_info['path']
@@ -54,21 +84,45 @@ class DependencyGraphBuilder:
             module_info['swift_files'] = swift_files
             print(f"{module_name}: {len(swift_files)} Swift files")
     
+    def _find_swift_files_in_index(self) -> None:
+        """Refresh the source index once for all modules and split its files by module."""
+        with SourceIndex(self.index_path) as index:
+            files, stats = index.refresh(self.submodules_path, [SWIFT_IMPORTS_EXTRACTOR])
+            self.indexed_imports = index.values(SWIFT_IMPORTS_EXTRACTOR.kind, files)
+        print(f"Source index: {stats.describe()}")
+
+        module_paths = {str(info['path'].resolve()) + os.sep: info for info in self.modules.values()}
+        for path in files:
+            for prefix, module_info in module_paths.items():
+                if path.startswith(prefix):
+                    module_info['swift_files'].append(Path(path))
+                    break
+        for module_name, module_info in self.modules.items():
+            print(f"{module_name}: {len(module_info['swift_files'])} Swift files")
+
+    def _read_imports(self, swift_file: Path) -> Set[str]:
+        if self.index_path is not None:
+            imports = self.indexed_imports.get(str(swift_file))
+            if imports is None:
+                print(f"Warning: Could not read {swift_file}")
+            return imports or set()
+        try:
+            with read_bytes(swift_file) as data:
+                if b'\r' in data:
+                    # \r\n or lone \r line endings: decode() turns them into the newlines ^ anchors on.
+                    return set(IMPORT_PATTERN.findall(decode(data, errors='strict')))
+                return {name.decode('ascii') for name in IMPORT_BYTES_PATTERN.findall(data)}
+        except Exception as e:
+            print(f"Warning: Could not read {swift_file}: {e}")
+            return set()
+
     def extract_imports(self) -> None:
         """Extract import statements from all Swift files."""
-        import_pattern = re.compile(r'^\s*import\s+([A-Za-z_][A-Za-z0-9_]*)', re.MULTILINE)
-        
         for module_name, module_info in self.modules.items():
             all_imports = set()
             
             for swift_file in module_info['swift_files']:
-                try:
-                    with open(swift_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        imports = import_pattern.findall(content)
-                        all_imports.update(imports)
-                except Exception as e:
-                    print(f"Warning: Could not read {swift_file}: {e}")
+                all_imports.update(self._read_imports(swift_file))
             
             # Filter imports to only include modules that exist in our SubModules
             filtered_imports = all_imports & set(self.modules.keys())
@@ -391,26 +445,35 @@ def main():
                        help='Output JSON file with dependency data')
     parser.add_argument('--no-exports', action='store_true',
                        help='Skip exporting files, only show report')
+    parser.add_argument('--index', nargs='?', type=Path, const=DEFAULT_INDEX_PATH, metavar='DB',
+                       help='Read imports from the shared SQLite source index, re-reading only changed files')
+    tracing.add_arguments(parser)
     
     args = parser.parse_args()
     
     try:
-        builder = DependencyGraphBuilder(args.submodules_path)
-        
-        print("Scanning modules...")
-        builder.scan_modules()
-        
-        print("Finding Swift files...")
-        builder.find_swift_files()
-        
-        print("Extracting imports...")
-        builder.extract_imports()
-        
-        builder.print_report()
-        
-        if not args.no_exports:
-            builder.export_to_dot(args.output_dot)
-            builder.export_to_json(args.output_json)
+        with tracing.session(args, 'build_dependency_graph'):
+            builder = DependencyGraphBuilder(args.submodules_path, args.index)
+
+            print("Scanning modules...")
+            with span('walk', root=args.submodules_path):
+                builder.scan_modules()
+
+                print("Finding Swift files...")
+                builder.find_swift_files()
+
+            print("Extracting imports...")
+            with span('extract'):
+                builder.extract_imports()
+
+            with span('analyze'):
+                builder.print_report()
+
+            if not args.no_exports:
+                with span('write', path=args.output_dot):
+                    builder.export_to_dot(args.output_dot)
+                with span('write', path=args.output_json):
+                    builder.export_to_json(args.output_json)
         
     except Exception as e:
         print(f"Error: {e}")
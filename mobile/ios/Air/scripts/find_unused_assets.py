@@ -10,15 +10,31 @@ Custom paths:
         --assets mobile/ios/Air/SubModules/WalletResources/Resources/Assets.xcassets \
         --scan-root mobile/ios/Air/SubModules \
         --scan-root mobile/ios/App
+
+Warm runs against the shared source index (source_index.py) only re-read changed files:
+    python3 mobile/ios/Air/scripts/find_unused_assets.py --index
+
+Where the time goes (see tracing.py):
+    python3 mobile/ios/Air/scripts/find_unused_assets.py --trace assets-trace.json --profile
 """
 
 import argparse
+import hashlib
+import json
 import os
 import re
+import struct
 import sys
+import zlib
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
 
+import tracing
+from byte_scan import decode, read_bytes
+from source_index import DEFAULT_INDEX_PATH, Extractor, Fact, LineCounter, SourceIndex
+from tracing import span
 
 DEFAULT_ASSET_TYPES = ("imageset", "colorset", "symbolset", "dataset")
 DEFAULT_FILE_EXTENSIONS = (
@@ -78,6 +94,467 @@ def collect_asset_names(assets_path: Path, asset_types: set[str]) -> dict[str, P
     return assets
 
 
+@dataclass
+class AssetSize:
+    total_bytes: int = 0
+    by_scale: dict[str, int] = field(default_factory=dict)
+    by_variant: dict[str, int] = field(default_factory=dict)
+
+    def add(self, size: int, scale: str, variant: str) -> None:
+        self.total_bytes += size
+        self.by_scale[scale] = self.by_scale.get(scale, 0) + size
+        self.by_variant[variant] = self.by_variant.get(variant, 0) + size
+
+    def to_json(self) -> dict:
+        return {
+            "bytes": self.total_bytes,
+            "by_scale": dict(sorted(self.by_scale.items())),
+            "by_variant": dict(sorted(self.by_variant.items())),
+        }
+
+
+CONTENTS_ENTRY_KEYS = ("images", "data", "symbols")
+
+
+def load_contents_entries(asset_dir: Path) -> list[dict]:
+    try:
+        with open(asset_dir / "Contents.json", "r", encoding="utf-8") as f:
+            contents = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(contents, dict):
+        return []
+
+    entries: list[dict] = []
+    for key in CONTENTS_ENTRY_KEYS:
+        value = contents.get(key)
+        if isinstance(value, list):
+            entries.extend(entry for entry in value if isinstance(entry, dict))
+    return entries
+
+
+def describe_variant(entry: dict) -> str:
+    parts = [str(entry.get("idiom", "universal"))]
+    for appearance in entry.get("appearances") or []:
+        if isinstance(appearance, dict) and "value" in appearance:
+            parts.append(str(appearance["value"]))
+    if "language-direction" in entry:
+        parts.append(str(entry["language-direction"]))
+    return "/".join(parts)
+
+
+def measure_asset_size(asset_dir: Path) -> AssetSize:
+    """Total the payload bytes of one asset set, split by scale and variant.
+
+    Files that exist on disk but are not referenced from Contents.json still
+    ship with the bundle, so they are counted under the "unreferenced" variant.
+    """
+    entries_by_filename = {
+        entry["filename"]: entry
+        for entry in load_contents_entries(asset_dir)
+        if isinstance(entry.get("filename"), str)
+    }
+
+    size = AssetSize()
+    for current_root, _, files in os.walk(asset_dir):
+        for filename in files:
+            if filename == "Contents.json":
+                continue
+            try:
+                file_size = os.stat(os.path.join(current_root, filename)).st_size
+            except OSError:
+                continue
+            entry = entries_by_filename.get(filename)
+            if entry is None:
+                size.add(file_size, "any", "unreferenced")
+            else:
+                size.add(file_size, str(entry.get("scale", "any")), describe_variant(entry))
+    return size
+
+
+def measure_asset_sizes(assets: dict[str, Path]) -> dict[str, AssetSize]:
+    return {name: measure_asset_size(path) for name, path in assets.items()}
+
+
+def format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def sort_by_reclaimable_bytes(names: Iterable[str], sizes: dict[str, AssetSize]) -> list[str]:
+    return sorted(names, key=lambda name: (-sizes[name].total_bytes, name))
+
+
+@dataclass
+class DuplicateGroup:
+    digest: str
+    size: int
+    files: list[tuple[str, Path]]
+
+    @property
+    def wasted_bytes(self) -> int:
+        return self.size * (len(self.files) - 1)
+
+    @property
+    def asset_names(self) -> list[str]:
+        return sorted({name for name, _ in self.files})
+
+
+HASH_CHUNK_SIZE = 1 << 16
+
+
+def iter_asset_payloads(assets: dict[str, Path]) -> Iterable[tuple[str, Path, int]]:
+    for name, asset_dir in assets.items():
+        for current_root, _, files in os.walk(asset_dir):
+            for filename in files:
+                if filename == "Contents.json":
+                    continue
+                file_path = Path(current_root) / filename
+                try:
+                    yield name, file_path, file_path.stat().st_size
+                except OSError:
+                    continue
+
+
+def hash_file(file_path: Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def find_duplicate_payloads(assets: dict[str, Path]) -> list[DuplicateGroup]:
+    """Group byte-identical asset payloads across the whole catalog.
+
+    Files are bucketed by size first and only hashed when at least two share
+    a size, so a catalog of unique files is resolved from stat() alone.
+    """
+    by_size: dict[int, list[tuple[str, Path]]] = {}
+    for name, file_path, size in iter_asset_payloads(assets):
+        if size == 0:
+            continue
+        by_size.setdefault(size, []).append((name, file_path))
+
+    groups: list[DuplicateGroup] = []
+    for size, candidates in by_size.items():
+        if len(candidates) < 2:
+            continue
+        by_digest: dict[str, list[tuple[str, Path]]] = {}
+        for name, file_path in candidates:
+            digest = hash_file(file_path)
+            if digest is not None:
+                by_digest.setdefault(digest, []).append((name, file_path))
+        for digest, files in by_digest.items():
+            if len(files) > 1:
+                groups.append(DuplicateGroup(digest=digest, size=size, files=sorted(files)))
+
+    groups.sort(key=lambda group: (-group.wasted_bytes, group.files[0][1]))
+    return groups
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+PNG_ALPHA_COLOR_TYPES = {4, 6}
+PNG_GRAYSCALE_COLOR_TYPES = {0, 4}
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+RASTER_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+VECTOR_CANDIDATE_MAX_POINTS = 64
+SCALE_MISMATCH_RATIO = 1.5
+DEFAULT_MAX_POINTS = 600
+
+
+@dataclass
+class RasterInfo:
+    format: str
+    width: int
+    height: int
+    bit_depth: int
+    color_type: int | None = None
+    components: int | None = None
+    interlaced: bool = False
+
+    @property
+    def has_alpha_channel(self) -> bool:
+        return self.format == "png" and self.color_type in PNG_ALPHA_COLOR_TYPES
+
+
+@dataclass
+class RasterIssue:
+    asset: str
+    path: Path
+    kind: str
+    detail: str
+
+
+def read_png_header(f) -> RasterInfo | None:
+    header = f.read(33)
+    if len(header) < 33 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        return None
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header[16:29])
+    return RasterInfo(
+        format="png",
+        width=width,
+        height=height,
+        bit_depth=bit_depth,
+        color_type=color_type,
+        interlaced=interlace == 1,
+    )
+
+
+def read_jpeg_header(f) -> RasterInfo | None:
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0xD8 or 0xD0 <= code <= 0xD7 or code == 0x01:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if code in JPEG_SOF_MARKERS:
+            frame = f.read(6)
+            if len(frame) < 6:
+                return None
+            precision, height, width, components = struct.unpack(">BHHB", frame)
+            return RasterInfo(
+                format="jpeg",
+                width=width,
+                height=height,
+                bit_depth=precision,
+                components=components,
+            )
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_raster_header(file_path: Path) -> RasterInfo | None:
+    """Read image dimensions and pixel format without decoding any pixels."""
+    suffix = file_path.suffix.lower()
+    try:
+        with open(file_path, "rb") as f:
+            if suffix == ".png":
+                return read_png_header(f)
+            if suffix in (".jpg", ".jpeg"):
+                return read_jpeg_header(f)
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+def iter_png_chunks(f) -> Iterable[tuple[bytes, bytes]]:
+    f.seek(len(PNG_SIGNATURE))
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", header)
+        data = f.read(length)
+        f.seek(4, os.SEEK_CUR)
+        yield chunk_type, data
+        if chunk_type == b"IEND":
+            return
+
+
+def unfilter_png_row(filter_type: int, row: bytearray, previous: bytearray, bpp: int) -> None:
+    if filter_type == 0:
+        return
+    length = len(row)
+    if filter_type == 1:
+        for i in range(bpp, length):
+            row[i] = (row[i] + row[i - bpp]) & 0xFF
+    elif filter_type == 2:
+        for i in range(length):
+            row[i] = (row[i] + previous[i]) & 0xFF
+    elif filter_type == 3:
+        for i in range(length):
+            left = row[i - bpp] if i >= bpp else 0
+            row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(length):
+            a = row[i - bpp] if i >= bpp else 0
+            b = previous[i]
+            c = previous[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            if pa <= pb and pa <= pc:
+                predictor = a
+            elif pb <= pc:
+                predictor = b
+            else:
+                predictor = c
+            row[i] = (row[i] + predictor) & 0xFF
+    else:
+        raise ValueError(f"Unknown PNG filter type {filter_type}")
+
+
+def png_alpha_is_opaque(file_path: Path, info: RasterInfo) -> bool | None:
+    """Return whether every alpha sample in a PNG is fully opaque.
+
+    Rows are inflated and unfiltered incrementally, so the scan stops at the
+    first translucent pixel; for typical icons that is the very first row.
+    A fully opaque image is unfiltered in Python down to its last row, so the
+    cost grows with pixel count; callers opt in with --scan-alpha. Returns
+    None for interlaced or malformed files.
+    """
+    if not info.has_alpha_channel or info.interlaced or info.bit_depth not in (8, 16):
+        return None
+
+    channels = PNG_CHANNELS[info.color_type]
+    bpp = channels * info.bit_depth // 8
+    stride = info.width * bpp
+    alpha_offsets = range((channels - 1) * (bpp // channels), bpp)
+    previous = bytearray(stride)
+    pending = b""
+    rows_left = info.height
+    inflater = zlib.decompressobj()
+
+    try:
+        with open(file_path, "rb") as f:
+            for chunk_type, data in iter_png_chunks(f):
+                if chunk_type != b"IDAT":
+                    continue
+                pending += inflater.decompress(data)
+                start = 0
+                while rows_left and len(pending) - start > stride:
+                    filter_type = pending[start]
+                    row = bytearray(pending[start + 1:start + stride + 1])
+                    start += stride + 1
+                    unfilter_png_row(filter_type, row, previous, bpp)
+                    for offset in alpha_offsets:
+                        if row[offset::bpp].count(0xFF) != info.width:
+                            return False
+                    previous = row
+                    rows_left -= 1
+                # Drop the consumed rows once per chunk rather than once per row.
+                pending = pending[start:]
+                if not rows_left:
+                    return True
+    except (OSError, ValueError, zlib.error, struct.error):
+        return None
+    return None if rows_left else True
+
+
+def parse_scale(raw_scale: object) -> float:
+    try:
+        return float(str(raw_scale).rstrip("x"))
+    except ValueError:
+        return 1.0
+
+
+def load_template_rendering_intent(asset_dir: Path) -> str | None:
+    try:
+        with open(asset_dir / "Contents.json", "r", encoding="utf-8") as f:
+            contents = json.load(f)
+    except (OSError, ValueError):
+        return None
+    properties = contents.get("properties") if isinstance(contents, dict) else None
+    if isinstance(properties, dict):
+        return properties.get("template-rendering-intent")
+    return None
+
+
+def inspect_imageset_rasters(
+    name: str,
+    asset_dir: Path,
+    max_points: float,
+    scan_alpha: bool = False,
+) -> list[RasterIssue]:
+    """Flag rasters in one imageset that cost more decode time and memory than needed.
+
+    Point sizes are derived from pixel dimensions divided by the Contents.json
+    scale. Checks: point size above `max_points`; a scale variant whose point
+    size exceeds the smallest variant's by SCALE_MISMATCH_RATIO; 16-bit
+    samples; small template or grayscale glyphs that would be better shipped
+    as a single vector PDF; and, with `scan_alpha`, alpha channels with no
+    translucent pixel. Only that last check reads past the file headers.
+    """
+    entries = [
+        entry for entry in load_contents_entries(asset_dir)
+        if isinstance(entry.get("filename"), str)
+        and Path(entry["filename"]).suffix.lower() in RASTER_EXTENSIONS
+    ]
+    if not entries:
+        return []
+
+    rasters: list[tuple[Path, RasterInfo, float, float]] = []
+    for entry in entries:
+        file_path = asset_dir / entry["filename"]
+        info = read_raster_header(file_path)
+        if info is None:
+            continue
+        scale = parse_scale(entry.get("scale", "1x"))
+        point_size = max(info.width, info.height) / scale
+        rasters.append((file_path, info, scale, point_size))
+
+    if not rasters:
+        return []
+
+    issues: list[RasterIssue] = []
+    smallest_points = min(point_size for _, _, _, point_size in rasters)
+    template_intent = load_template_rendering_intent(asset_dir) == "template"
+
+    for file_path, info, scale, point_size in rasters:
+        dimensions = f"{info.width}x{info.height} @{scale:g}x"
+        if point_size > max_points:
+            issues.append(RasterIssue(
+                name, file_path, "oversized",
+                f"{dimensions} is {point_size:.0f}pt, above {max_points:g}pt",
+            ))
+        elif len(rasters) > 1 and point_size > smallest_points * SCALE_MISMATCH_RATIO:
+            issues.append(RasterIssue(
+                name, file_path, "scale-mismatch",
+                f"{dimensions} is {point_size:.0f}pt, other variants are {smallest_points:.0f}pt",
+            ))
+
+        if info.bit_depth == 16:
+            issues.append(RasterIssue(name, file_path, "16-bit", f"{dimensions} stores 16-bit samples"))
+
+        if scan_alpha and info.has_alpha_channel and png_alpha_is_opaque(file_path, info):
+            issues.append(RasterIssue(
+                name, file_path, "opaque-alpha",
+                f"{dimensions} has an alpha channel but no transparent pixels",
+            ))
+
+    is_glyph = template_intent or all(
+        info.format == "png" and info.color_type in PNG_GRAYSCALE_COLOR_TYPES
+        for _, info, _, _ in rasters
+    )
+    if is_glyph and max(point_size for _, _, _, point_size in rasters) <= VECTOR_CANDIDATE_MAX_POINTS:
+        reason = "template rendering" if template_intent else "grayscale"
+        issues.append(RasterIssue(
+            name, asset_dir, "vector-candidate",
+            f"{len(rasters)} {reason} raster(s) at {smallest_points:.0f}pt could be one vector PDF",
+        ))
+
+    return issues
+
+
+def inspect_rasters(assets: dict[str, Path], max_points: float, scan_alpha: bool = False) -> list[RasterIssue]:
+    issues: list[RasterIssue] = []
+    for name in sorted(assets):
+        asset_dir = assets[name]
+        if asset_dir.suffix.lower() == ".imageset":
+            issues.extend(inspect_imageset_rasters(name, asset_dir, max_points, scan_alpha))
+    return issues
+
+
 def iter_scan_files(
     scan_roots: list[Path],
     allowed_extensions: set[str],
@@ -99,6 +576,8 @@ def iter_scan_files(
 STRING_LITERAL_RE = re.compile(
     r'"([^"\\\r\n]*(?:\\.[^"\\\r\n]*)*)"|\'([^\'\\\r\n]*(?:\\.[^\'\\\r\n]*)*)\''
 )
+# The same pattern for raw file contents; only the literals it finds get decoded.
+STRING_LITERAL_BYTES_RE = re.compile(STRING_LITERAL_RE.pattern.encode("ascii"))
 FORMAT_SPECIFIER_RE = re.compile(
     r"%(?:\d+\$)?[-+ #0]*(?:\d+|\*)?(?:\.(?:\d+|\*))?"
     r"(?:hh|h|ll|l|L|z|j|t)?[@dDuUxXoOfFeEgGcCsSpaA]"
@@ -115,6 +594,25 @@ def extract_string_literals(content: str) -> set[str]:
     return values
 
 
+def extract_string_literals_from_bytes(data) -> set[str]:
+    """extract_string_literals over undecoded file contents (bytes or an mmap)."""
+    values: set[str] = set()
+    for match in STRING_LITERAL_BYTES_RE.finditer(data):
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        if value:
+            values.add(decode(value))
+    return values
+
+
+def iter_string_literal_facts(content: str, file_path: str = "") -> Iterable[Fact]:
+    """Same literals as extract_string_literals, with their positions, for the source index."""
+    line_of = LineCounter(content)
+    for match in STRING_LITERAL_RE.finditer(content):
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        if value:
+            yield Fact(value, line_of(match.start()), match.start(), match.end())
+
+
 def interpolation_template_to_regex(template: str) -> tuple[re.Pattern[str], int] | None:
     if "\\(" not in template:
         return None
@@ -186,9 +684,59 @@ def maybe_dynamic_pattern(template: str) -> re.Pattern[str] | None:
     return None
 
 
+def read_file_literals(scan_files: Iterable[Path]) -> Iterable[tuple[Path, set[str] | None]]:
+    for file_path in scan_files:
+        try:
+            with ExitStack() as stack:
+                with span("read", path=str(file_path)):
+                    data = stack.enter_context(read_bytes(file_path))
+                with span("extract", path=str(file_path)):
+                    literals = extract_string_literals_from_bytes(data)
+        except OSError:
+            yield file_path, None
+            continue
+        yield file_path, literals
+
+
+def index_file_literals(
+    index_path: Path,
+    scan_roots: list[Path],
+    allowed_extensions: set[str],
+    excluded_dir_names: set[str],
+) -> list[tuple[Path, set[str] | None]]:
+    """read_file_literals over iter_scan_files, answered by the source index."""
+    extractor = Extractor("asset_literals", tuple(sorted(allowed_extensions)), iter_string_literal_facts)
+    file_literals: list[tuple[Path, set[str] | None]] = []
+    with SourceIndex(index_path) as index:
+        for root in scan_roots:
+            files, stats = index.refresh(root, [extractor], excluded_dir_names, (".xcassets",))
+            values = index.values(extractor.kind, files)
+            print(f"Source index ({root}): {stats.describe()}", file=sys.stderr)
+            file_literals.extend((Path(path), values.get(path)) for path in files)
+    return file_literals
+
+
 def find_asset_usage(
     assets: dict[str, Path],
     scan_files: Iterable[Path],
+) -> tuple[dict[str, set[Path]], dict[str, set[Path]], int]:
+    return find_asset_usage_in_literals(assets, read_file_literals(scan_files))
+
+
+def find_asset_usage_in_literals(
+    assets: dict[str, Path],
+    file_literals: Iterable[tuple[Path, set[str] | None]],
+) -> tuple[dict[str, set[Path]], dict[str, set[Path]], int]:
+    """Match assets against literals already extracted per file (None for unreadable files)."""
+    with span("match", assets=len(assets)) as info:
+        result = _match_asset_literals(assets, file_literals)
+        info["files"] = result[2]
+    return result
+
+
+def _match_asset_literals(
+    assets: dict[str, Path],
+    file_literals: Iterable[tuple[Path, set[str] | None]],
 ) -> tuple[dict[str, set[Path]], dict[str, set[Path]], int]:
     exact_usage: dict[str, set[Path]] = {name: set() for name in assets}
     possible_usage: dict[str, set[Path]] = {name: set() for name in assets}
@@ -196,14 +744,11 @@ def find_asset_usage(
     asset_names = set(assets.keys())
     ordered_asset_names = sorted(asset_names)
 
-    for file_path in scan_files:
+    for file_path, literals in file_literals:
         scanned_files += 1
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
+        if literals is None:
             continue
 
-        literals = extract_string_literals(content)
         for literal in literals:
             if literal in asset_names:
                 exact_usage[literal].add(file_path)
@@ -223,6 +768,30 @@ def find_asset_usage(
     return exact_usage, possible_usage, scanned_files
 
 
+def classify_asset_usage(
+    assets: dict[str, Path],
+    exact_usage: dict[str, set[Path]],
+    possible_usage: dict[str, set[Path]],
+    strict_literals: bool,
+) -> tuple[list[str], list[str], list[str]]:
+    """Split assets into (used, maybe used, unused) name lists."""
+    used_assets = sorted([name for name, refs in exact_usage.items() if refs])
+
+    if strict_literals:
+        maybe_used_assets: list[str] = []
+        unused_assets = [name for name, refs in exact_usage.items() if not refs]
+    else:
+        maybe_used_assets = [
+            name for name, refs in possible_usage.items()
+            if not exact_usage[name] and refs
+        ]
+        unused_assets = [
+            name for name in assets
+            if not exact_usage[name] and not possible_usage[name]
+        ]
+    return used_assets, maybe_used_assets, unused_assets
+
+
 def build_parser() -> argparse.ArgumentParser:
     script_dir = Path(__file__).resolve().parent
     air_root = script_dir.parent
@@ -282,13 +851,53 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable dynamic template matching and use exact string literals only.",
     )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON, including per-asset reclaimable bytes.",
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Also report byte-identical payload files shared by several asset sets.",
+    )
+    parser.add_argument(
+        "--rasters",
+        action="store_true",
+        help="Also inspect PNG/JPEG headers for oversized, 16-bit or vector-candidate images.",
+    )
+    parser.add_argument(
+        "--scan-alpha",
+        action="store_true",
+        help="With --rasters, also decode PNGs that have an alpha channel and flag those with no "
+             "transparent pixel. Reads every pixel of each opaque image, so it is much slower.",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=float,
+        default=DEFAULT_MAX_POINTS,
+        help=f"Largest expected point size for a raster with --rasters (default: {DEFAULT_MAX_POINTS}).",
+    )
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_INDEX_PATH,
+        metavar="DB",
+        help="Read string literals from the shared SQLite source index, re-reading only changed "
+             f"files (default DB: {DEFAULT_INDEX_PATH}).",
+    )
+    tracing.add_arguments(parser)
     return parser
 
 
 def main() -> int:
-    parser = build_parser()
-    args = parser.parse_args()
+    args = build_parser().parse_args()
+    with tracing.session(args, "find_unused_assets"):
+        return run(args)
 
+
+def run(args: argparse.Namespace) -> int:
     assets_path = args.assets.resolve()
     if not assets_path.exists() or not assets_path.is_dir():
         print(f"Error: assets catalog not found: {assets_path}", file=sys.stderr)
@@ -315,7 +924,8 @@ def main() -> int:
     excluded_dirs = set(DEFAULT_EXCLUDED_DIRS) | set(args.exclude_dir)
 
     try:
-        assets = collect_asset_names(assets_path, asset_types)
+        with span("walk", catalog=str(assets_path)):
+            assets = collect_asset_names(assets_path, asset_types)
     except ValueError as err:
         print(f"Error: {err}", file=sys.stderr)
         return 2
@@ -324,25 +934,94 @@ def main() -> int:
         print("No assets found for selected types.")
         return 0
 
-    exact_usage, possible_usage, scanned_files = find_asset_usage(
-        assets=assets,
-        scan_files=iter_scan_files(scan_roots, extensions, excluded_dirs),
+    if args.index is not None:
+        exact_usage, possible_usage, scanned_files = find_asset_usage_in_literals(
+            assets, index_file_literals(args.index, scan_roots, extensions, excluded_dirs)
+        )
+    else:
+        exact_usage, possible_usage, scanned_files = find_asset_usage(
+            assets=assets,
+            scan_files=iter_scan_files(scan_roots, extensions, excluded_dirs),
+        )
+
+    used_assets, maybe_used_assets, unused_assets = classify_asset_usage(
+        assets, exact_usage, possible_usage, args.strict_literals
     )
 
-    used_assets = sorted([name for name, refs in exact_usage.items() if refs])
+    with span("measure_sizes", assets=len(assets)):
+        sizes = measure_asset_sizes(assets)
+    maybe_used_assets = sort_by_reclaimable_bytes(maybe_used_assets, sizes)
+    unused_assets = sort_by_reclaimable_bytes(unused_assets, sizes)
+    catalog_bytes = sum(size.total_bytes for size in sizes.values())
+    unused_bytes = sum(sizes[name].total_bytes for name in unused_assets)
+    maybe_used_bytes = sum(sizes[name].total_bytes for name in maybe_used_assets)
 
-    if args.strict_literals:
-        maybe_used_assets: list[str] = []
-        unused_assets = sorted([name for name, refs in exact_usage.items() if not refs])
-    else:
-        maybe_used_assets = sorted([
-            name for name, refs in possible_usage.items()
-            if not exact_usage[name] and refs
-        ])
-        unused_assets = sorted([
-            name for name in assets
-            if not exact_usage[name] and not possible_usage[name]
-        ])
+    maybe_used_set = set(maybe_used_assets)
+
+    def usage_status(name: str) -> str:
+        if exact_usage[name]:
+            return "used"
+        if name in maybe_used_set:
+            return "maybe-used"
+        return "unused"
+
+    with span("hash_payloads"):
+        duplicate_groups = find_duplicate_payloads(assets) if args.duplicates else []
+    duplicate_bytes = sum(group.wasted_bytes for group in duplicate_groups)
+    with span("inspect_rasters"):
+        raster_issues = inspect_rasters(assets, args.max_points, args.scan_alpha) if args.rasters else []
+
+    if args.json:
+        def describe(name: str) -> dict:
+            return {"name": name, "path": str(assets[name]), **sizes[name].to_json()}
+
+        report = {
+            "catalog": str(assets_path),
+            "scan_roots": [str(root) for root in scan_roots],
+            "scanned_files": scanned_files,
+            "totals": {
+                "assets": len(assets),
+                "used": len(used_assets),
+                "maybe_used": len(maybe_used_assets),
+                "unused": len(unused_assets),
+                "catalog_bytes": catalog_bytes,
+                "maybe_used_bytes": maybe_used_bytes,
+                "unused_bytes": unused_bytes,
+            },
+            "unused": [describe(name) for name in unused_assets],
+            "maybe_used": [describe(name) for name in maybe_used_assets],
+            "used": used_assets,
+        }
+        if args.duplicates:
+            report["totals"]["duplicate_bytes"] = duplicate_bytes
+            report["duplicates"] = [
+                {
+                    "sha256": group.digest,
+                    "bytes": group.size,
+                    "wasted_bytes": group.wasted_bytes,
+                    "files": [
+                        {"asset": name, "path": str(path), "usage": usage_status(name)}
+                        for name, path in group.files
+                    ],
+                }
+                for group in duplicate_groups
+            ]
+        if args.rasters:
+            report["rasters"] = [
+                {
+                    "asset": issue.asset,
+                    "path": str(issue.path),
+                    "kind": issue.kind,
+                    "detail": issue.detail,
+                    "usage": usage_status(issue.asset),
+                }
+                for issue in raster_issues
+            ]
+        with span("serialize"):
+            print(json.dumps(report, indent=2))
+        if args.fail_on_unused and unused_assets:
+            return 1
+        return 0
 
     print("Asset Usage Report")
     print("==================")
@@ -351,26 +1030,46 @@ def main() -> int:
     print(f"Asset types:  {', '.join(sorted(t.lstrip('.') for t in asset_types))}")
     print(f"Extensions:   {', '.join(sorted(ext.lstrip('.') for ext in extensions))}")
     print(f"Scanned files:{scanned_files}")
-    print(f"Total assets: {len(assets)}")
+    print(f"Total assets: {len(assets)} ({format_bytes(catalog_bytes)})")
     print(f"Used assets:  {len(used_assets)}")
     if args.strict_literals:
         print("Maybe-used:   0 (disabled via --strict-literals)")
     else:
-        print(f"Maybe-used:   {len(maybe_used_assets)}")
-    print(f"Unused assets:{len(unused_assets)}")
+        print(f"Maybe-used:   {len(maybe_used_assets)} ({format_bytes(maybe_used_bytes)})")
+    print(f"Unused assets:{len(unused_assets)} ({format_bytes(unused_bytes)} reclaimable)")
 
     if maybe_used_assets:
-        print("\nMaybe-used assets (dynamic template match):")
+        print("\nMaybe-used assets (dynamic template match), largest first:")
         for name in maybe_used_assets:
-            print(f"- {name}")
+            print(f"- {name} ({format_bytes(sizes[name].total_bytes)})")
 
     if unused_assets:
-        print("\nUnused assets:")
+        print("\nUnused assets, largest first:")
         for name in unused_assets:
+            size_label = format_bytes(sizes[name].total_bytes)
             if args.with_paths:
-                print(f"- {name} ({assets[name]})")
+                print(f"- {name} ({size_label}, {assets[name]})")
             else:
-                print(f"- {name}")
+                print(f"- {name} ({size_label})")
+
+    if args.duplicates:
+        print(
+            f"\nDuplicate payloads: {len(duplicate_groups)} groups "
+            f"({format_bytes(duplicate_bytes)} wasted)"
+        )
+        for group in duplicate_groups:
+            print(
+                f"- {group.digest[:12]} {format_bytes(group.size)} x{len(group.files)} "
+                f"({format_bytes(group.wasted_bytes)} wasted)"
+            )
+            for name, path in group.files:
+                print(f"  {name} [{usage_status(name)}] {path.relative_to(assets_path)}")
+
+    if args.rasters:
+        print(f"\nRaster issues: {len(raster_issues)}")
+        for issue in raster_issues:
+            print(f"- {issue.asset} [{issue.kind}] {issue.detail}")
+            print(f"  {issue.path.relative_to(assets_path)}")
 
     if args.show_used:
         print("\nUsed assets:")
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite index of what the scanning scripts extract from source files.
+
+Each tool describes what it pulls out of a file with an Extractor: string literals, lang() keys,
+imports, and so on. SourceIndex.refresh() walks a root and re-reads only the files whose mtime or
+size changed since the last run, or that an extractor has not indexed yet. Every extracted value
+is stored with its line and offsets, so a warm run answers from the database without reading
+unchanged sources.
+
+Tools that share an Extractor share its rows: after find_unused_localization_keys.py has indexed
+lang() calls, find_air_localizations.py gets them for free.
+
+The index lives in .cache/source_index.sqlite next to this file. Delete it to start over.
+
+Usage from scripts outside this directory:
+
+    sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts"))
+    from source_index import Extractor, Fact, SourceIndex
+
+    with SourceIndex() as index:
+        files, stats = index.refresh(root, [MY_EXTRACTOR])
+        facts = index.facts(MY_EXTRACTOR.kind, files)
+
+Run directly to print what the index holds:
+
+    python3 source_index.py [--index PATH]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from tracing import span
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / ".cache" / "source_index.sqlite"
+
+# Bump when the schema changes; an index with another version is rebuilt from scratch.
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE extracted (
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (file_id, kind)
+) WITHOUT ROWID;
+CREATE TABLE facts (
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    snippet TEXT NOT NULL
+);
+CREATE INDEX facts_by_file ON facts (file_id, kind);
+CREATE INDEX facts_by_value ON facts (kind, value);
+"""
+
+
+class Fact(NamedTuple):
+    """One extracted value: its 1-based line, character offsets in the file and an optional snippet."""
+    value: str
+    line: int
+    start: int = 0
+    end: int = 0
+    snippet: str = ""
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """
+    Pulls facts of one kind out of a decoded source file; extract(content, path).
+    Bump `version` whenever the output changes so indexed files get re-extracted.
+    """
+    kind: str
+    extensions: Tuple[str, ...]
+    extract: Callable[[str, str], Iterable[Fact]]
+    version: int = 1
+
+
+@dataclass
+class RefreshStats:
+    files: int = 0
+    read: int = 0
+    removed: int = 0
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.files} files indexed, {self.read} re-read, {self.removed} removed "
+            f"in {self.elapsed * 1000:.0f} ms"
+        )
+
+
+class LineCounter:
+    """Turns increasing character offsets into 1-based line numbers without rescanning from the start."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.line = 1
+        self.position = 0
+
+    def __call__(self, position: int) -> int:
+        if position < self.position:
+            self.line, self.position = 1, 0
+        self.line += self.content.count("\n", self.position, position)
+        self.position = position
+        return self.line
+
+
+def _read_and_extract(path: str, extractors: Sequence[Extractor]) -> Tuple[Optional[str], Dict[str, List[Fact]]]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return str(e), {}
+    content = data.decode("utf-8", errors="ignore")
+    return None, {extractor.kind: list(extractor.extract(content, path)) for extractor in extractors}
+
+
+def _prefix_range(root: str) -> Tuple[str, str]:
+    """Bounds selecting every stored path below `root` with a plain index range scan."""
+    return root + os.sep, root + chr(ord(os.sep) + 1)
+
+
+class SourceIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            self._rebuild()
+
+    def _rebuild(self):
+        with self.db:
+            for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                self.db.execute(f"DROP TABLE {name}")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> "SourceIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def refresh(
+        self,
+        root: str | Path,
+        extractors: Sequence[Extractor],
+        excluded_dirs: Iterable[str] = (),
+        excluded_dir_suffixes: Tuple[str, ...] = (),
+        jobs: int = 8,
+    ) -> Tuple[List[str], RefreshStats]:
+        """
+        Bring the index up to date for every file under `root` that one of the extractors handles.
+        Returns the sorted absolute paths of those files, for passing to facts(), and what it did.
+        """
+        started = time.perf_counter()
+        root = os.path.realpath(root)
+        excluded_dirs = set(excluded_dirs)
+        extensions = tuple({ext for extractor in extractors for ext in extractor.extensions})
+
+        walked: Dict[str, os.stat_result] = {}
+        with span("walk", root=root) as info:
+            for current_root, dirs, files in os.walk(root):
+                dirs[:] = [
+                    d for d in dirs
+                    if d not in excluded_dirs and not (excluded_dir_suffixes and d.endswith(excluded_dir_suffixes))
+                ]
+                for filename in files:
+                    if filename.lower().endswith(extensions):
+                        path = os.path.join(current_root, filename)
+                        try:
+                            walked[path] = os.stat(path)
+                        except OSError:
+                            continue
+            info["files"] = len(walked)
+
+        low, high = _prefix_range(root)
+        known: Dict[str, Tuple[int, int, int]] = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in self.db.execute(
+                "SELECT id, path, mtime_ns, size FROM files WHERE path > ? AND path < ?", (low, high)
+            )
+        }
+        versions: Dict[Tuple[int, str], int] = {
+            (file_id, kind): version
+            for file_id, kind, version in self.db.execute(
+                "SELECT e.file_id, e.kind, e.version FROM extracted e JOIN files f ON f.id = e.file_id "
+                "WHERE f.path > ? AND f.path < ?", (low, high)
+            )
+        }
+
+        # path -> (stale: the file changed and every kind it had must go, extractors to run)
+        pending: Dict[str, Tuple[bool, List[Extractor]]] = {}
+        for path, st in walked.items():
+            applicable = [e for e in extractors if path.lower().endswith(e.extensions)]
+            entry = known.get(path)
+            if entry is None or entry[1:] != (st.st_mtime_ns, st.st_size):
+                pending[path] = (entry is not None, applicable)
+                continue
+            outdated = [e for e in applicable if versions.get((entry[0], e.kind)) != e.version]
+            if outdated:
+                pending[path] = (False, outdated)
+
+        paths = sorted(pending)
+        with span("extract", files=len(paths), kinds=[e.kind for e in extractors]), \
+                ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = list(executor.map(lambda path: _read_and_extract(path, pending[path][1]), paths))
+
+        removed = [
+            file_id for path, (file_id, _, _) in known.items()
+            if path not in walked and not os.path.exists(path)
+        ]
+
+        with span("write", files=len(paths), removed=len(removed)), self.db:
+            for path, (error, facts) in zip(paths, results):
+                stale, run = pending[path]
+                st = walked[path]
+                entry = known.get(path)
+                if entry is None:
+                    file_id = self.db.execute(
+                        "INSERT INTO files (path, mtime_ns, size, error) VALUES (?, ?, ?, ?)",
+                        (path, st.st_mtime_ns, st.st_size, error),
+                    ).lastrowid
+                else:
+                    file_id = entry[0]
+                    self.db.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ?, error = ? WHERE id = ?",
+                        (st.st_mtime_ns, st.st_size, error, file_id),
+                    )
+                if stale:
+                    self.db.execute("DELETE FROM facts WHERE file_id = ?", (file_id,))
+                    self.db.execute("DELETE FROM extracted WHERE file_id = ?", (file_id,))
+                for extractor in run:
+                    if not stale and entry is not None:
+                        self.db.execute(
+                            "DELETE FROM facts WHERE file_id = ? AND kind = ?", (file_id, extractor.kind)
+                        )
+                    self.db.executemany(
+                        "INSERT INTO facts (file_id, kind, value, line, start, end, snippet) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        ((file_id, extractor.kind, *fact) for fact in facts.get(extractor.kind, ())),
+                    )
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO extracted (file_id, kind, version) VALUES (?, ?, ?)",
+                        (file_id, extractor.kind, extractor.version),
+                    )
+            for table, column in (("facts", "file_id"), ("extracted", "file_id"), ("files", "id")):
+                self.db.executemany(f"DELETE FROM {table} WHERE {column} = ?", ((file_id,) for file_id in removed))
+
+        stats = RefreshStats(
+            files=len(walked),
+            read=len(paths),
+            removed=len(removed),
+            elapsed=time.perf_counter() - started,
+        )
+        return sorted(walked), stats
+
+    def _select_paths(self, paths: Iterable[str]):
+        self.db.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (path TEXT PRIMARY KEY) WITHOUT ROWID")
+        with self.db:
+            self.db.execute("DELETE FROM wanted")
+            self.db.executemany("INSERT OR IGNORE INTO wanted (path) VALUES (?)", ((path,) for path in paths))
+
+    def facts(self, kind: str, paths: Iterable[str]) -> Dict[str, Optional[List[Fact]]]:
+        """
+        Facts of one kind per file, each file's in the order they were extracted at equal offsets.
+        Files that could not be read map to None.
+        Only paths returned by refresh() are guaranteed to be present.
+        """
+        self._select_paths(paths)
+        result: Dict[str, Optional[List[Fact]]] = {}
+        rows = self.db.execute(
+            "SELECT f.path, f.error, x.value, x.line, x.start, x.end, x.snippet "
+            "FROM wanted w JOIN files f ON f.path = w.path "
+            "LEFT JOIN facts x ON x.file_id = f.id AND x.kind = ? "
+            "ORDER BY f.path, x.start, x.rowid",
+            (kind,),
+        )
+        for path, error, *fact in rows:
+            if error is not None:
+                result[path] = None
+                continue
+            facts = result.setdefault(path, [])
+            if fact[0] is not None:
+                facts.append(Fact(*fact))
+        return result
+
+    def values(self, kind: str, paths: Iterable[str]) -> Dict[str, Optional[Set[str]]]:
+        """Like facts(), but only the distinct values per file, which is all most checks need."""
+        self._select_paths(paths)
+        result: Dict[str, Optional[Set[str]]] = {}
+        rows = self.db.execute(
+            "SELECT f.path, f.error, x.value "
+            "FROM wanted w JOIN files f ON f.path = w.path "
+            "LEFT JOIN facts x ON x.file_id = f.id AND x.kind = ?",
+            (kind,),
+        )
+        for path, error, value in rows:
+            if error is not None:
+                result[path] = None
+                continue
+            values = result.setdefault(path, set())
+            if value is not None:
+                values.add(value)
+        return result
+
+    def summary(self) -> List[Tuple[str, int, int]]:
+        """(kind, files, facts) for every kind in the index."""
+        return self.db.execute(
+            "SELECT e.kind, COUNT(DISTINCT e.file_id), "
+            "(SELECT COUNT(*) FROM facts x WHERE x.kind = e.kind) "
+            "FROM extracted e GROUP BY e.kind ORDER BY e.kind"
+        ).fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show what the shared source index holds.")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help=f"Index database (default: {DEFAULT_INDEX_PATH})",
+    )
+    args = parser.parse_args()
+
+    if not args.index.exists():
+        print(f"No index at {args.index}; run a tool with --index to build it.", file=sys.stderr)
+        return 1
+    with SourceIndex(args.index) as index:
+        (files,) = index.db.execute("SELECT COUNT(*) FROM files").fetchone()
+        print(f"{args.index}: {files} files, {args.index.stat().st_size / 1024:.0f} KB")
+        for kind, kind_files, facts in index.summary():
+            print(f"  {kind:<32} {kind_files:>6} files  {facts:>8} facts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
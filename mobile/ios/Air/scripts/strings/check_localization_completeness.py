@@ -11,6 +11,7 @@ since plural forms are language-dependent and may differ between languages.
 Usage:
     python check_localization_completeness.py --base en.yaml --compare ru.yaml
     python check_localization_completeness.py --base /path/to/base.yaml --compare /path/to/compare.yaml --verbose
+    python check_localization_completeness.py --all /path/to/i18n [--json]
 
 The script will:
 1. Load the base (English) localization file
@@ -30,6 +31,14 @@ Examples:
     # Check with verbose output
     python check_localization_completeness.py --base /path/to/en.yaml --compare /path/to/ru.yaml --verbose
 
+    # Check every locale in a directory against its en.yaml, printing a matrix
+    python check_localization_completeness.py --all /path/to/i18n
+
+In --all mode the base file (en.yaml in that directory unless --base is given) is loaded once and
+the other *.yaml files are checked in parallel worker processes.
+
+--trace OUT.json and --profile show where the time goes (see ../tracing.py).
+
 Output format:
     MISSING KEYS IN ru.yaml:
     - missing_key_1
@@ -44,17 +53,25 @@ since they are language-dependent and expected to vary between languages.
 """
 
 import argparse
+import json
 import os
+import sys
 import yaml
-from typing import Dict, Set, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set, Any, Tuple
+
+from i18n_core import flatten_keys, load_locale
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
 
 
 def load_yaml_file(file_path: str) -> Dict[str, Any]:
     """Load YAML file and return its contents as a dictionary."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data if data is not None else {}
+        return load_locale(file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         return {}
@@ -63,33 +80,6 @@ def load_yaml_file(file_path: str) -> Dict[str, Any]:
         return {}
 
 
-def flatten_keys(data: Dict[str, Any], prefix: str = "") -> Set[str]:
-    """
-    Recursively flatten nested dictionary keys into a set of dot-separated keys.
-    For plural forms, only includes the parent key, not individual plural variations.
-    """
-    keys = set()
-
-    for key, value in data.items():
-        full_key = f"{prefix}.{key}" if prefix else key
-
-        if isinstance(value, dict):
-            # Check if this is a plural block (contains plural form keys)
-            plural_keys = {"zeroValue", "oneValue", "twoValue", "fewValue", "manyValue", "otherValue"}
-            if any(pk in value for pk in plural_keys):
-                # This is a plural block - only add the parent key, don't recurse into plural forms
-                keys.add(full_key)
-            else:
-                # This is a regular nested dictionary - recurse normally
-                keys.add(full_key)
-                nested_keys = flatten_keys(value, full_key)
-                keys.update(nested_keys)
-        else:
-            keys.add(full_key)
-
-    return keys
-
-
 def get_missing_keys(base_keys: Set[str], compare_keys: Set[str]) -> Set[str]:
     """Find keys that exist in base but are missing from comparison localization."""
     return base_keys - compare_keys
@@ -130,34 +120,150 @@ def print_results(missing_keys: Set[str], extraneous_keys: Set[str], compare_fil
         print("🎉 Localization is complete and clean!")
 
 
+def check_locale_file(compare_file: str, base_keys: Set[str]) -> Tuple[str, Dict[str, Any]]:
+    """Compare one locale file with the base keys; runs in a worker process in --all mode."""
+    locale = os.path.splitext(os.path.basename(compare_file))[0]
+    compare_data = load_yaml_file(compare_file)
+    if not compare_data:
+        return locale, {"file": compare_file, "error": "empty or could not be loaded"}
+
+    return locale, compare_locale_data(compare_file, compare_data, base_keys)
+
+
+def compare_locale_data(compare_file: str, compare_data: Dict[str, Any], base_keys: Set[str]) -> Dict[str, Any]:
+    """Build one row of the --all matrix from already loaded locale data."""
+    compare_keys = flatten_keys(compare_data)
+    return {
+        "file": compare_file,
+        "keys": len(compare_keys),
+        "missing": sorted(get_missing_keys(base_keys, compare_keys)),
+        "extraneous": sorted(get_extraneous_keys(base_keys, compare_keys)),
+    }
+
+
+def check_all_locales(base_keys: Set[str], locale_files: List[str], jobs: int) -> Dict[str, Dict[str, Any]]:
+    """Check every locale file against the already flattened base keys in parallel."""
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(locale_files)))) as executor:
+        return dict(executor.map(check_locale_file, locale_files, [base_keys] * len(locale_files)))
+
+
+def print_matrix(base_file: str, base_key_count: int, locales: Dict[str, Dict[str, Any]], verbose: bool):
+    """Print missing/extraneous counts for every locale as a table."""
+    width = max(len("locale"), *(len(locale) for locale in locales))
+
+    print(f"\n=== LOCALIZATION COMPLETENESS MATRIX ===")
+    print(f"Base: {base_file} ({base_key_count} keys)")
+    print()
+    print(f"{'locale':<{width}}  {'keys':>6}  {'missing':>7}  {'extraneous':>10}")
+    for locale, result in sorted(locales.items()):
+        if "error" in result:
+            print(f"{locale:<{width}}  ❌ {result['error']}")
+            continue
+        status = "✅" if not result["missing"] and not result["extraneous"] else "❌"
+        print(
+            f"{locale:<{width}}  {result['keys']:>6}  {len(result['missing']):>7}  "
+            f"{len(result['extraneous']):>10}  {status}"
+        )
+
+    if verbose:
+        for locale, result in sorted(locales.items()):
+            for label, keys in (("MISSING", result.get("missing")), ("EXTRANEOUS", result.get("extraneous"))):
+                if keys:
+                    print(f"\n{label} KEYS IN {os.path.basename(result['file'])}:")
+                    for key in keys:
+                        print(f"  - {key}")
+    print()
+
+
+def run_all(args) -> int:
+    """Handle --all: check every locale in a directory against the base."""
+    base_file = args.base or os.path.join(args.all, "en.yaml")
+    locale_files = sorted(
+        os.path.join(args.all, name)
+        for name in os.listdir(args.all)
+        if name.endswith((".yaml", ".yml"))
+        and os.path.abspath(os.path.join(args.all, name)) != os.path.abspath(base_file)
+    )
+    if not locale_files:
+        print(f"Error: No localization files found in '{args.all}'.")
+        return 1
+
+    with span("parse_yaml", path=base_file):
+        base_data = load_yaml_file(base_file)
+    if not base_data:
+        print("Error: Base localization file is empty or could not be loaded.")
+        return 1
+    base_keys = flatten_keys(base_data)
+
+    with span("match", locales=len(locale_files), jobs=args.jobs):
+        results = check_all_locales(base_keys, locale_files, args.jobs)
+    if args.json:
+        base = {"file": base_file, "keys": len(base_keys)}
+        with span("serialize"):
+            print(json.dumps({"base": base, "locales": results}, ensure_ascii=False, indent=2))
+    else:
+        print_matrix(base_file, len(base_keys), results, args.verbose)
+
+    has_issues = any(
+        "error" in result or result["missing"] or result["extraneous"]
+        for result in results.values()
+    )
+    return 1 if has_issues else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Check localization completeness by comparing with base English localization"
     )
     parser.add_argument(
         "--base",
-        required=True,
-        help="Path to the base (English) localization file"
+        help="Path to the base (English) localization file (default in --all mode: <dir>/en.yaml)"
     )
     parser.add_argument(
         "--compare",
-        required=True,
         help="Path to the localization file to compare against the base"
     )
+    parser.add_argument(
+        "--all",
+        metavar="DIR",
+        help="Check every *.yaml file in DIR against the base and print a matrix"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="With --all, print the matrix as JSON including the missing and extraneous keys"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes used by --all (default: CPU count)"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Show detailed information about the comparison"
     )
+    tracing.add_arguments(parser)
 
     args = parser.parse_args()
 
+    if not args.all and (not args.base or not args.compare):
+        parser.error("--base and --compare are required unless --all is given")
+    with tracing.session(args, "check_localization_completeness"):
+        return run_all(args) if args.all else run_compare(args)
+
+
+def run_compare(args) -> int:
+    """Handle --base/--compare: check one locale file against the base."""
     # Load the localization files
     print(f"Loading base file: {args.base}")
-    base_data = load_yaml_file(args.base)
+    with span("parse_yaml", path=args.base):
+        base_data = load_yaml_file(args.base)
 
     print(f"Loading comparison file: {args.compare}")
-    compare_data = load_yaml_file(args.compare)
+    with span("parse_yaml", path=args.compare):
+        compare_data = load_yaml_file(args.compare)
 
     if not base_data:
         print("Error: Base localization file is empty or could not be loaded.")
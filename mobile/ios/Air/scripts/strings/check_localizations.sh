@@ -22,47 +22,18 @@ echo "🔍 Localization Completeness Checker"
 echo "====================================="
 echo
 
-check_localization() {
-    local base_file="$1"
-    local compare_file="$2"
-    local description="$3"
-
-    if [ ! -f "$base_file" ]; then
-        echo -e "${RED}❌ Base file not found: $base_file${NC}"
-        return 1
-    fi
-
-    if [ ! -f "$compare_file" ]; then
-        echo -e "${RED}❌ Comparison file not found: $compare_file${NC}"
-        return 1
-    fi
-
-    echo -e "${BLUE}📋 Checking $description${NC}"
-    echo -e "${BLUE}   Base: $(basename "$base_file")${NC}"
-    echo -e "${BLUE}   Compare: $(basename "$compare_file")${NC}"
-    echo
-
-    if python3 "$SCRIPT_PATH" --base "$base_file" --compare "$compare_file"; then
-        echo -e "${GREEN}✅ $description check passed${NC}"
-    else
-        echo -e "${RED}❌ $description check failed${NC}"
-    fi
-    echo
-}
-
 # Check main localizations
 if [ -d "$MAIN_I18N_DIR" ]; then
     echo "🌍 Checking main localizations..."
     echo
 
-    # Check Russian
-    if [ -f "$MAIN_I18N_DIR/ru.yaml" ]; then
-        check_localization "$MAIN_I18N_DIR/en.yaml" "$MAIN_I18N_DIR/ru.yaml" "Russian (main)"
+    # Check every locale against en.yaml in one process
+    if python3 "$SCRIPT_PATH" --all "$MAIN_I18N_DIR"; then
+        echo -e "${GREEN}✅ Main localizations check passed${NC}"
+    else
+        echo -e "${RED}❌ Main localizations check failed${NC}"
     fi
-
-    # Add more languages here as they become available
-    # check_localization "$MAIN_I18N_DIR/en.yaml" "$MAIN_I18N_DIR/de.yaml" "German (main)"
-    # check_localization "$MAIN_I18N_DIR/en.yaml" "$MAIN_I18N_DIR/fr.yaml" "French (main)"
+    echo
 fi
 
 echo "🎯 All localization checks completed!"
@@ -83,4 +54,5 @@ echo "💡 Tips:"
 echo "   - Run localization checks with --verbose for detailed statistics"
 echo "   - Run Swift key scan with --verbose to see file counts"
 echo "   python3 $SCRIPT_PATH --base <base_file> --compare <compare_file> --verbose"
+echo "   python3 $SCRIPT_PATH --all $MAIN_I18N_DIR --json"
 echo "   python3 $SCRIPT_DIR/find_unused_localization_keys.py --ios-path $BASE_DIR --verbose"
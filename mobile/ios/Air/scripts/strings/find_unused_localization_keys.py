@@ -12,6 +12,18 @@ Usage:
     python find_unused_localization_keys.py --ios-path ../../../..
     python find_unused_localization_keys.py --ios-path ../../../.. --verbose
 
+With --unused it runs the reverse check instead: it scans Swift, Kotlin and web
+TypeScript sources under --ios-path in one pass and reports en.yaml keys that no
+platform references, with their size summed across every locale file.
+
+    python find_unused_localization_keys.py --ios-path ../../../../.. --unused
+
+With --index, extracted keys and literals come from the shared SQLite source index
+(../source_index.py) and only files changed since the last run are read again.
+
+--trace OUT.json records the walk/read/extract/match phases for chrome://tracing, and
+--profile prints a cProfile summary (../tracing.py).
+
 The script will:
 1. Scan all Swift files in the iOS folder
 2. Extract localization keys from lang(" patterns with source file tracking
@@ -31,16 +43,39 @@ Exit codes:
 import argparse
 import os
 import re
+import sys
+import time
 import yaml
-from typing import Dict, Set, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Set, List, Any, Iterable, Optional, Tuple
+
+from i18n_core import flatten_keys, load_locale
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source_index import DEFAULT_INDEX_PATH, Extractor, Fact, LineCounter, SourceIndex  # noqa: E402
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
+
+
+# Directories that never contain app sources; pruned before descending.
+DEFAULT_EXCLUDED_DIRS = {
+    ".git",
+    ".build",
+    "build",
+    "DerivedData",
+    "Pods",
+    "Carthage",
+    "node_modules",
+    ".swiftpm",
+}
 
 
 def load_yaml_file(file_path: str) -> Dict[str, Any]:
     """Load YAML file and return its contents as a dictionary."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data if data is not None else {}
+        return load_locale(file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         return {}
@@ -49,82 +84,317 @@ def load_yaml_file(file_path: str) -> Dict[str, Any]:
         return {}
 
 
-def flatten_keys(data: Dict[str, Any], prefix: str = "") -> Set[str]:
-    """
-    Recursively flatten nested dictionary keys into a set of dot-separated keys.
-    For plural forms, only includes the parent key, not individual plural variations.
-    """
-    keys = set()
+# (file path, 1-based line number, stripped source line)
+UsageSite = Tuple[str, int, str]
 
-    for key, value in data.items():
-        full_key = f"{prefix}.{key}" if prefix else key
+# Pattern to match lang("key_name" - note no closing paren
+# This captures the key inside the quotes
+LANG_CALL_PATTERN = re.compile(r'lang\("([^"]+)"')
 
-        if isinstance(value, dict):
-            # Check if this is a plural block (contains plural form keys)
-            plural_keys = {"zeroValue", "oneValue", "twoValue", "fewValue", "manyValue", "otherValue"}
-            if any(pk in value for pk in plural_keys):
-                # This is a plural block - only add the parent key, don't recurse into plural forms
-                keys.add(full_key)
-            else:
-                # This is a regular nested dictionary - recurse normally
-                keys.add(full_key)
-                nested_keys = flatten_keys(value, full_key)
-                keys.update(nested_keys)
-        else:
-            keys.add(full_key)
 
-    return keys
+def iter_source_files(root: str, extensions: Iterable[str], excluded_dirs: Set[str]) -> Iterable[str]:
+    """Walk `root` with os.scandir, skipping excluded directory names without descending into them."""
+    suffixes = tuple(extensions)
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        yield entry.path
+        except OSError:
+            continue
 
 
-def find_swift_files(ios_path: str) -> List[str]:
+def find_swift_files(ios_path: str, excluded_dirs: Set[str] = DEFAULT_EXCLUDED_DIRS) -> List[str]:
     """Find all Swift files in the iOS directory."""
-    swift_files = []
-    for root, dirs, files in os.walk(ios_path):
-        for file in files:
-            if file.endswith('.swift'):
-                swift_files.append(os.path.join(root, file))
-    return swift_files
+    return sorted(iter_source_files(ios_path, ('.swift',), excluded_dirs))
 
 
-def extract_localization_keys_from_file(file_path: str) -> Set[str]:
-    """Extract localization keys from a Swift file using regex pattern lang("key"."""
-    keys = set()
+def extract_localization_keys_from_file(file_path: str) -> Dict[str, List[UsageSite]]:
+    """
+    Extract localization keys from a Swift file using regex pattern lang("key".
+    Every match is returned with its line number and source line, so callers never need to re-read the file.
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
+    except Exception as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return {}
+    return extract_localization_keys_from_content(content, file_path)
 
-        # Pattern to match lang("key_name" - note no closing paren
-        # This captures the key inside the quotes
-        pattern = r'lang\("([^"]+)"'
-        matches = re.findall(pattern, content)
 
-        for match in matches:
-            keys.add(match)
+def extract_localization_keys_from_content(content: str, file_path: str) -> Dict[str, List[UsageSite]]:
+    """Extract lang("key" usages from already loaded Swift source."""
+    return group_lang_facts(iter_lang_facts(content, file_path), file_path)
 
-    except Exception as e:
-        print(f"Warning: Could not read file {file_path}: {e}")
 
+def iter_lang_facts(content: str, file_path: str = "") -> Iterable[Fact]:
+    """Yield every lang("key" call with its line, offsets and stripped source line."""
+    line_of = LineCounter(content)
+    for match in LANG_CALL_PATTERN.finditer(content):
+        position = match.start()
+        line_start = content.rfind('\n', 0, position) + 1
+        line_end = content.find('\n', position)
+        snippet = content[line_start:line_end if line_end != -1 else len(content)].strip()
+        yield Fact(match.group(1), line_of(position), position, match.end(), snippet)
+
+
+def group_lang_facts(facts: Iterable[Fact], file_path: str) -> Dict[str, List[UsageSite]]:
+    keys: Dict[str, List[UsageSite]] = {}
+    for fact in facts:
+        keys.setdefault(fact.value, []).append((file_path, fact.line, fact.snippet))
     return keys
 
 
-def extract_all_keys_from_swift(ios_path: str) -> Dict[str, Set[str]]:
-    """Extract all localization keys from all Swift files, tracking which file each key came from."""
-    all_keys = {}
-    swift_files = find_swift_files(ios_path)
+# Shared with dev/find_air_localizations.py through the source index.
+LANG_CALLS_EXTRACTOR = Extractor("swift_lang_calls", (".swift",), iter_lang_facts)
+
+
+# Source extensions scanned by --unused and the platform each belongs to.
+PLATFORM_EXTENSIONS = {
+    '.swift': 'iOS',
+    '.kt': 'Android',
+    '.ts': 'web',
+    '.tsx': 'web',
+}
+DOUBLE_QUOTED_LITERAL = r'"((?:[^"\\\n]|\\.)*)"'
+SINGLE_QUOTED_LITERAL = r"'((?:[^'\\\n]|\\.)*)'"
+TEMPLATE_LITERAL = r'`((?:[^`\\$]|\\.|\$(?!\{))*)`'
+LITERAL_PATTERNS = {
+    'iOS': re.compile(DOUBLE_QUOTED_LITERAL),
+    'Android': re.compile(DOUBLE_QUOTED_LITERAL),
+    'web': re.compile('|'.join((DOUBLE_QUOTED_LITERAL, SINGLE_QUOTED_LITERAL, TEMPLATE_LITERAL))),
+}
+LITERAL_ESCAPE_PATTERN = re.compile(r'\\(.)')
+LITERAL_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+
+def extract_string_literals_from_file(file_path: str) -> Tuple[str, Set[str]]:
+    """
+    Extract every string literal from a Swift, Kotlin or TypeScript file.
+    Any literal counts as a reference: keys often reach lang()/LocaleController through variables.
+    """
+    platform = PLATFORM_EXTENSIONS[os.path.splitext(file_path)[1]]
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except OSError as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return platform, set()
+
+    return platform, {fact.value for fact in iter_literal_facts(content, file_path)}
+
+
+def iter_literal_facts(content: str, file_path: str) -> Iterable[Fact]:
+    """Yield every string literal in a platform source file, with escapes decoded."""
+    line_of = LineCounter(content)
+    for match in LITERAL_PATTERNS[PLATFORM_EXTENSIONS[os.path.splitext(file_path)[1]]].finditer(content):
+        value = next((group for group in match.groups() if group is not None), '')
+        if '\\' in value:
+            value = LITERAL_ESCAPE_PATTERN.sub(lambda m: LITERAL_ESCAPES.get(m.group(1), m.group(1)), value)
+        yield Fact(value, line_of(match.start()), match.start(), match.end())
+
+
+PLATFORM_LITERALS_EXTRACTOR = Extractor("platform_literals", tuple(PLATFORM_EXTENSIONS), iter_literal_facts)
+
+
+def collect_platform_literals(
+    root: str,
+    excluded_dirs: Set[str],
+    jobs: int,
+    index_path: Optional[Path] = None,
+) -> Dict[str, Set[str]]:
+    """Collect string literals per platform from a single pruned walk over `root`."""
+    started = time.perf_counter()
+    per_platform: Dict[str, Set[str]] = {platform: set() for platform in LITERAL_PATTERNS}
+    file_counts: Dict[str, int] = {platform: 0 for platform in LITERAL_PATTERNS}
+    if index_path is not None:
+        with SourceIndex(index_path) as index:
+            files, stats = index.refresh(root, [PLATFORM_LITERALS_EXTRACTOR], excluded_dirs, jobs=jobs)
+            values = index.values(PLATFORM_LITERALS_EXTRACTOR.kind, files)
+        print(f"Source index: {stats.describe()}")
+        results = ((PLATFORM_EXTENSIONS[os.path.splitext(path)[1]], values.get(path) or set()) for path in files)
+        for platform, literals in results:
+            per_platform[platform].update(literals)
+            file_counts[platform] += 1
+    else:
+        with span("walk", root=root):
+            files = sorted(iter_source_files(root, PLATFORM_EXTENSIONS.keys(), excluded_dirs))
+        with span("extract", files=len(files)), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for platform, literals in executor.map(extract_string_literals_from_file, files):
+                per_platform[platform].update(literals)
+                file_counts[platform] += 1
+    counts = ', '.join(f"{count} {platform}" for platform, count in file_counts.items())
+    print(f"Scanned {len(files)} source files ({counts}) in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return per_platform
+
+
+def estimate_key_sizes(i18n_dir: str, keys: Set[str]) -> Tuple[Dict[str, int], int]:
+    """UTF-8 bytes of each key plus its values, summed across every locale YAML in `i18n_dir`."""
+    sizes = {key: 0 for key in keys}
+    locale_count = 0
+    for file_name in sorted(os.listdir(i18n_dir)):
+        if not file_name.endswith(('.yaml', '.yml')):
+            continue
+        locale_count += 1
+        data = load_yaml_file(os.path.join(i18n_dir, file_name))
+        for key in keys:
+            if key not in data:
+                continue
+            value = data[key]
+            values = value.values() if isinstance(value, dict) else [value]
+            sizes[key] += len(key.encode('utf-8')) + sum(
+                len(str(v).encode('utf-8')) for v in values if v is not None
+            )
+    return sizes, locale_count
+
+
+def report_unreferenced_keys(
+    root: str,
+    main_i18n_path: str,
+    excluded_dirs: Set[str],
+    jobs: int,
+    index_path: Optional[Path] = None,
+) -> int:
+    """Report en.yaml keys that no Swift, Kotlin or web source references."""
+    print("🔍 Unreferenced Localization Key Scanner")
+    print("========================================")
+    print()
+
+    with span("parse_yaml", path=main_i18n_path):
+        main_i18n_data = load_yaml_file(main_i18n_path)
+    if not main_i18n_data:
+        print("❌ No localization files found.")
+        return 1
+    yaml_keys = set(main_i18n_data.keys())
+
+    per_platform = collect_platform_literals(root, excluded_dirs, jobs, index_path)
+    for platform, literals in per_platform.items():
+        print(f"  {platform}: {len(yaml_keys & literals)} keys referenced")
+
+    referenced = set().union(*per_platform.values())
+    unreferenced = yaml_keys - referenced
+    if not unreferenced:
+        print("\n✅ Every key in the localization file is referenced by at least one platform.")
+        return 0
+
+    with span("estimate_sizes", keys=len(unreferenced)):
+        sizes, locale_count = estimate_key_sizes(os.path.dirname(main_i18n_path), unreferenced)
+    total_bytes = sum(sizes.values())
+    print(f"\n❌ {len(unreferenced)} of {len(yaml_keys)} keys are not referenced by any platform")
+    print(f"   Estimated size across {locale_count} locales: {total_bytes / 1024:.1f} KB")
+    print()
+    for key in sorted(unreferenced, key=lambda k: (-sizes[k], k)):
+        print(f"  - '{key}' ({sizes[key]} bytes)")
+    return 1
+
+
+def extract_all_keys_from_swift(
+    ios_path: str,
+    excluded_dirs: Set[str] = DEFAULT_EXCLUDED_DIRS,
+    jobs: int = 8,
+    index_path: Optional[Path] = None,
+) -> Tuple[Dict[str, Set[str]], Dict[str, List[UsageSite]]]:
+    """
+    Extract all localization keys from all Swift files in a single pass.
+    Returns the file names each key came from and every usage site of each key.
+    """
+    if index_path is not None:
+        with SourceIndex(index_path) as index:
+            swift_files, stats = index.refresh(ios_path, [LANG_CALLS_EXTRACTOR], excluded_dirs, jobs=jobs)
+            facts = index.facts(LANG_CALLS_EXTRACTOR.kind, swift_files)
+        print(f"Scanning {len(swift_files)} Swift files...")
+        print(f"Source index: {stats.describe()}")
+        per_file_keys = []
+        for path in swift_files:
+            if facts.get(path) is None:
+                print(f"Warning: Could not read file {path}")
+            per_file_keys.append(group_lang_facts(facts.get(path) or (), path))
+        return merge_key_usage(zip(swift_files, per_file_keys))
+
+    with span("walk", root=ios_path):
+        swift_files = find_swift_files(ios_path, excluded_dirs)
 
     print(f"Scanning {len(swift_files)} Swift files...")
 
-    for file_path in swift_files:
-        keys = extract_localization_keys_from_file(file_path)
+    with span("extract", files=len(swift_files)), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        per_file_keys = list(executor.map(extract_localization_keys_from_file, swift_files))
+
+    return merge_key_usage(zip(swift_files, per_file_keys))
+
+
+def merge_key_usage(
+    per_file_keys: Iterable[Tuple[str, Dict[str, List[UsageSite]]]],
+) -> Tuple[Dict[str, Set[str]], Dict[str, List[UsageSite]]]:
+    """Combine per-file results into the file names each key came from and all of its usage sites."""
+    all_keys: Dict[str, Set[str]] = {}
+    usage_sites: Dict[str, List[UsageSite]] = {}
+    for file_path, keys in per_file_keys:
         file_name = os.path.basename(file_path)
 
-        for key in keys:
+        for key, sites in keys.items():
             if key in all_keys:
                 all_keys[key].add(file_name)
             else:
                 all_keys[key] = {file_name}
+            usage_sites.setdefault(key, []).extend(sites)
+
+    return all_keys, usage_sites
+
+
+def report_missing_keys(
+    swift_keys_dict: Dict[str, Set[str]],
+    usage_sites: Dict[str, List[UsageSite]],
+    localized_keys: Set[str],
+    root: str,
+    show_locations: bool = False,
+) -> int:
+    """Print keys used in Swift code but absent from the localization keys; returns the exit code."""
+    missing_keys = set(swift_keys_dict) - localized_keys
+
+    print("\n=== LOCALIZATION KEY ANALYSIS ===")
+    print()
+
+    if missing_keys:
+        print(f"❌ MISSING KEYS IN LOCALIZATION FILES:")
+        print(f"   Found {len(missing_keys)} keys used in Swift code but missing from YAML files")
+        print()
+
+        for key in sorted(missing_keys):
+            if key in swift_keys_dict:
+                files = sorted(list(swift_keys_dict[key]))
+                print(f"  - '{key}' ({', '.join(files)})")
+            else:
+                print(f"  - '{key}' (unknown file)")
+            if show_locations:
+                for file_path, line_num, _ in usage_sites.get(key, []):
+                    print(f"      {os.path.relpath(file_path, root)}:{line_num}")
 
-    return all_keys
+        print(f"\nTotal missing keys: {len(missing_keys)}")
+
+        # Show some examples of usage
+        print(f"\n🔍 Usage examples...")
+        print("(showing first 5 examples):")
+
+        missing_sites = sorted(
+            (site for key in missing_keys for site in usage_sites.get(key, [])),
+            key=lambda site: (site[0], site[1]),
+        )
+        for file_path, line_num, snippet in missing_sites[:5]:
+            print(f"  📄 {os.path.basename(file_path)}:{line_num}")
+            print(f"     {snippet}")
+
+        return 1
+    else:
+        print("✅ ALL LOCALIZATION KEYS FOUND")
+        print("All keys used in Swift code are present in the localization files.")
+        return 0
 
 
 def main():
@@ -141,14 +411,50 @@ def main():
         default="src/i18n/en.yaml",
         help="Path to main i18n YAML file (default: src/i18n/en.yaml)"
     )
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        default=[],
+        help="Directory name to skip while scanning (repeatable, added to the defaults)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Threads used to read source files (default: 8)"
+    )
+    parser.add_argument(
+        "--show-locations",
+        action="store_true",
+        help="List every file:line where each missing key is used"
+    )
+    parser.add_argument(
+        "--unused",
+        action="store_true",
+        help="Report keys in the localization file that no Swift, Kotlin or web source references"
+    )
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_INDEX_PATH,
+        metavar="DB",
+        help="Read keys and literals from the shared SQLite source index, re-reading only changed files "
+             "(default DB: ../.cache/source_index.sqlite)"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Show detailed information"
     )
+    tracing.add_arguments(parser)
 
     args = parser.parse_args()
+    with tracing.session(args, "find_unused_localization_keys"):
+        return run(args)
 
+
+def run(args: argparse.Namespace) -> int:
     # Convert relative paths to absolute paths
     ios_path = os.path.abspath(args.ios_path)
     main_i18n_path = os.path.join(ios_path, args.main_i18n)
@@ -157,13 +463,17 @@ def main():
         print(f"Error: iOS path '{ios_path}' does not exist.")
         return 1
 
+    excluded_dirs = DEFAULT_EXCLUDED_DIRS | set(args.exclude_dir)
+    if args.unused:
+        return report_unreferenced_keys(ios_path, main_i18n_path, excluded_dirs, args.jobs, args.index)
+
     print("🔍 Swift Localization Key Scanner")
     print("=================================")
     print()
 
     # Extract keys from Swift files
     print("📱 Extracting localization keys from Swift files...")
-    swift_keys_dict = extract_all_keys_from_swift(ios_path)
+    swift_keys_dict, usage_sites = extract_all_keys_from_swift(ios_path, excluded_dirs, args.jobs, args.index)
 
     if not swift_keys_dict:
         print("❌ No localization keys found in Swift files.")
@@ -176,7 +486,8 @@ def main():
 
     # Load localization files
     print("\n📂 Loading localization files...")
-    main_i18n_data = load_yaml_file(main_i18n_path)
+    with span("parse_yaml", path=main_i18n_path):
+        main_i18n_data = load_yaml_file(main_i18n_path)
 
     if not main_i18n_data:
         print("❌ No localization files found.")
@@ -198,57 +509,8 @@ def main():
             files = sorted(list(swift_keys_dict[key]))
             print(f"  - '{key}' ({', '.join(files)})")
 
-    # Find missing keys
-    missing_keys = swift_keys - all_localized_keys
-
-    print("\n=== LOCALIZATION KEY ANALYSIS ===")
-    print()
-
-    if missing_keys:
-        print(f"❌ MISSING KEYS IN LOCALIZATION FILES:")
-        print(f"   Found {len(missing_keys)} keys used in Swift code but missing from YAML files")
-        print()
-
-        for key in sorted(missing_keys):
-            if key in swift_keys_dict:
-                files = sorted(list(swift_keys_dict[key]))
-                print(f"  - '{key}' ({', '.join(files)})")
-            else:
-                print(f"  - '{key}' (unknown file)")
-
-        print(f"\nTotal missing keys: {len(missing_keys)}")
-
-        # Show some examples of usage
-        print(f"\n🔍 Usage examples...")
-        print("(showing first 5 examples):")
-
-        examples_shown = 0
-        for swift_file in find_swift_files(ios_path):
-            if examples_shown >= 5:
-                break
-
-            try:
-                with open(swift_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-
-                for line_num, line in enumerate(lines, 1):
-                    for missing_key in missing_keys:
-                        if f'lang("{missing_key}"' in line:
-                            print(f"  📄 {os.path.basename(swift_file)}:{line_num}")
-                            print(f"     {line.strip()}")
-                            examples_shown += 1
-                            if examples_shown >= 5:
-                                break
-                    if examples_shown >= 5:
-                        break
-            except:
-                continue
-
-        return 1
-    else:
-        print("✅ ALL LOCALIZATION KEYS FOUND")
-        print("All keys used in Swift code are present in the localization files.")
-        return 0
+    with span("match", keys=len(swift_keys)):
+        return report_missing_keys(swift_keys_dict, usage_sites, all_localized_keys, ios_path, args.show_locations)
 
 
 if __name__ == "__main__":
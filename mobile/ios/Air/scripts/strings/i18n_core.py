@@ -0,0 +1,158 @@
+"""
+Shared helpers for the localization tools: loading locale YAML files and flattening their keys.
+
+Parsed locales are kept as snapshots under .cache/locales next to this file, keyed by a hash of
+the file contents, so repeat runs of any tool load a locale without re-parsing YAML. A snapshot
+is a marshal blob, or a pickle when the data holds types marshal cannot store (e.g. dates).
+Snapshots never go stale since a changed file, or a change to this module, hashes to a new name;
+delete the folder to reclaim space.
+
+Usage from scripts outside this directory:
+
+    sys.path.insert(0, str(PROJECT_ROOT / "mobile/ios/Air/scripts/strings"))
+    from i18n_core import load_locale, flatten_keys
+"""
+
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml  # pip install pyyaml
+
+# libyaml-backed loader is ~10x faster; fall back to pure Python when PyYAML was built without it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+PLURAL_FORMS = ("zeroValue", "oneValue", "twoValue", "fewValue", "manyValue", "otherValue")
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "locales"
+
+# Bump when the snapshot layout or what gets stored in it changes.
+SNAPSHOT_VERSION = 1
+
+# marshal and pickle blobs are only guaranteed readable by the interpreter that wrote them, and
+# hold what this module's loading code produced, so both are part of every snapshot's name.
+_SNAPSHOT_SALT = (
+    f"{SNAPSHOT_VERSION}:{sys.implementation.cache_tag}:{YAML_LOADER.__name__}:"
+    f"{hashlib.sha256(Path(__file__).read_bytes()).hexdigest()}"
+).encode()
+
+
+def is_plural_block(value: Any) -> bool:
+    """A plural block is a mapping holding plural forms (otherValue, oneValue, ...)."""
+    return isinstance(value, dict) and any(form in value for form in PLURAL_FORMS)
+
+
+def flatten_items(data: Any, prefix: str = "", collapse_plurals: bool = False) -> List[Tuple[str, Any]]:
+    """
+    Flatten nested mappings and lists into (path, value) leaf pairs, in document order.
+    Paths join mapping keys with '.' and add '[index]' for list items, starting from `prefix`.
+    With collapse_plurals, a plural block is returned as one item holding the whole mapping.
+    """
+    items: List[Tuple[str, Any]] = []
+    stack: List[Tuple[str, Any]] = [(prefix, data)]
+    while stack:
+        prefix, node = stack.pop()
+        if isinstance(node, dict) and not (collapse_plurals and prefix and is_plural_block(node)):
+            children = [(f"{prefix}.{key}" if prefix else str(key), value) for key, value in node.items()]
+        elif isinstance(node, list):
+            children = [(f"{prefix}[{index}]", item) for index, item in enumerate(node)]
+        else:
+            if prefix:
+                items.append((prefix, node))
+            continue
+        stack.extend(reversed(children))
+    return items
+
+
+def flatten_keys(data: Dict[str, Any]) -> Set[str]:
+    """
+    Flatten nested dictionary keys into a set of dot-separated keys.
+    Nested mappings contribute their own key as well as their children's; plural blocks only
+    contribute the parent key, since plural forms are language-dependent.
+    """
+    keys: Set[str] = set()
+    stack: List[Tuple[str, Dict[str, Any]]] = [("", data)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            full_key = f"{prefix}.{key}" if prefix else key
+            keys.add(full_key)
+            if isinstance(value, dict) and not is_plural_block(value):
+                stack.append((full_key, value))
+    return keys
+
+
+def stringify_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip()
+
+
+def _snapshot_paths(content: bytes, cache_dir: Path) -> Tuple[Path, Path]:
+    digest = hashlib.sha256(_SNAPSHOT_SALT + content).hexdigest()
+    return cache_dir / f"{digest}.marshal", cache_dir / f"{digest}.pickle"
+
+
+def _read_snapshot(marshal_path: Path, pickle_path: Path) -> Tuple[bool, Any]:
+    try:
+        with open(marshal_path, "rb") as f:
+            return True, marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    try:
+        with open(pickle_path, "rb") as f:
+            return True, pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return False, None
+
+
+def _write_snapshot(marshal_path: Path, pickle_path: Path, data: Any):
+    try:
+        blob, path = marshal.dumps(data), marshal_path
+    except ValueError:
+        blob, path = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), pickle_path
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        # Concurrent writers produce the same bytes, so the last rename winning is fine.
+        os.replace(tmp_path, path)
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works, just without it.
+        pass
+
+
+def load_locale(path: str | Path, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Any:
+    """
+    Load a locale YAML file, going through the snapshot cache unless cache_dir is None.
+    Returns an empty dict for an empty file. Raises OSError / yaml.YAMLError like a plain load.
+    Every call returns a fresh object, so callers may mutate the result.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    if cache_dir is not None:
+        marshal_path, pickle_path = _snapshot_paths(content, Path(cache_dir))
+        found, data = _read_snapshot(marshal_path, pickle_path)
+        if found:
+            return data
+
+    data = yaml.load(content.decode("utf-8"), Loader=YAML_LOADER)
+    if data is None:
+        data = {}
+    if cache_dir is not None:
+        _write_snapshot(marshal_path, pickle_path, data)
+    return data
+
+
+def load_locales(paths: Iterable[str | Path], cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Load several locale files, keyed by file name without extension (e.g. 'en', 'zh-Hans')."""
+    return {Path(path).stem: load_locale(path, cache_dir) for path in paths}
@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 import argparse
-import copy
+import hashlib
 import json
 import os
+import plistlib
 import re
 import shutil
 import subprocess
+import sys
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import NamedTuple
 
 import yaml  # pip install pyyaml
 
+from i18n_core import YAML_LOADER, load_locale
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
+
 PLURAL_KEYS = {
     "zeroValue": "zero",
     "oneValue": "one",
@@ -20,7 +33,11 @@ PLURAL_KEYS = {
     "otherValue": "other",
 }
 
-SCRIPT_DIR = Path(__file__).resolve().parent
+SCRIPT_PATH = Path(__file__).resolve()
+SCRIPT_DIR = SCRIPT_PATH.parent
+
+# Bump when the manifest layout or the meaning of a cached entry changes.
+BUILD_CACHE_VERSION = 2
 
 PLACEHOLDER_TYPE_OVERRIDES = {
     "$domains_expire": {
@@ -68,6 +85,12 @@ MAIN_APP_LOCALIZATION_KEYS = {
 }
 
 
+SWIFT_STRING_LITERAL_RE = re.compile(r'"((?:[^"\\\r\n]|\\.)*)"')
+SWIFT_ESCAPES = {'\\"': '"', "\\\\": "\\", "\\n": "\n", "\\t": "\t", "\\r": "\r", "\\'": "'"}
+SWIFT_ESCAPE_RE = re.compile(r"\\[\"\\ntr']")
+SWIFT_SCAN_EXCLUDED_DIRS = {".git", ".build", "build", "DerivedData", "Pods", "Carthage", "node_modules", ".swiftpm"}
+
+
 def resolve_relative_to_script(path: str) -> Path:
     path_obj = Path(path)
     if path_obj.is_absolute():
@@ -76,9 +99,7 @@ def resolve_relative_to_script(path: str) -> Path:
 
 
 def load_yaml(path: str | Path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    return data or {}
+    return load_locale(path) or {}
 
 
 def load_json(path: str | Path):
@@ -96,6 +117,67 @@ def load_file(path: str | Path):
         return load_json(path_obj)
     raise ValueError(f"Unsupported file extension: {path_obj.suffix}. Only .json, .yaml, and .yml are supported.")
 
+class TimedLoad(NamedTuple):
+    data: dict | None
+    started: float
+    seconds: float
+    pid: int
+    error: str | None = None
+
+
+def load_file_timed(path: Path) -> TimedLoad:
+    """Load one locale file, noting when and in which process. Runs inside pool workers."""
+    started = time.perf_counter()
+    try:
+        data = load_file(path)
+    except Exception as e:
+        return TimedLoad(None, started, time.perf_counter() - started, os.getpid(), str(e))
+    return TimedLoad(data, started, time.perf_counter() - started, os.getpid())
+
+
+def load_locale_files(locale_files: dict[str, list[Path]], jobs: int) -> dict[str, dict]:
+    """Load and merge every locale's files, in parallel when `jobs` > 1.
+
+    Files are merged per locale in `sorted(files)` order regardless of which
+    worker finishes first, so the result is identical to a serial load.
+    """
+    ordered = [
+        (locale_name, file_path)
+        for locale_name in sorted(locale_files)
+        for file_path in sorted(locale_files[locale_name])
+    ]
+    paths = [file_path for _, file_path in ordered]
+
+    started = time.perf_counter()
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            results = list(executor.map(load_file_timed, paths))
+    else:
+        results = [load_file_timed(path) for path in paths]
+
+    per_locale: dict[str, dict] = {locale_name: {} for locale_name in locale_files}
+    for (locale_name, file_path), result in zip(ordered, results):
+        if result.error is not None:
+            print(f"Warning: Failed to load {file_path}: {result.error}")
+            continue
+        per_locale[locale_name].update(result.data)
+        tracing.record(
+            "parse_yaml",
+            result.started,
+            result.seconds,
+            {"path": str(file_path), "locale": locale_name, "keys": len(result.data)},
+            pid=result.pid,
+        )
+
+    loader_name = "libyaml" if YAML_LOADER is not yaml.SafeLoader else "pure-Python"
+    print(
+        f"Loaded {sum(len(data) for data in per_locale.values())} keys from {len(paths)} files "
+        f"for {len(per_locale)} locales in {(time.perf_counter() - started) * 1000:.0f} ms "
+        f"({loader_name} loader, {max(1, min(jobs, len(paths)))} jobs)"
+    )
+    return per_locale
+
+
 def detect_locales(inputs, source_locale="en"):
     locales = []
     for p in inputs:
@@ -118,47 +200,86 @@ def normalize_value(v):
         return trim_trailing_newlines(v)
     return trim_trailing_newlines(json.dumps(v, ensure_ascii=False))
 
-def replace_named_placeholders(key: str, text: str, mapping: dict | None, type_spec: str) -> tuple[str, dict]:
-    if mapping is None:
-        mapping = {}
-    def repl(m):
-        name = m.group(1)
-        if name not in mapping:
-            mapping[name] = len(mapping) + 1
-        index = mapping[name]
-
-        applied_type_spec = str(type_spec)
-        applied_type_spec = PLACEHOLDER_TYPE_OVERRIDES.get(key, {}).get(name, applied_type_spec)
-        return f"%{index}${applied_type_spec}"
-    replaced = re.sub(r"%([a-zA-Z0-9_]+)%", repl, text)
-    return replaced, mapping
+PLACEHOLDER_RE = re.compile(r"%([a-zA-Z0-9_]+)%")
+PLURAL_KEYS_ORDER = ["zeroValue", "oneValue", "twoValue", "fewValue", "manyValue", "otherValue"]
+
+
+class PlaceholderError(ValueError):
+    pass
+
+
+class PlaceholderTable:
+    """Named placeholder -> positional format spec for one key, derived from the source locale.
+
+    Every locale rewrites `%name%` through the same table, so `%2$@` means the
+    same argument in every translation regardless of word order.
+    """
+
+    def __init__(self, key: str, source_value):
+        overrides = PLACEHOLDER_TYPE_OVERRIDES.get(key, {})
+        type_spec = "lld" if is_plural_block(source_value) else "@"
+        self.replacements: dict[str, str] = {}
+        for text in iter_value_texts(source_value):
+            for name in PLACEHOLDER_RE.findall(text):
+                if name not in self.replacements:
+                    index = len(self.replacements) + 1
+                    self.replacements[name] = f"%{index}${overrides.get(name, type_spec)}"
+        self.names = list(self.replacements)
+
+    def _replace(self, match: re.Match) -> str:
+        replacement = self.replacements.get(match.group(1))
+        if replacement is None:
+            raise PlaceholderError(match.group(1))
+        return replacement
+
+    def rewrite(self, text: str) -> str:
+        if "%" not in text:
+            return text
+        return PLACEHOLDER_RE.sub(self._replace, text)
+
+    def has_drift(self, value) -> bool:
+        """Whether numbering `value`'s placeholders by its own word order would disagree with the source.
+
+        That is how every locale used to be numbered, which silently swapped
+        or skipped arguments at runtime when a translation reordered or
+        omitted placeholders.
+        """
+        seen: list[str] = []
+        for text in iter_value_texts(value):
+            for name in PLACEHOLDER_RE.findall(text):
+                if name not in seen:
+                    seen.append(name)
+        return seen != self.names[:len(seen)]
+
+
+def iter_value_texts(value):
+    if is_plural_block(value):
+        for yaml_key in PLURAL_KEYS_ORDER:
+            if value.get(yaml_key) is not None:
+                yield normalize_value(value[yaml_key])
+    else:
+        yield normalize_value(value)
 
 def is_plural_block(v) -> bool:
     return isinstance(v, dict) and any(k in v for k in PLURAL_KEYS.keys())
 
-def build_nonplural_unit(key: str, text: str):
-    s = normalize_value(text)
-    replaced, _ = replace_named_placeholders(key, s, mapping=None, type_spec="@")
+def build_nonplural_unit(text: str, table: PlaceholderTable):
     return {
         "stringUnit": {
             "state": "translated",
-            "value": replaced,
+            "value": table.rewrite(normalize_value(text)),
         }
     }
 
-def build_plural_unit(key: str, forms: dict):
+def build_plural_unit(forms: dict, table: PlaceholderTable):
     variations = {}
-    mapping = {}
-    plural_keys_order = ["zeroValue","oneValue","twoValue","fewValue","manyValue","otherValue"]
-    for yaml_key in plural_keys_order:
+    for yaml_key in PLURAL_KEYS_ORDER:
         if yaml_key in forms and forms[yaml_key] is not None:
-            v = normalize_value(forms[yaml_key])
-            replaced, mapping = replace_named_placeholders(key, v, mapping=mapping, type_spec="lld")
             cat = PLURAL_KEYS[yaml_key]
             variations[cat] = {
                 "stringUnit": {
                     "state": "translated",
-                    "value": replaced
+                    "value": table.rewrite(normalize_value(forms[yaml_key]))
                 }
             }
 
@@ -188,7 +309,14 @@ def normalize_locale_name(filename: str) -> str:
     return name
 
 
-def build_strings_map(per_locale: dict, source_locale: str, locales: list[str], key_predicate=None) -> dict:
+def build_strings_map(per_locale: dict, source_locale: str, locales: list[str], key_predicate=None, placeholder_issues: list | None = None) -> dict:
+    """Build xcstrings buckets for every source key.
+
+    A locale unit that uses a placeholder the source value lacks is dropped
+    (the app falls back to the source language). Such units and units whose
+    placeholder order differs from the source are appended to
+    `placeholder_issues` as (kind, locale, key, detail) tuples.
+    """
     source_locale_lower = source_locale.lower()
     src_map = per_locale.get(source_locale_lower, {})
     strings = {}
@@ -203,12 +331,20 @@ def build_strings_map(per_locale: dict, source_locale: str, locales: list[str],
             continue
 
         bucket = {}
+        table = PlaceholderTable(key, src_map[key])
         for loc in ordered_locales:
             loc_map = per_locale.get(loc, {})
             if key not in loc_map:
                 continue
             v = loc_map[key]
-            unit = build_plural_unit(key, v) if is_plural_block(v) else build_nonplural_unit(key, v)
+            try:
+                unit = build_plural_unit(v, table) if is_plural_block(v) else build_nonplural_unit(v, table)
+            except PlaceholderError as error:
+                if placeholder_issues is not None:
+                    placeholder_issues.append(("unknown", loc, key, f"%{error}% is not in the source value"))
+                continue
+            if placeholder_issues is not None and loc != source_locale_lower and table.has_drift(v):
+                placeholder_issues.append(("drift", loc, key, "placeholder order differs from the source"))
             merge_localization_bucket(bucket, loc, unit)
 
         if "localizations" in bucket:
@@ -217,23 +353,350 @@ def build_strings_map(per_locale: dict, source_locale: str, locales: list[str],
     return dict(sorted(strings.items(), key=lambda x: str(x[0])))
 
 
-def with_extraction_state(strings: dict, extraction_state: str) -> dict:
-    updated_strings = copy.deepcopy(strings)
-    for bucket in updated_strings.values():
-        bucket["extractionState"] = extraction_state
-    return updated_strings
+def iter_swift_files(roots: list[Path]):
+    for root in roots:
+        for current_root, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if d not in SWIFT_SCAN_EXCLUDED_DIRS]
+            for filename in files:
+                if filename.endswith(".swift"):
+                    yield Path(current_root) / filename
+
+
+def collect_swift_string_literals(roots: list[Path]) -> set[str]:
+    """Collect every string literal in Swift sources.
+
+    Any literal counts as a reference, not only `lang("...")` arguments,
+    because keys are also passed through variables and ternaries before
+    reaching `lang()`.
+    """
+    literals: set[str] = set()
+    with span("extract", roots=[str(root) for root in roots]) as info:
+        for file_path in iter_swift_files(roots):
+            try:
+                content = file_path.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            for match in SWIFT_STRING_LITERAL_RE.finditer(content):
+                literals.add(SWIFT_ESCAPE_RE.sub(lambda m: SWIFT_ESCAPES[m.group(0)], match.group(1)))
+        info["literals"] = len(literals)
+    return literals
+
+
+def strip_unreferenced_keys(strings: dict, referenced: set[str], keep_predicate) -> tuple[dict, dict]:
+    """Split a strings map into (kept, removed) by Swift references and an allowlist predicate."""
+    kept = {}
+    removed = {}
+    for key, bucket in strings.items():
+        if key in referenced or keep_predicate(key):
+            kept[key] = bucket
+        else:
+            removed[key] = bucket
+    return kept, removed
+
+
+def estimate_string_bytes(strings: dict) -> dict[str, int]:
+    """UTF-8 bytes of keys plus values per locale, as they would appear in compiled string tables."""
+    per_locale: dict[str, int] = {}
+    for key, bucket in strings.items():
+        key_bytes = len(str(key).encode("utf-8"))
+        for locale, unit in bucket["localizations"].items():
+            plural = unit.get("variations", {}).get("plural", {})
+            values = [variation["stringUnit"]["value"] for variation in plural.values()] or [unit["stringUnit"]["value"]]
+            size = key_bytes + sum(len(value.encode("utf-8")) for value in values)
+            per_locale[locale] = per_locale.get(locale, 0) + size
+    return per_locale
+
+
+COMMON_STRING_TABLE = "Common"
+STRING_TABLES_MANIFEST_NAME = "string_tables.json"
 
 
-def write_catalog(output_path: Path, source_locale: str, strings: dict):
-    catalog = {
-        "sourceLanguage": source_locale,
-        "version": "1.0",
-        "strings": strings,
+def collect_module_string_literals(submodules_dir: Path) -> dict[str, set[str]]:
+    """Collect Swift string literals for each SubModule directory."""
+    return {
+        module_dir.name: collect_swift_string_literals([module_dir])
+        for module_dir in sorted(submodules_dir.iterdir())
+        if module_dir.is_dir()
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(catalog, f, ensure_ascii=False, indent=2)
+
+def assign_keys_to_tables(keys, module_literals: dict[str, set[str]], extra_literals: set[str] = frozenset()) -> dict[str, str]:
+    """Map each key to the one SubModule that references it, or to the common table.
+
+    Keys referenced by several modules, by `extra_literals` (code outside the
+    SubModules, such as the App target), or by nothing go to COMMON_STRING_TABLE.
+    """
+    owners: dict[str, set[str]] = {}
+    key_set = set(keys)
+    for module, literals in module_literals.items():
+        for key in literals & key_set:
+            owners.setdefault(key, set()).add(module)
+
+    assignment = {}
+    for key in keys:
+        modules = owners.get(key, set())
+        if len(modules) == 1 and key not in extra_literals:
+            assignment[key] = next(iter(modules))
+        else:
+            assignment[key] = COMMON_STRING_TABLE
+    return assignment
+
+
+def write_sharded_catalogs(output_dir: Path, source_locale: str, strings: dict, assignment: dict[str, str]) -> dict[Path, bool]:
+    """Write one <Table>.xcstrings per table plus a key -> table JSON manifest.
+
+    Returns {path: written} for every emitted file. Catalogs for tables that
+    no longer receive keys are removed.
+    """
+    tables: dict[str, dict] = {}
+    for key, bucket in strings.items():
+        tables.setdefault(assignment.get(key, COMMON_STRING_TABLE), {})[key] = bucket
+
+    results: dict[Path, bool] = {}
+    for table, table_strings in sorted(tables.items()):
+        path = output_dir / f"{table}.xcstrings"
+        results[path] = write_catalog(output_path=path, source_locale=source_locale, strings=table_strings).written
+
+    for stale_path in output_dir.glob("*.xcstrings"):
+        if stale_path.stem not in tables:
+            stale_path.unlink()
+
+    manifest_data = json.dumps(
+        {str(key): assignment.get(key, COMMON_STRING_TABLE) for key in strings},
+        ensure_ascii=False,
+        indent=2,
+        sort_keys=True,
+    ).encode("utf-8")
+    manifest_path = output_dir / STRING_TABLES_MANIFEST_NAME
+    results[manifest_path] = write_bytes_if_changed(manifest_path, manifest_data)
+    return results
+
+
+def filter_strings(strings: dict, key_predicate) -> dict:
+    """Select a subset of a strings map. Buckets are shared with the source map, not copied."""
+    return {key: bucket for key, bucket in strings.items() if key_predicate(key)}
+
+
+@dataclass
+class CatalogDiff:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    changed_units: int = 0
+    written: bool = False
+
+    def describe(self) -> str:
+        return (
+            f"+{self.added} ~{self.changed} -{self.removed} keys, "
+            f"{self.changed_units} locale units changed"
+        )
+
+
+CATALOG_ENTRY_INDENT = "    "
+
+
+def split_catalog_entries(text: str) -> dict[str, str] | None:
+    """Split a catalog written by write_catalog() into raw per-key entry text.
+
+    Returns None when the text is not in that layout, in which case the caller
+    re-encodes everything.
+    """
+    lines = text.split("\n")
+    if len(lines) < 6 or lines[3] != '  "strings": {' or lines[-2:] != ["  }", "}"]:
+        return None
+
+    decoder = json.JSONDecoder()
+    entries: dict[str, str] = {}
+    current_key = None
+    current_lines: list[str] = []
+    for line in lines[4:-2]:
+        if line.startswith(CATALOG_ENTRY_INDENT + '"'):
+            if current_key is not None:
+                entries[current_key] = "\n".join(current_lines).removesuffix(",")
+            try:
+                current_key, _ = decoder.raw_decode(line, len(CATALOG_ENTRY_INDENT))
+            except ValueError:
+                return None
+            current_lines = [line]
+        elif current_key is None:
+            return None
+        else:
+            current_lines.append(line)
+    if current_key is not None:
+        entries[current_key] = "\n".join(current_lines).removesuffix(",")
+    return entries
+
+
+def count_unit_changes(old_bucket: dict, new_bucket: dict) -> int:
+    old_units = old_bucket.get("localizations", {}) if isinstance(old_bucket, dict) else {}
+    new_units = new_bucket.get("localizations", {})
+    return sum(
+        1 for locale in set(old_units) | set(new_units)
+        if old_units.get(locale) != new_units.get(locale)
+    )
+
+
+def write_catalog(output_path: Path, source_locale: str, strings: dict, extraction_state: str | None = None) -> CatalogDiff:
+    """Patch the catalog on disk to match `strings`, re-encoding only entries that changed.
+
+    Output matches json.dump(catalog, indent=2, ensure_ascii=False). When
+    `extraction_state` is given it replaces each bucket's value at encode
+    time, leaving `strings` untouched. The existing file is parsed once with
+    the C JSON decoder and compared per key and per locale; unchanged entries
+    keep their existing text. Output ordering is always that of `strings`, so
+    diffs stay minimal. Nothing is written when the result is byte-identical,
+    which keeps the mtime stable and stops Xcode from rerunning resource
+    phases.
+    """
+    diff = CatalogDiff()
+    try:
+        with span("read", path=str(output_path)):
+            existing_text = output_path.read_text(encoding="utf-8")
+            existing_catalog = json.loads(existing_text)
+        existing_strings = existing_catalog.get("strings", {})
+        if existing_catalog.get("sourceLanguage") != source_locale or not isinstance(existing_strings, dict):
+            raise ValueError("catalog header changed")
+        existing_entries = split_catalog_entries(existing_text) or {}
+    except (OSError, ValueError, AttributeError):
+        existing_text = None
+        existing_strings = {}
+        existing_entries = {}
+
+    with span("serialize", path=str(output_path), keys=len(strings)):
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+        chunks = []
+        for key, bucket in strings.items():
+            if extraction_state is not None:
+                bucket = {**bucket, "extractionState": extraction_state}
+            key = str(key)
+            old_bucket = existing_strings.get(key)
+            if old_bucket is None:
+                diff.added += 1
+                diff.changed_units += len(bucket.get("localizations", {}))
+            elif old_bucket != bucket:
+                diff.changed += 1
+                diff.changed_units += count_unit_changes(old_bucket, bucket)
+            elif key in existing_entries:
+                chunks.append(existing_entries[key])
+                continue
+            body = encoder.encode(bucket).replace("\n", "\n" + CATALOG_ENTRY_INDENT)
+            chunks.append(f"{CATALOG_ENTRY_INDENT}{encoder.encode(key)}: {body}")
+        diff.removed = sum(1 for key in existing_strings if key not in strings)
+
+        header = (
+            "{\n"
+            f'  "sourceLanguage": {encoder.encode(source_locale)},\n'
+            '  "version": "1.0",\n'
+        )
+        if chunks:
+            text = header + '  "strings": {\n' + ",\n".join(chunks) + "\n  }\n}"
+        else:
+            text = header + '  "strings": {}\n}'
+
+    if text == existing_text:
+        return diff
+    with span("write", path=str(output_path)):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    diff.written = True
+    return diff
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_compiled_tree(output_dir: Path) -> str | None:
+    """Hash every file inside the compiled *.lproj folders, or None if there are none."""
+    digest = hashlib.sha256()
+    found = False
+    for lproj in sorted(output_dir.glob("*.lproj")):
+        for file_path in sorted(p for p in lproj.rglob("*") if p.is_file()):
+            file_hash = hash_file(file_path)
+            if file_hash is None:
+                return None
+            digest.update(f"{file_path.relative_to(output_dir).as_posix()}\0{file_hash}\n".encode("utf-8"))
+            found = True
+    return digest.hexdigest() if found else None
+
+
+def local_module_paths() -> list[Path]:
+    """This script and every module under scripts/ it has imported (i18n_core, tracing, ...)."""
+    scripts_root = SCRIPT_DIR.parent
+    paths = {SCRIPT_PATH}
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and module_file.endswith(".py"):
+            module_path = Path(module_file).resolve()
+            if scripts_root in module_path.parents:
+                paths.add(module_path)
+    return sorted(paths)
+
+
+def compute_inputs_key(input_files: list[Path], config: dict) -> str:
+    """Key the build on the manifest version, the local code, its config and every input file's content."""
+    digest = hashlib.sha256()
+    digest.update(f"{BUILD_CACHE_VERSION}\0".encode("utf-8"))
+    for module_path in local_module_paths():
+        digest.update(f"{module_path.relative_to(SCRIPT_DIR.parent).as_posix()}\0{hash_file(module_path)}\0".encode("utf-8"))
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    for file_path in sorted(input_files):
+        digest.update(f"\0{file_path.name}\0{hash_file(file_path)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_build_manifest(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != BUILD_CACHE_VERSION:
+        return {}
+    return manifest
+
+
+def save_build_manifest(path: Path, manifest: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def report_placeholder_issues(placeholder_issues: list, strict: bool):
+    """Print build_strings_map's placeholder issues; with `strict`, fail if any unit was dropped."""
+    for kind, locale, key, detail in placeholder_issues:
+        label = "dropped" if kind == "unknown" else "reindexed"
+        print(f"Warning: [{locale}] {key!r}: {detail} ({label})")
+    if strict and any(kind == "unknown" for kind, _, _, _ in placeholder_issues):
+        raise SystemExit("Some translations use placeholders missing from the source locale.")
+
+
+def is_build_up_to_date(manifest: dict, inputs_key: str, output_paths: list[Path], compiled_output: Path | None) -> bool:
+    if manifest.get("inputs_key") != inputs_key:
+        return False
+    recorded_outputs = manifest.get("outputs", {})
+    if any(str(output_path) not in recorded_outputs for output_path in output_paths):
+        return False
+    for recorded_path, recorded in recorded_outputs.items():
+        if recorded is None or hash_file(Path(recorded_path)) != recorded:
+            return False
+    if compiled_output is not None:
+        recorded = manifest.get("compiled_output_hash")
+        if recorded is None or hash_compiled_tree(compiled_output) != recorded:
+            return False
+    return True
 
 
 def compile_catalog(source_catalog: Path, output_dir: Path):
@@ -274,6 +737,154 @@ def compile_catalog(source_catalog: Path, output_dir: Path):
                 continue
             shutil.copytree(compiled_item, output_dir / compiled_item.name)
 
+COMPILED_TABLE_NAME = "Localizable"
+STRINGSDICT_VARIABLE = "count"
+COMPILED_FORMAT_SPEC_RE = re.compile(r"%(\d+)\$([@a-zA-Z]+)")
+
+
+def plural_format_variable(forms: dict) -> tuple[int, str]:
+    """Pick the argument that drives plural selection: the first numeric placeholder in the forms."""
+    fallback = None
+    for text in forms.values():
+        for match in COMPILED_FORMAT_SPEC_RE.finditer(text):
+            index, spec = int(match.group(1)), match.group(2)
+            if spec != "@":
+                return index, spec
+            if fallback is None:
+                fallback = (index, spec)
+    return fallback or (1, "lld")
+
+
+def build_compiled_tables(strings: dict) -> dict[str, tuple[dict, dict]]:
+    """Split a strings map into per-locale (.strings, .stringsdict) dictionaries."""
+    tables: dict[str, tuple[dict, dict]] = {}
+    for key, bucket in strings.items():
+        for locale, unit in bucket["localizations"].items():
+            locale_strings, locale_plurals = tables.setdefault(locale, ({}, {}))
+            plural = unit.get("variations", {}).get("plural")
+            if not plural:
+                locale_strings[key] = unit["stringUnit"]["value"]
+                continue
+
+            forms = {category: variation["stringUnit"]["value"] for category, variation in plural.items()}
+            index, value_type = plural_format_variable(forms)
+            locale_plurals[key] = {
+                "NSStringLocalizedFormatKey": f"%{index}$#@{STRINGSDICT_VARIABLE}@",
+                STRINGSDICT_VARIABLE: {
+                    "NSStringFormatSpecTypeKey": "NSStringPluralRuleType",
+                    "NSStringFormatValueTypeKey": value_type,
+                    **forms,
+                },
+            }
+    return tables
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def compile_catalog_native(strings: dict, output_dir: Path) -> bool:
+    """Compile a strings map into per-locale .lproj resources without xcstringstool.
+
+    Writes binary-plist `Localizable.strings` and `Localizable.stringsdict`
+    files straight from memory, touching only files whose bytes changed and
+    removing .lproj folders for locales that are gone. Returns True if anything
+    on disk changed.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    changed = False
+    with span("build_tables", keys=len(strings)):
+        tables = build_compiled_tables(strings)
+
+    for locale, (locale_strings, locale_plurals) in tables.items():
+        lproj = output_dir / f"{locale}.lproj"
+        outputs = {
+            f"{COMPILED_TABLE_NAME}.strings": locale_strings,
+            f"{COMPILED_TABLE_NAME}.stringsdict": locale_plurals,
+        }
+        for filename, table in outputs.items():
+            path = lproj / filename
+            if not table:
+                if path.exists():
+                    path.unlink()
+                    changed = True
+                continue
+            with span("serialize", path=str(path)):
+                data = plistlib.dumps(table, fmt=plistlib.FMT_BINARY, sort_keys=True)
+            with span("write", path=str(path)):
+                changed |= write_bytes_if_changed(path, data)
+
+    for existing_item in output_dir.glob("*.lproj"):
+        if existing_item.name[:-len(".lproj")] in tables:
+            continue
+        if existing_item.is_dir():
+            shutil.rmtree(existing_item)
+        else:
+            existing_item.unlink()
+        changed = True
+
+    return changed
+
+
+def load_compiled_output(output_dir: Path) -> dict[str, dict]:
+    """Load compiled .lproj resources into a comparable form, independent of plist format and variable names."""
+    result = {}
+    for lproj in sorted(output_dir.glob("*.lproj")):
+        locale_strings = {}
+        locale_plurals = {}
+        strings_path = lproj / f"{COMPILED_TABLE_NAME}.strings"
+        stringsdict_path = lproj / f"{COMPILED_TABLE_NAME}.stringsdict"
+        if strings_path.exists():
+            with open(strings_path, "rb") as f:
+                locale_strings = plistlib.load(f)
+        if stringsdict_path.exists():
+            with open(stringsdict_path, "rb") as f:
+                for key, entry in plistlib.load(f).items():
+                    variables = {
+                        name: value for name, value in entry.items()
+                        if isinstance(value, dict) and value.get("NSStringFormatSpecTypeKey") == "NSStringPluralRuleType"
+                    }
+                    locale_plurals[key] = {
+                        name: value
+                        for variable in variables.values()
+                        for name, value in variable.items()
+                        if name not in ("NSStringFormatSpecTypeKey", "NSStringFormatValueTypeKey")
+                    }
+        for key in locale_plurals:
+            locale_strings.pop(key, None)
+        result[lproj.name] = {"strings": locale_strings, "plurals": locale_plurals}
+    return result
+
+
+def compare_compiled_outputs(expected_dir: Path, actual_dir: Path) -> list[str]:
+    expected = load_compiled_output(expected_dir)
+    actual = load_compiled_output(actual_dir)
+    differences = []
+    for lproj in sorted(set(expected) | set(actual)):
+        if lproj not in actual:
+            differences.append(f"{lproj}: missing from {actual_dir}")
+            continue
+        if lproj not in expected:
+            differences.append(f"{lproj}: not present in {expected_dir}")
+            continue
+        for kind in ("strings", "plurals"):
+            expected_table = expected[lproj][kind]
+            actual_table = actual[lproj][kind]
+            for key in sorted(set(expected_table) | set(actual_table), key=str):
+                if expected_table.get(key) != actual_table.get(key):
+                    differences.append(f"{lproj} {kind}: {key!r} differs")
+    return differences
+
+
 def main():
     ap = argparse.ArgumentParser(description="Build .xcstrings from JSON or YAML locale files.")
     ap.add_argument("--input-dir", default="../../../../../src/i18n", help="Directory with *.json, *.yaml, or *.yml files")
@@ -284,13 +895,33 @@ def main():
     ap.add_argument("--widget-output", default="../../../App/AirWidget/Localizable.xcstrings", help="Output .xcstrings path for the widget extension bundle")
     ap.add_argument("--push-prefix", default="push_", help="Localization key prefix for push catalog")
     ap.add_argument("--skip-compiled-output", action="store_true", help="Skip compiling the main .xcstrings catalog into .strings and .stringsdict resources")
+    ap.add_argument("--compiler", choices=("auto", "xcstringstool", "native"), default="auto", help="How to compile .strings/.stringsdict resources; 'auto' uses xcstringstool when xcrun is available")
+    ap.add_argument("--verify-compiled", help="Directory with reference compiled .lproj folders (e.g. from xcstringstool) to compare the native compiler output against")
+    ap.add_argument("--strip-unused-keys", action="store_true", help="Drop keys from the main and widget catalogs that no Swift string literal references (push and main app allowlist keys are always kept)")
+    ap.add_argument("--swift-root", action="append", default=None, help="Directory scanned for Swift references with --strip-unused-keys. Repeatable. Default: Air and App")
+    ap.add_argument("--shard-output-dir", help="Also emit one .xcstrings table per SubModule (plus Common.xcstrings and a key -> table manifest) into this dedicated directory, for sizing a table split; other .xcstrings files in it are removed. No runtime code reads these tables yet, so the directory must be outside the app sources")
+    ap.add_argument("--submodules-dir", default="../../SubModules", help="SubModules directory scanned to assign keys to tables with --shard-output-dir")
+    ap.add_argument("--strict-placeholders", action="store_true", help="Fail when a translation uses a placeholder the source locale value does not have")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for loading locale files (default: CPU count; 1 loads serially)")
+    ap.add_argument("--cache-manifest", default=".cache/import_localizations.json", help="Build manifest used to skip work when inputs and outputs are unchanged")
+    ap.add_argument("--force", action="store_true", help="Ignore the build manifest and regenerate every output")
+    tracing.add_arguments(ap)
     args = ap.parse_args()
+    with tracing.session(args, "import_localizations"):
+        run(args)
+
+
+def run(args: argparse.Namespace):
 
     input_dir = resolve_relative_to_script(args.input_dir)
     output_path = resolve_relative_to_script(args.output)
     compiled_output_path = resolve_relative_to_script(args.compiled_output)
     push_output_path = resolve_relative_to_script(args.push_output)
     widget_output_path = resolve_relative_to_script(args.widget_output)
+    cache_manifest_path = resolve_relative_to_script(args.cache_manifest)
+    compiler = args.compiler
+    if compiler == "auto":
+        compiler = "xcstringstool" if shutil.which("xcrun") else "native"
 
     if not input_dir.exists():
         raise SystemExit(f"Input directory '{input_dir}' does not exist.")
@@ -324,20 +955,62 @@ def main():
     
     if not source_locale_files:
         raise SystemExit(f"No files found for source locale '{args.source_locale}'")
-    
+
+    output_paths = [output_path, widget_output_path, push_output_path]
+    build_config = {
+        "source_locale": args.source_locale,
+        "push_prefix": args.push_prefix,
+        "outputs": [str(path) for path in output_paths],
+        "compiled_output": None if args.skip_compiled_output else str(compiled_output_path),
+        "compiler": compiler,
+        "strip_unused_keys": args.strip_unused_keys,
+    }
+    swift_literals: set[str] = set()
+    if args.strip_unused_keys:
+        swift_roots = [resolve_relative_to_script(root) for root in (args.swift_root or ["../..", "../../../App"])]
+        swift_literals = collect_swift_string_literals(swift_roots)
+        build_config["swift_literals"] = hash_bytes("\0".join(sorted(swift_literals)).encode("utf-8"))
+
+    shard_output_dir = resolve_relative_to_script(args.shard_output_dir) if args.shard_output_dir else None
+    if shard_output_dir is not None:
+        # Nothing reads the per-module tables at runtime yet (lang() still looks everything up in
+        # Localizable), so tables inside a bundled directory would ship every string twice.
+        bundled_dirs = [
+            output_path.parent, widget_output_path.parent, push_output_path.parent,
+            compiled_output_path, resolve_relative_to_script(args.submodules_dir),
+        ]
+        resolved_shard_dir = shard_output_dir.resolve()
+        for bundled_dir in (path.resolve() for path in bundled_dirs):
+            if resolved_shard_dir == bundled_dir or bundled_dir in resolved_shard_dir.parents:
+                raise SystemExit(
+                    f"--shard-output-dir {shard_output_dir} is inside {bundled_dir}, which ships with the app; "
+                    f"use a directory outside the app sources, such as .cache/string_tables."
+                )
+    module_literals: dict[str, set[str]] = {}
+    app_literals: set[str] = set()
+    if shard_output_dir is not None:
+        module_literals = collect_module_string_literals(resolve_relative_to_script(args.submodules_dir))
+        app_literals = collect_swift_string_literals([resolve_relative_to_script("../../../App")])
+        build_config["shard_output_dir"] = str(shard_output_dir)
+        build_config["module_literals"] = {
+            module: hash_bytes("\0".join(sorted(literals)).encode("utf-8"))
+            for module, literals in module_literals.items()
+        }
+        build_config["app_literals"] = hash_bytes("\0".join(sorted(app_literals)).encode("utf-8"))
+        output_paths.append(shard_output_dir / STRING_TABLES_MANIFEST_NAME)
+    with span("hash_inputs", files=len(all_files)):
+        inputs_key = compute_inputs_key(all_files, build_config)
+    manifest = {} if args.force or args.verify_compiled else load_build_manifest(cache_manifest_path)
+    compiled_output = None if args.skip_compiled_output else compiled_output_path
+    if is_build_up_to_date(manifest, inputs_key, output_paths, compiled_output):
+        # The outputs are current, but the issues that shaped them still count for this run.
+        report_placeholder_issues(manifest.get("placeholder_issues", []), args.strict_placeholders)
+        print("Localizations are up to date; nothing to regenerate.")
+        print()
+        return
+
     # Load and merge all files for each locale
-    per_locale = {}
-    for locale_name, files in locale_files.items():
-        merged_data = {}
-        for file_path in sorted(files):  # Sort files for deterministic merging
-            try:
-                file_data = load_file(file_path)
-                merged_data.update(file_data)
-                print(f"Loaded {len(file_data)} keys from {file_path.name} for locale '{locale_name}'")
-            except Exception as e:
-                print(f"Warning: Failed to load {file_path}: {e}")
-                continue
-        per_locale[locale_name] = merged_data
+    per_locale = load_locale_files(locale_files, jobs=args.jobs)
     
     # Get the source locale data (merged from all its files)
     src_map = per_locale.get(args.source_locale.lower(), {})
@@ -351,30 +1024,87 @@ def main():
         locales.remove(args.source_locale.lower())
         locales.insert(0, args.source_locale.lower())
 
-    strings = build_strings_map(
-        per_locale=per_locale,
-        source_locale=args.source_locale,
-        locales=locales,
-    )
-    widget_strings = with_extraction_state(strings, "extracted")
-    write_catalog(output_path=output_path, source_locale=args.source_locale, strings=strings)
-    write_catalog(output_path=widget_output_path, source_locale=args.source_locale, strings=widget_strings)
-    if not args.skip_compiled_output:
-        compile_catalog(source_catalog=output_path, output_dir=compiled_output_path)
+    placeholder_issues: list[tuple[str, str, str, str]] = []
+    with span("build_strings", locales=len(locales)):
+        strings = build_strings_map(
+            per_locale=per_locale,
+            source_locale=args.source_locale,
+            locales=locales,
+            placeholder_issues=placeholder_issues,
+        )
+    report_placeholder_issues(placeholder_issues, args.strict_placeholders)
+    is_main_app_key = lambda key: str(key).startswith(args.push_prefix) or key in MAIN_APP_LOCALIZATION_KEYS
+    main_app_strings = filter_strings(strings, key_predicate=is_main_app_key)
 
-    main_app_strings = build_strings_map(
-        per_locale=per_locale,
+    if args.strip_unused_keys:
+        strings, removed_strings = strip_unreferenced_keys(strings, swift_literals, keep_predicate=is_main_app_key)
+        removed_bytes = estimate_string_bytes(removed_strings)
+        print(f"Stripped {len(removed_strings)} keys not referenced from Swift; kept {len(strings)}.")
+        for locale in sorted(removed_bytes, key=str.lower):
+            print(f"  {locale}: {removed_bytes[locale] / 1024:.1f} KB saved")
+
+    main_diff = write_catalog(output_path=output_path, source_locale=args.source_locale, strings=strings)
+    widget_diff = write_catalog(
+        output_path=widget_output_path,
         source_locale=args.source_locale,
-        locales=locales,
-        key_predicate=lambda key: str(key).startswith(args.push_prefix) or key in MAIN_APP_LOCALIZATION_KEYS,
+        strings=strings,
+        extraction_state="extracted",
     )
-    write_catalog(output_path=push_output_path, source_locale=args.source_locale, strings=main_app_strings)
+    push_diff = write_catalog(output_path=push_output_path, source_locale=args.source_locale, strings=main_app_strings)
+
+    shard_results: dict[Path, bool] = {}
+    if shard_output_dir is not None:
+        assignment = assign_keys_to_tables(strings.keys(), module_literals, extra_literals=app_literals)
+        shard_results = write_sharded_catalogs(shard_output_dir, args.source_locale, strings, assignment)
+        table_sizes: dict[str, int] = {}
+        for table in assignment.values():
+            table_sizes[table] = table_sizes.get(table, 0) + 1
+        print(f"Sharded {len(strings)} keys into {len(table_sizes)} tables in {shard_output_dir}:")
+        for table, count in sorted(table_sizes.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  {table}: {count} keys")
 
-    print(f"Wrote {output_path} with {len(strings)} entries across {len(locales)} locales.")
-    print(f"Wrote {widget_output_path} with {len(strings)} entries across {len(locales)} locales.")
+    compiled = False
+    compiled_output_hash = None
     if not args.skip_compiled_output:
-        print(f"Compiled {output_path.name} into {compiled_output_path}.")
-    print(f"Wrote {push_output_path} with {len(main_app_strings)} main app entries across {len(locales)} locales.")
+        compiled_output_hash = hash_compiled_tree(compiled_output_path)
+        if compiler == "native":
+            compiled = compile_catalog_native(strings, compiled_output_path)
+            compiled_output_hash = hash_compiled_tree(compiled_output_path)
+        elif main_diff.written or compiled_output_hash is None or compiled_output_hash != manifest.get("compiled_output_hash"):
+            with span("compile", compiler=compiler):
+                compile_catalog(source_catalog=output_path, output_dir=compiled_output_path)
+            compiled_output_hash = hash_compiled_tree(compiled_output_path)
+            compiled = True
+
+    if args.verify_compiled:
+        if args.skip_compiled_output:
+            raise SystemExit("--verify-compiled cannot be combined with --skip-compiled-output.")
+        differences = compare_compiled_outputs(resolve_relative_to_script(args.verify_compiled), compiled_output_path)
+        if differences:
+            for difference in differences[:50]:
+                print(f"Mismatch: {difference}")
+            raise SystemExit(f"Compiled output differs from {args.verify_compiled} in {len(differences)} entries.")
+        print(f"Compiled output matches {args.verify_compiled}.")
+
+    save_build_manifest(cache_manifest_path, {
+        "version": BUILD_CACHE_VERSION,
+        "inputs_key": inputs_key,
+        "outputs": {str(path): hash_file(path) for path in [*output_paths, *shard_results]},
+        "compiled_output_hash": compiled_output_hash,
+        "placeholder_issues": [list(issue) for issue in placeholder_issues],
+    })
+
+    def report(path: Path, diff: CatalogDiff, description: str):
+        verb = "Wrote" if diff.written else "Unchanged"
+        print(f"{verb} {path} with {description} across {len(locales)} locales ({diff.describe()}).")
+
+    report(output_path, main_diff, f"{len(strings)} entries")
+    report(widget_output_path, widget_diff, f"{len(strings)} entries")
+    if compiled:
+        print(f"Compiled {output_path.name} into {compiled_output_path} with {compiler}.")
+    elif not args.skip_compiled_output:
+        print(f"Compiled resources in {compiled_output_path} are up to date.")
+    report(push_output_path, push_diff, f"{len(main_app_strings)} main app entries")
     print(f"Source locale '{args.source_locale}' had {len(source_locale_files)} input files.")
     print()
 
@@ -6,7 +6,7 @@ This script converts JSON localization files (like en.json) to YAML format (like
 preserving multiline strings, special characters, and complex structures like pluralization.
 
 Usage:
-    python json_to_yaml.py <input.json> [output.yaml]
+    python json_to_yaml.py <input.json> [output.yaml] [--verify]
 
 Examples:
     # Convert en.json to en.yaml (auto-generated output name)
@@ -15,112 +15,323 @@ Examples:
     # Convert with explicit output file
     python json_to_yaml.py src/i18n/en.json output.yaml
 
+    # Convert and check that the YAML parses back to the same data
+    python json_to_yaml.py src/i18n/en.json output.yaml --verify
+
 Features:
-    - Handles multiline strings using YAML block scalars
-    - Preserves special characters in keys (like $)
-    - Supports complex nested structures (pluralization, etc.)
-    - Auto-detects when to use multiline format
-    - Proper YAML escaping for special characters
+    - Decodes the top-level JSON object incrementally and writes YAML straight to the output file
+    - Handles multiline strings using YAML block scalars (|, |- or |+ depending on trailing newlines)
+    - Quotes only when a plain scalar would be misread (indicators, ": ", " #", true/null/numbers, ...)
+    - Supports complex nested structures (pluralization, lists, etc.)
+    - --verify re-parses the output with the libyaml loader and compares it with the JSON input
+
+Other localization tools can import dump_yaml / json_to_yaml to write YAML in the same style.
 """
 
+import argparse
+import io
 import json
-import sys
+import math
 import os
-from typing import Any, Dict, Union
+import re
+import sys
+import time
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple
 
+import yaml
+
+INDENT = "  "
+READ_CHUNK_SIZE = 1 << 16
+# What may still follow a number that was decoded from a partially read buffer.
+NUMBER_TAIL_RE = re.compile(r"[0-9.eE+-]*")
+
+# Characters that cannot appear literally in plain, single-line or block scalars.
+# \r, NEL and the Unicode line/paragraph separators are line breaks in YAML 1.1.
+PRINTABLE_CHARS = "\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff"
+NEEDS_ESCAPE_RE = re.compile(f"[^\x09\x0a{PRINTABLE_CHARS}]")
+DOUBLE_QUOTED_ESCAPE_RE = re.compile(f'[\\\\"\x09\x0a]|[^{PRINTABLE_CHARS}]')
+DOUBLE_QUOTED_ESCAPES = {
+    "\\": "\\\\", '"': '\\"', "\x00": "\\0", "\x07": "\\a", "\x08": "\\b", "\x09": "\\t",
+    "\x0a": "\\n", "\x0b": "\\v", "\x0c": "\\f", "\x0d": "\\r", "\x1b": "\\e",
+    "\x85": "\\N", "\u2028": "\\L", "\u2029": "\\P",
+}
+PLAIN_FORBIDDEN_START = set("-?:,[]{}#&*!|>'\"%@` \t")
+DOCUMENT_MARKERS = ("---", "...")
+
+# Patterns the YAML 1.1 resolver uses to turn plain scalars into bools, numbers, nulls,
+# timestamps and merge keys, indexed by first character.
+IMPLICIT_SCALAR_PATTERNS = {
+    char: [regexp for _tag, regexp in resolvers]
+    for char, resolvers in yaml.resolver.Resolver.yaml_implicit_resolvers.items()
+    if char is not None
+}
+
+
+def resolves_to_non_string(text: str) -> bool:
+    """Return True if YAML would load `text` as something other than a string when unquoted."""
+    return any(regexp.match(text) for regexp in IMPLICIT_SCALAR_PATTERNS.get(text[0], ()))
 
-def is_multiline(text: str) -> bool:
-    """Check if text contains newlines or is very long"""
-    return '\n' in text
 
+def is_plain_safe(text: str) -> bool:
+    """Check whether `text` can be written as a plain (unquoted) single-line scalar."""
+    if not text or text[0] in PLAIN_FORBIDDEN_START and not (
+        text[0] in "-?:" and len(text) > 1 and text[1] not in " \t"
+    ):
+        return False
+    if text[-1] in " \t:" or "\t" in text or "\n" in text:
+        return False
+    if ": " in text or " #" in text:
+        return False
+    if text[:3] in DOCUMENT_MARKERS and (len(text) == 3 or text[3] in " \t"):
+        return False
+    if NEEDS_ESCAPE_RE.search(text):
+        return False
+    return not resolves_to_non_string(text)
 
-def escape_yaml_string(text: str) -> str:
-    """Escape special characters in YAML strings"""
-    # Escape quotes if they exist at start/end
-    if text.startswith('"') and text.endswith('"'):
-        return text[1:-1].replace('"', '\\"')
-    if text.startswith("'") and text.endswith("'"):
-        return text[1:-1].replace("'", "\\'")
 
-    # Escape colons at the beginning or anywhere in the string
-    if text.startswith(':') or ':' in text:
-        return f'"{text}"'
+def _escape_char(match: "re.Match[str]") -> str:
+    char = match.group()
+    escaped = DOUBLE_QUOTED_ESCAPES.get(char)
+    if escaped is not None:
+        return escaped
+    code = ord(char)
+    if code <= 0xFF:
+        return f"\\x{code:02X}"
+    if code <= 0xFFFF:
+        return f"\\u{code:04X}"
+    return f"\\U{code:08X}"
 
+
+def double_quote(text: str) -> str:
+    """Write `text` as a double-quoted scalar with YAML escapes."""
+    return f'"{DOUBLE_QUOTED_ESCAPE_RE.sub(_escape_char, text)}"'
+
+
+def format_scalar(text: str) -> str:
+    """Format a single-line string: plain when that round-trips, double-quoted otherwise."""
+    return text if is_plain_safe(text) else double_quote(text)
+
+
+def is_multiline(text: str) -> bool:
+    """Check whether `text` should be written as a literal block scalar."""
+    if "\n" not in text or NEEDS_ESCAPE_RE.search(text):
+        return False
+    body = text.rstrip("\n")
+    if not body:
+        return False
+    # Block indentation is detected from the first non-empty line, so it must not start with
+    # whitespace (libyaml also rejects a leading tab there).
+    first_line = next(line for line in body.split("\n") if line)
+    return first_line[0] not in " \t"
+
+
+def format_number(value: Any) -> str:
+    """Format a JSON number or literal so YAML resolves it to the same type."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return ".nan"
+    if math.isinf(value):
+        return ".inf" if value > 0 else "-.inf"
+    text = repr(value)
+    if "e" in text and "." not in text:
+        text = text.replace("e", ".0e")
     return text
 
 
-def format_yaml_value(key: str, value: Any, indent: str = "") -> str:
-    """Format a single key-value pair in YAML format"""
-    if isinstance(value, dict):
-        # Handle complex structures like pluralization
-        lines = [f"{indent}{key}:"]
-        for sub_key, sub_value in value.items():
-            if isinstance(sub_value, str) and is_multiline(sub_value):
-                # Multiline string
-                escaped = escape_yaml_string(sub_value).rstrip('\n')
-                lines.append(f"{indent}  {sub_key}: |")
-                for line in escaped.split('\n'):
-                    lines.append(f"{indent}    {line}")
-            else:
-                lines.append(f"{indent}  {sub_key}: {escape_yaml_string(sub_value)}")
-        return '\n'.join(lines)
+def emit_block_scalar(write, text: str, indent: str):
+    """Write a literal block scalar whose header goes right after the `key:` on the current line."""
+    body = text.rstrip("\n")
+    trailing_newlines = len(text) - len(body)
+    chomping = "-" if trailing_newlines == 0 else "" if trailing_newlines == 1 else "+"
+    write(f" |{chomping}\n")
+    for line in body.split("\n"):
+        write(f"{indent}{line}\n" if line else "\n")
+    if trailing_newlines > 1:
+        write("\n" * (trailing_newlines - 1))
+
 
+def emit_value(write, value: Any, indent: str):
+    """
+    Write `value` after a `key:` or `-` indicator that is already on the current line.
+    `indent` is the indentation of nested lines.
+    """
+    if isinstance(value, dict):
+        if not value:
+            write(" {}\n")
+            return
+        write("\n")
+        for key, sub_value in value.items():
+            write(f"{indent}{format_scalar(str(key))}:")
+            emit_value(write, sub_value, indent + INDENT)
+    elif isinstance(value, list):
+        if not value:
+            write(" []\n")
+            return
+        write("\n")
+        for item in value:
+            write(f"{indent}-")
+            emit_value(write, item, indent + INDENT)
     elif isinstance(value, str):
         if is_multiline(value):
-            # Multiline string - use YAML block scalar
-            escaped = escape_yaml_string(value).rstrip('\n')
-            lines = [f"{indent}{key}: |"]
-            for line in escaped.split('\n'):
-                lines.append(f"{indent}  {line}")
-            return '\n'.join(lines)
+            emit_block_scalar(write, value, indent)
         else:
-            # Simple string
-            return f"{indent}{key}: {escape_yaml_string(value)}"
-
+            write(f" {format_scalar(value)}\n")
     else:
-        # Other types (numbers, booleans, etc.)
-        return f"{indent}{key}: {value}"
+        write(f" {format_number(value)}\n")
+
+
+def dump_yaml(items: Iterable[Tuple[str, Any]], stream: IO[str]):
+    """Write top-level key/value pairs to `stream` as a YAML mapping, one item at a time."""
+    write = stream.write
+    for key, value in items:
+        write(f"{format_scalar(str(key))}:")
+        emit_value(write, value, INDENT)
 
 
 def json_to_yaml(data: Dict[str, Any]) -> str:
     """Convert JSON data to YAML format"""
-    lines = []
+    buffer = io.StringIO()
+    dump_yaml(data.items(), buffer)
+    return buffer.getvalue()
 
-    for key, value in data.items():
-        yaml_line = format_yaml_value(key, value)
-        lines.append(yaml_line)
 
-    return '\n'.join(lines)
+def iter_json_object(stream: IO[str], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the key/value pairs of a top-level JSON object while reading `stream` in chunks.
+    Only one top-level value is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
 
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python json_to_yaml.py <input.json> [output.yaml]")
-        sys.exit(1)
+    def skip_whitespace() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    def expect(chars: str) -> str:
+        nonlocal position
+        char = skip_whitespace()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of input"
+            raise json.JSONDecodeError(f"Expected one of {chars!r}, found {found}", buffer, position)
+        position += 1
+        return char
 
-    # If no output file specified, derive from input file
-    if not output_file:
-        base_name = os.path.splitext(os.path.basename(input_file))[0]
-        if base_name.endswith('_en'):
-            base_name = base_name[:-3]  # Remove _en suffix
-        output_file = f"{base_name}.yaml"
+    def decode_value() -> Any:
+        nonlocal position
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A number cut at the chunk boundary decodes as a shorter number ("1.|25" as 1,
+            # "1.25e|3" as 1.25), so keep reading while only number characters follow it.
+            if not isinstance(value, (str, dict, list)) and NUMBER_TAIL_RE.fullmatch(buffer, end) and fill():
+                continue
+            position = end
+            return value
+
+    expect("{")
+    if skip_whitespace() == "}":
+        position += 1
+        return
+    while True:
+        key = decode_value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expected a string key", buffer, position)
+        expect(":")
+        yield key, decode_value()
+        if expect(",}") == "}":
+            return
+
+
+def load_yaml_for_verification(path: str) -> Any:
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader)
 
-    try:
-        # Read JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
 
-        # Convert to YAML
-        yaml_content = json_to_yaml(data)
+def verify_round_trip(input_file: str, output_file: str) -> bool:
+    """Re-parse the YAML output and compare it with the JSON input; print the first differences."""
+    with open(input_file, "r", encoding="utf-8-sig") as f:
+        expected = json.load(f)
+    actual = load_yaml_for_verification(output_file)
+    if actual is None:
+        actual = {}
+    if actual == expected:
+        return True
+
+    mismatched = [key for key in expected if key not in actual or actual[key] != expected[key]]
+    unexpected = [key for key in actual if key not in expected]
+    print(f"Error: {output_file} does not parse back to the contents of {input_file}")
+    for key in mismatched[:10]:
+        print(f"  - {key!r}: expected {expected[key]!r}, got {actual.get(key)!r}")
+    for key in unexpected[:10]:
+        print(f"  - unexpected key {key!r}")
+    return False
+
+
+def default_output_file(input_file: str) -> str:
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    if base_name.endswith('_en'):
+        base_name = base_name[:-3]  # Remove _en suffix
+    return f"{base_name}.yaml"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a JSON localization file to YAML")
+    parser.add_argument("input_file", help="JSON file to convert")
+    parser.add_argument("output_file", nargs="?", help="YAML file to write (default: <input>.yaml)")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Re-parse the output with the libyaml loader and check it matches the input",
+    )
+    args = parser.parse_args()
+
+    input_file = args.input_file
+    output_file = args.output_file or default_output_file(input_file)
+
+    try:
+        started = time.perf_counter()
+        with open(input_file, 'r', encoding='utf-8-sig') as source, \
+                open(output_file, 'w', encoding='utf-8') as target:
+            dump_yaml(iter_json_object(source), target)
+        elapsed_ms = (time.perf_counter() - started) * 1000
 
-        # Write YAML file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(yaml_content)
+        print(f"Successfully converted {input_file} to {output_file} in {elapsed_ms:.0f} ms")
 
-        print(f"Successfully converted {input_file} to {output_file}")
+        if args.verify:
+            if not verify_round_trip(input_file, output_file):
+                sys.exit(1)
+            print(f"Verified: {output_file} parses back to the same data")
 
     except FileNotFoundError:
         print(f"Error: Input file '{input_file}' not found")
@@ -1,85 +1,170 @@
 #!/usr/bin/env python3
 import argparse
+import codecs
 import json
+import os
+import plistlib
 import re
 import sys
 
-COMMENT_BLOCK_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
-COMMENT_LINE_RE  = re.compile(r"//.*?$", re.MULTILINE)
+# One pass over the file: each match skips whitespace and comments, then consumes either a whole
+# `"key" = "value";` entry or one stray string, word or character to resynchronize on. Strings are
+# matched as tokens, so "//" or "/*" inside a quoted string is never mistaken for a comment. Every
+# character of a separator or unquoted word can be matched only one way (one whitespace character
+# per repetition, comments always run to their end, and a "/" that starts a comment never belongs
+# to a word), so a failed entry backtracks in linear rather than exponential time.
+ENTRY_RE = re.compile(
+    r"""
+    (?:\s | /\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\Z) | //[^\n]*(?:\n|\Z))*  # whitespace and comments
+    (?:
+        (?: "(?P<key>[^"\\]*(?:\\.[^"\\]*)*)" | (?P<key_word>(?:[A-Za-z0-9_.$:-]|/(?![/*]))+) )
+        (?:\s | /\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\Z) | //[^\n]*(?:\n|\Z))* =
+        (?:\s | /\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\Z) | //[^\n]*(?:\n|\Z))*
+        (?: "(?P<value>[^"\\]*(?:\\.[^"\\]*)*)" | (?P<value_word>(?:[A-Za-z0-9_.$:-]|/(?![/*]))+) )
+        (?:\s | /\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\Z) | //[^\n]*(?:\n|\Z))* ;
+    |
+        "[^"\\]*(?:\\.[^"\\]*)*" | (?:[A-Za-z0-9_.$:-]|/(?![/*]))+ | . | \Z  # stray token or the end
+    )
+    """,
+    re.DOTALL | re.VERBOSE
+)
 
-# Matches: "Key" = "Value";
-PAIR_RE = re.compile(
-    r'"((?:\\.|[^"\\])*)"\s*=\s*"((?:\\.|[^"\\])*)"\s*;',
+# .strings uses C-style escapes. Decode common ones safely.
+# We avoid codecs like 'unicode_escape' to prevent over-decoding; unknown escapes are kept as is.
+ESCAPE_RE = re.compile(
+    r'\\(?:u(D[89ABab][0-9A-Fa-f]{2})\\u(D[C-Fc-f][0-9A-Fa-f]{2})'  # UTF-16 surrogate pair
+    r'|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))',
     re.DOTALL
 )
+SIMPLE_ESCAPES = {
+    '"': '"',
+    "'": "'",
+    "\\": "\\",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "f": "\f",
+    "b": "\b",
+}
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+PLIST_PREFIXES = (b"bplist", b"<?xml")
 
-def strip_comments(s: str) -> str:
-    s = COMMENT_BLOCK_RE.sub("", s)
-    s = COMMENT_LINE_RE.sub("", s)
-    return s
+def _unescape_match(m):
+    index = m.lastindex
+    if index == 5:
+        return SIMPLE_ESCAPES.get(m.group(5), m.group(0))
+    if index == 2:
+        high, low = int(m.group(1), 16), int(m.group(2), 16)
+        return chr(0x10000 + ((high - 0xD800) << 10) + (low - 0xDC00))
+    value = int(m.group(index), 16)
+    # Lone surrogates and out-of-range code points are kept escaped
+    if 0xD800 <= value <= 0xDFFF or value > 0x10FFFF:
+        return m.group(0)
+    return chr(value)
 
 def unescape(s: str) -> str:
-    # .strings uses C-style escapes. Decode common ones safely.
-    # We avoid codecs like 'unicode_escape' to prevent over-decoding.
-    escapes = {
-        r'\"': '"',
-        r"\\": "\\",
-        r"\n": "\n",
-        r"\r": "\r",
-        r"\t": "\t",
-        r"\f": "\f",
-        r"\b": "\b",
-    }
-    # Replace simple escapes first
-    for k, v in escapes.items():
-        s = s.replace(k, v)
-    # Handle \uXXXX sequences
-    def _u(m):
-        try:
-            return chr(int(m.group(1), 16))
-        except Exception:
-            return m.group(0)
-    s = re.sub(r"\\u([0-9A-Fa-f]{4})", _u, s)
-    return s
+    if "\\" not in s:
+        return s
+    return ESCAPE_RE.sub(_unescape_match, s)
+
+def iter_pairs(text: str):
+    """Yield (key, value) for every `"key" = "value";` entry, skipping anything malformed."""
+    for m in ENTRY_RE.finditer(text):
+        key, key_word, value, value_word = m.group("key", "key_word", "value", "value_word")
+        if key is None and key_word is None:
+            continue
+        yield (
+            unescape(key) if key is not None else key_word,
+            unescape(value) if value is not None else value_word,
+        )
+
+def to_json_key(key: str) -> str:
+    return key.replace(".", "_")
 
 def parse_strings(text: str) -> dict:
-    text = strip_comments(text)
-    result = {}
-    for m in PAIR_RE.finditer(text):
-        raw_key, raw_val = m.group(1), m.group(2)
-        key = unescape(raw_key)
-        val = unescape(raw_val)
-        key_json = key.replace(".", "_")
-        result[key_json] = val
-    return result
-
-def read_text(path: str) -> str:
-    # .strings are often UTF-16LE with BOM; fall back to UTF-8.
-    encodings = ["utf-16", "utf-16-le", "utf-8-sig", "utf-8"]
-    last_err = None
-    for enc in encodings:
-        try:
-            with open(path, "r", encoding=enc) as f:
-                return f.read()
-        except Exception as e:
-            last_err = e
-    raise last_err
+    return {to_json_key(key): value for key, value in iter_pairs(text)}
 
-def main():
-    ap = argparse.ArgumentParser(description="Convert .strings to JSON dict with dots -> underscores in keys.")
-    ap.add_argument("input", help="Path to Localizable.strings")
-    ap.add_argument("-o", "--output", help="Path to output JSON (default: stdout)")
-    args = ap.parse_args()
+def sniff_encoding(data: bytes) -> str:
+    """Pick the encoding from the BOM, or from where the NUL bytes fall when there is none."""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    head = data[:64]
+    if len(head) >= 2 and b"\x00" in head:
+        if head[1::2].count(0) > head[0::2].count(0):
+            return "utf-16-le"
+        return "utf-16-be"
+    return "utf-8"
 
-    text = read_text(args.input)
-    data = parse_strings(text)
+def read_strings_file(path: str) -> dict:
+    """Parse a text (any of the usual encodings) or binary/XML plist .strings file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(PLIST_PREFIXES):
+        plist = plistlib.loads(data)
+        return {to_json_key(str(k)): str(v) for k, v in plist.items()}
+    return parse_strings(data.decode(sniff_encoding(data)))
 
+def merge_lproj_dirs(root: str) -> dict:
+    """Return {locale: merged dict} for every *.lproj folder directly under `root`."""
+    merged = {}
+    for name in sorted(os.listdir(root)):
+        lproj = os.path.join(root, name)
+        if not name.endswith(".lproj") or not os.path.isdir(lproj):
+            continue
+        locale = name[:-len(".lproj")]
+        result = {}
+        for table in sorted(os.listdir(lproj)):
+            if not table.endswith(".strings"):
+                continue
+            for key, value in read_strings_file(os.path.join(lproj, table)).items():
+                if key in result and result[key] != value:
+                    print(f"Warning: {locale}: '{key}' redefined in {table}", file=sys.stderr)
+                result[key] = value
+        merged[locale] = result
+    return merged
+
+def write_json(data: dict, path: str = None):
     out = json.dumps(data, ensure_ascii=False, indent=2)
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
             f.write(out)
     else:
         sys.stdout.write(out + "\n")
 
+def main():
+    ap = argparse.ArgumentParser(description="Convert .strings to JSON dict with dots -> underscores in keys.")
+    ap.add_argument(
+        "input",
+        help="Path to Localizable.strings, or a directory of *.lproj folders to merge per locale"
+    )
+    ap.add_argument(
+        "-o", "--output",
+        help="Path to output JSON (default: stdout); with a directory input, the folder for <locale>.json files"
+    )
+    args = ap.parse_args()
+
+    if os.path.isdir(args.input):
+        if not args.output:
+            ap.error("--output DIR is required when the input is a directory")
+        merged = merge_lproj_dirs(args.input)
+        if not merged:
+            print(f"No *.lproj folders found in {args.input}", file=sys.stderr)
+            sys.exit(1)
+        os.makedirs(args.output, exist_ok=True)
+        for locale, data in merged.items():
+            write_json(data, os.path.join(args.output, f"{locale}.json"))
+            print(f"{locale}: {len(data)} keys", file=sys.stderr)
+        return
+
+    write_json(read_strings_file(args.input), args.output)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 import argparse
+import difflib
 import json
 import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 # Matches:
 #   WStrings.Language.Active.localized
@@ -16,6 +22,9 @@ WSTRINGS_PATTERN = re.compile(
     r'\bWStrings((?:\.[A-Za-z_]\w*)*)\.localized\b'
 )
 
+# Tried in order when a file is not valid UTF-8
+FALLBACK_ENCODINGS = ("utf-16", "utf-16-le", "utf-8-sig")
+
 def swift_escape(s: str) -> str:
     """Escape a Python string into a Swift string literal."""
     s = s.replace('\\', '\\\\')
@@ -35,39 +44,119 @@ def compute_key_from_segments(dot_tail: str) -> str:
     parts = [p for p in dot_tail.split('.') if p]  # remove leading empty
     return "_".join(parts)
 
-def make_replacer(mapping: dict):
-    def _repl(m: re.Match):
-        dot_tail = m.group(1)  # like ".Language.Active"
+@dataclass
+class RewriteRule:
+    """A regex and the function producing its replacement from the rule's own groups."""
+    name: str
+    pattern: str
+    replace: Callable[[Tuple[Optional[str], ...]], str]
+
+class RewriteEngine:
+    """
+    Applies several rules in one pass by compiling them into a single alternation.
+    Each rule is wrapped in a named group; its own groups are sliced out of the match by offset,
+    so rule patterns keep using plain numbered groups.
+    """
+
+    def __init__(self, rules: List[RewriteRule]):
+        self.rules = {}
+        alternatives = []
+        group_index = 0
+        for rule in rules:
+            group_count = re.compile(rule.pattern).groups
+            group_name = f"rule{len(alternatives)}"
+            alternatives.append(f"(?P<{group_name}>{rule.pattern})")
+            # +1 for the wrapping named group itself
+            self.rules[group_name] = (rule, group_index + 2, group_index + 2 + group_count)
+            group_index += group_count + 1
+        self.pattern = re.compile("|".join(alternatives))
+
+    def _replace(self, m: re.Match) -> str:
+        rule, start, end = self.rules[m.lastgroup]
+        return rule.replace(tuple(m.group(i) for i in range(start, end)))
+
+    def rewrite(self, text: str) -> Tuple[str, int]:
+        return self.pattern.subn(self._replace, text)
+
+def build_rules(mapping: dict) -> List[RewriteRule]:
+    def replace_wstrings(groups):
+        dot_tail = groups[0]  # like ".Language.Active"
         dict_key = compute_key_from_segments(dot_tail)
         value = mapping.get(dict_key, dict_key)
         return f'lang("{swift_escape(value)}")'
-    return _repl
 
-def process_file(path: Path, mapping: dict) -> bool:
-    """Return True if file changed."""
+    return [RewriteRule("wstrings", WSTRINGS_PATTERN.pattern, replace_wstrings)]
+
+def decode_source(data: bytes) -> Optional[str]:
     try:
-        text = path.read_text(encoding="utf-8")
+        return data.decode("utf-8")
     except UnicodeDecodeError:
         # Fall back to other encodings if necessary
-        for enc in ("utf-16", "utf-16-le", "utf-8-sig"):
+        for enc in FALLBACK_ENCODINGS:
             try:
-                text = path.read_text(encoding=enc)
-                break
-            except Exception:
+                return data.decode(enc)
+            except UnicodeDecodeError:
                 continue
-        else:
-            print(f"Skipping unreadable file: {path}", file=sys.stderr)
-            return False
+    return None
 
-    replacer = make_replacer(mapping)
-    new_text, n = WSTRINGS_PATTERN.subn(replacer, text)
-    if n > 0 and new_text != text:
-        path.write_text(new_text, encoding="utf-8")
-        return True
-    return False
+def write_atomically(path: Path, text: str):
+    """Write to a temporary file next to `path` and rename it over the original."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+@dataclass
+class FileResult:
+    path: Path
+    occurrences: int = 0
+    diff: Optional[str] = None
+    error: Optional[str] = None
+
+# Set in each pool worker by init_worker(); rules hold closures, so they are rebuilt
+# from the mapping instead of being pickled.
+_engine: Optional[RewriteEngine] = None
+
+def init_worker(mapping: dict):
+    global _engine
+    _engine = RewriteEngine(build_rules(mapping))
+
+def process_file(path: Path, dry_run: bool, show_diff: bool) -> FileResult:
+    """Read the file once, rewrite it in memory and write it back only if it changed."""
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return FileResult(path, error=str(e))
+    text = decode_source(data)
+    if text is None:
+        return FileResult(path, error="unreadable file")
+
+    new_text, n = _engine.rewrite(text)
+    if n == 0 or new_text == text:
+        return FileResult(path)
+
+    result = FileResult(path, occurrences=n)
+    if show_diff:
+        result.diff = "".join(difflib.unified_diff(
+            text.splitlines(keepends=True),
+            new_text.splitlines(keepends=True),
+            fromfile=f"a/{path}",
+            tofile=f"b/{path}",
+        ))
+    if not dry_run:
+        try:
+            write_atomically(path, new_text)
+        except OSError as e:
+            result.error = str(e)
+    return result
 
 def iter_swift_files(root: Path):
-    for p in root.rglob("*.swift"):
+    for p in sorted(root.rglob("*.swift")):
         if p.is_file():
             yield p
 
@@ -78,6 +167,9 @@ def main():
     ap.add_argument("src_root", help="Root directory to scan for .swift files")
     ap.add_argument("json_dict", help="Path to JSON dictionary (keys like Language_Active)")
     ap.add_argument("--dry-run", action="store_true", help="Report changes but do not modify files")
+    ap.add_argument("--diff", action="store_true", help="Print a unified diff for every changed file")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count)")
     args = ap.parse_args()
 
     root = Path(args.src_root)
@@ -94,30 +186,34 @@ def main():
     # Ensure string values
     mapping = {str(k): str(v) for k, v in mapping.items()}
 
-    total = 0
+    started = time.perf_counter()
+    files = list(iter_swift_files(root))
     changed = 0
+    occurrences = 0
+    label = "[would change]" if args.dry_run else "[changed]"
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs), initializer=init_worker, initargs=(mapping,)) as pool:
+        results = pool.map(
+            process_file, files,
+            [args.dry_run] * len(files), [args.diff] * len(files),
+            chunksize=max(1, len(files) // (max(1, args.jobs) * 8)),
+        )
+        for result in results:
+            if result.error:
+                print(f"Skipping {result.path}: {result.error}", file=sys.stderr)
+                continue
+            if not result.occurrences:
+                continue
+            changed += 1
+            occurrences += result.occurrences
+            if result.diff:
+                sys.stdout.write(result.diff)
+            else:
+                print(f"{label} {result.path} ({result.occurrences} occurrences)")
 
-    for swift_file in iter_swift_files(root):
-        total += 1
-        try:
-            text = swift_file.read_text(encoding="utf-8")
-        except Exception:
-            # handle in process_file
-            text = None
-
-        if args.dry_run:
-            matches = list(WSTRINGS_PATTERN.finditer(text if text is not None else swift_file.read_text(encoding="utf-8")))
-            if matches:
-                print(f"[would change] {swift_file} ({len(matches)} occurrences)")
-        else:
-            if process_file(swift_file, mapping):
-                changed += 1
-                print(f"[changed] {swift_file}")
-
-    if args.dry_run:
-        print("Dry run complete.")
-    else:
-        print(f"Done. Scanned {total} .swift files, modified {changed}.")
+    elapsed = time.perf_counter() - started
+    verb = "would modify" if args.dry_run else "modified"
+    print(f"Done. Scanned {len(files)} .swift files in {elapsed:.2f}s, {verb} {changed} ({occurrences} occurrences).")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
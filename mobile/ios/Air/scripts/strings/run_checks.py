@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Run the localization and asset checks in one process.
+
+Locale files are loaded once and the iOS sources are walked and read once; every check then
+works on the shared results instead of repeating the parse and the scan:
+
+    duplicates    - keys declared twice in en.yaml (dev/detect_en_duplicates.py)
+    completeness  - missing/extraneous keys per locale (check_localization_completeness.py --all)
+    keys          - lang("key") usages missing from en.yaml (find_unused_localization_keys.py)
+    assets        - unreferenced asset catalog entries (../find_unused_assets.py)
+
+Usage:
+    python3 run_checks.py
+    python3 run_checks.py --check keys --check assets
+    python3 run_checks.py --fail-on-unused-assets
+    python3 run_checks.py --trace checks-trace.json    # phase timings for chrome://tracing
+
+Exit codes:
+    0 - every selected check passed
+    1 - at least one check found issues
+    2 - a check could not run (missing catalog, unreadable locale, ...)
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+AIR_ROOT = SCRIPT_DIR.parent.parent
+IOS_ROOT = AIR_ROOT.parent
+PROJECT_ROOT = IOS_ROOT.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+sys.path.insert(0, str(PROJECT_ROOT / "dev"))
+
+import find_unused_assets as assets_tool  # noqa: E402
+from check_localization_completeness import compare_locale_data, print_matrix  # noqa: E402
+from detect_en_duplicates import detect_duplicates, print_duplicates  # noqa: E402
+from find_unused_localization_keys import (  # noqa: E402
+    DEFAULT_EXCLUDED_DIRS as KEY_EXCLUDED_DIRS,
+    UsageSite,
+    extract_localization_keys_from_content,
+    merge_key_usage,
+    report_missing_keys,
+)
+from i18n_core import flatten_keys, load_locales  # noqa: E402
+import tracing  # noqa: E402
+from tracing import span  # noqa: E402
+
+CHECKS = ("duplicates", "completeness", "keys", "assets")
+BASE_LOCALE = "en"
+ASSET_SCAN_ROOTS = (AIR_ROOT, IOS_ROOT / "App", IOS_ROOT / "Packages")
+
+
+@dataclass
+class SourceScan:
+    """Everything the checks need from the iOS sources, gathered in one walk."""
+    key_usage: List[Tuple[str, Dict[str, List[UsageSite]]]] = field(default_factory=list)
+    asset_literals: List[Tuple[Path, Optional[Set[str]]]] = field(default_factory=list)
+    files_read: int = 0
+
+
+@dataclass
+class CheckContext:
+    args: argparse.Namespace
+    i18n_dir: Path
+    locales: Dict[str, Any]
+    scan: SourceScan
+
+
+def read_source(path: Path, want_keys: bool, want_literals: bool) -> Tuple[Optional[dict], Optional[Set[str]]]:
+    """Read one file and run the extractors that apply to it."""
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        print(f"Warning: Could not read file {path}: {e}")
+        return ({} if want_keys else None), None
+
+    keys = literals = None
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if want_keys:
+            print(f"Warning: Could not read file {path}: {e}")
+            keys = {}
+        content = data.decode("utf-8", errors="ignore")
+    else:
+        if want_keys:
+            keys = extract_localization_keys_from_content(content, str(path))
+    if want_literals:
+        literals = assets_tool.extract_string_literals(content)
+    return keys, literals
+
+
+def is_asset_scan_dir(directory: Path, asset_roots: List[Path]) -> bool:
+    """Whether find_unused_assets.py would scan the files directly inside `directory`."""
+    for asset_root in asset_roots:
+        if directory == asset_root or asset_root in directory.parents:
+            parts = directory.relative_to(asset_root).parts
+            return not any(part in assets_tool.DEFAULT_EXCLUDED_DIRS for part in parts)
+    return False
+
+
+def scan_directory(
+    directory: Path, want_keys: bool, want_assets: bool
+) -> Tuple[List[str], List[Tuple[Path, bool, bool]]]:
+    """
+    List one directory the way iter_scan_targets walks it: the sorted subdirectories to descend
+    into, and (path, needs key extraction, needs literal extraction) for the files directly inside.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            entries = list(entries)
+    except OSError:
+        return [], []
+    # Only prune what every selected check skips; asset-only exclusions are applied per directory.
+    pruned = KEY_EXCLUDED_DIRS if want_keys else assets_tool.DEFAULT_EXCLUDED_DIRS
+    in_asset_scope = want_assets and is_asset_scan_dir(directory, _asset_scan_roots())
+    asset_exts = _asset_file_extensions()
+    subdirs, targets = [], []
+    for entry in sorted(entries, key=lambda entry: entry.name):
+        name = entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            # Like os.walk: symlinked directories are neither descended into nor scanned as files.
+            if name not in pruned and not name.endswith(".xcassets") and not entry.is_symlink():
+                subdirs.append(name)
+            continue
+        wants_keys = want_keys and name.endswith(".swift")
+        wants_literals = in_asset_scope and os.path.splitext(name)[1].lower() in asset_exts
+        if wants_keys or wants_literals:
+            targets.append((directory / name, wants_keys, wants_literals))
+    return subdirs, targets
+
+
+@lru_cache(maxsize=None)
+def _asset_scan_roots() -> List[Path]:
+    return [path.resolve() for path in ASSET_SCAN_ROOTS]
+
+
+@lru_cache(maxsize=None)
+def _asset_file_extensions() -> Set[str]:
+    return assets_tool.normalize_exts(assets_tool.DEFAULT_FILE_EXTENSIONS)
+
+
+def iter_scan_targets(root: Path, want_keys: bool, want_assets: bool) -> Iterable[Tuple[Path, bool, bool]]:
+    """
+    Yield (path, needs key extraction, needs literal extraction) for every file under `root`
+    some check reads. Swift files are picked like find_unused_localization_keys.py does; asset
+    reference files like find_unused_assets.py does with its default scan roots.
+    """
+    pending = [root.resolve()]
+    while pending:
+        directory = pending.pop()
+        subdirs, targets = scan_directory(directory, want_keys, want_assets)
+        yield from targets
+        pending.extend(directory / name for name in reversed(subdirs))
+
+
+def scan_sources(root: Path, want_keys: bool, want_assets: bool, jobs: int) -> SourceScan:
+    """Walk `root` once and read every file some check needs exactly once."""
+    with span("walk", root=str(root)):
+        tasks = list(iter_scan_targets(root, want_keys, want_assets))
+    scan = SourceScan(files_read=len(tasks))
+    with span("extract", files=len(tasks)), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = executor.map(lambda task: read_source(*task), tasks)
+        for (path, _, wants_literals), (keys, literals) in zip(tasks, results):
+            if keys is not None:
+                scan.key_usage.append((str(path), keys))
+            if wants_literals:
+                scan.asset_literals.append((path, literals))
+    return scan
+
+
+def run_duplicates(ctx: CheckContext) -> int:
+    print(f"Duplicate keys in {BASE_LOCALE}.yaml:")
+    duplicates = detect_duplicates(ctx.i18n_dir / f"{BASE_LOCALE}.yaml")
+    print_duplicates(duplicates, as_json=False)
+    return 1 if duplicates else 0
+
+
+def run_completeness(ctx: CheckContext) -> int:
+    base_keys = flatten_keys(ctx.locales[BASE_LOCALE])
+    results = {
+        locale: compare_locale_data(str(ctx.i18n_dir / f"{locale}.yaml"), data, base_keys)
+        for locale, data in ctx.locales.items()
+        if locale != BASE_LOCALE
+    }
+    print_matrix(str(ctx.i18n_dir / f"{BASE_LOCALE}.yaml"), len(base_keys), results, ctx.args.verbose)
+    return 1 if any(result["missing"] or result["extraneous"] for result in results.values()) else 0
+
+
+def run_keys(ctx: CheckContext) -> int:
+    swift_keys_dict, usage_sites = merge_key_usage(ctx.scan.key_usage)
+    print(f"Found {len(swift_keys_dict)} unique localization keys in {len(ctx.scan.key_usage)} Swift files.")
+    localized_keys = flatten_keys(ctx.locales[BASE_LOCALE])
+    return report_missing_keys(
+        swift_keys_dict, usage_sites, localized_keys, str(IOS_ROOT), ctx.args.show_locations
+    )
+
+
+def run_assets(ctx: CheckContext) -> int:
+    assets_path = ctx.args.assets.resolve()
+    if not assets_path.is_dir():
+        print(f"Error: assets catalog not found: {assets_path}")
+        return 2
+    try:
+        assets = assets_tool.collect_asset_names(
+            assets_path, assets_tool.normalize_asset_types(assets_tool.DEFAULT_ASSET_TYPES)
+        )
+    except ValueError as err:
+        print(f"Error: {err}")
+        return 2
+
+    exact_usage, possible_usage, scanned_files = assets_tool.find_asset_usage_in_literals(
+        assets, ctx.scan.asset_literals
+    )
+    used, maybe_used, unused = assets_tool.classify_asset_usage(
+        assets, exact_usage, possible_usage, strict_literals=False
+    )
+    sizes = assets_tool.measure_asset_sizes(assets)
+    unused = assets_tool.sort_by_reclaimable_bytes(unused, sizes)
+    unused_bytes = sum(sizes[name].total_bytes for name in unused)
+
+    print(f"Assets: {len(assets)} in {assets_path.name}, scanned {scanned_files} files")
+    print(f"Used: {len(used)}, maybe used: {len(maybe_used)}, unused: {len(unused)} "
+          f"({assets_tool.format_bytes(unused_bytes)} reclaimable)")
+    for name in unused:
+        print(f"  - {name} ({assets_tool.format_bytes(sizes[name].total_bytes)})")
+    return 1 if unused and ctx.args.fail_on_unused_assets else 0
+
+
+CHECK_RUNNERS: Dict[str, Callable[[CheckContext], int]] = {
+    "duplicates": run_duplicates,
+    "completeness": run_completeness,
+    "keys": run_keys,
+    "assets": run_assets,
+}
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} ms"
+
+
+def print_summary(shared: List[Tuple[str, float]], results: List[Tuple[str, int, float]]):
+    width = max(len(name) for name in [label for label, _ in shared] + [name for name, _, _ in results])
+    print("\n=== SUMMARY ===")
+    for label, elapsed in shared:
+        print(f"{label:<{width}}  {'':<6}  {format_ms(elapsed):>8}")
+    for name, code, elapsed in results:
+        status = "ok" if code == 0 else "failed" if code == 1 else "error"
+        print(f"{name:<{width}}  {status:<6}  {format_ms(elapsed):>8}")
+    total = sum(elapsed for _, elapsed in shared) + sum(elapsed for _, _, elapsed in results)
+    print(f"{'total':<{width}}  {'':<6}  {format_ms(total):>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the localization and asset checks with one locale parse and one source scan"
+    )
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=CHECKS,
+        help="Check to run (repeatable, default: all)"
+    )
+    parser.add_argument(
+        "--i18n-dir",
+        type=Path,
+        default=PROJECT_ROOT / "src/i18n",
+        help="Folder with the locale YAML files (default: src/i18n)"
+    )
+    parser.add_argument(
+        "--assets",
+        type=Path,
+        default=AIR_ROOT / "SubModules/WalletResources/Resources/Assets.xcassets",
+        help="Asset catalog checked by the assets check"
+    )
+    parser.add_argument(
+        "--fail-on-unused-assets",
+        action="store_true",
+        help="Make unused assets fail the run (they are only reported by default)"
+    )
+    parser.add_argument(
+        "--show-locations",
+        action="store_true",
+        help="List every file:line where each missing key is used"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Threads used to read source files (default: 8)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="List the missing and extraneous keys per locale"
+    )
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    with tracing.session(args, "run_checks"):
+        return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    selected = [name for name in CHECKS if name in (args.check or CHECKS)]
+
+    shared: List[Tuple[str, float]] = []
+    locales: Dict[str, Any] = {}
+    if {"completeness", "keys"} & set(selected):
+        started = time.perf_counter()
+        try:
+            with span("parse_yaml", dir=str(args.i18n_dir)):
+                locales = load_locales(sorted(args.i18n_dir.glob("*.yaml")))
+        except (OSError, yaml.YAMLError) as e:
+            print(f"Error loading locales from {args.i18n_dir}: {e}")
+            return 2
+        shared.append((f"load {len(locales)} locales", time.perf_counter() - started))
+        if BASE_LOCALE not in locales:
+            print(f"Error: {BASE_LOCALE}.yaml not found in {args.i18n_dir}")
+            return 2
+
+    scan = SourceScan()
+    if {"keys", "assets"} & set(selected):
+        started = time.perf_counter()
+        scan = scan_sources(IOS_ROOT, "keys" in selected, "assets" in selected, args.jobs)
+        shared.append((f"scan {scan.files_read} files", time.perf_counter() - started))
+
+    ctx = CheckContext(args=args, i18n_dir=args.i18n_dir, locales=locales, scan=scan)
+    results: List[Tuple[str, int, float]] = []
+    for name in selected:
+        print(f"\n▶ {name}")
+        started = time.perf_counter()
+        with span(name):
+            code = CHECK_RUNNERS[name](ctx)
+        results.append((name, code, time.perf_counter() - started))
+
+    print_summary(shared, results)
+    return max(code for _, code, _ in results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Regression tests for json_to_yaml's streaming JSON reader."""
+
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from json_to_yaml import iter_json_object  # noqa: E402
+
+DOCUMENT = (
+    '{"float": 1.25e3, "negative": -0.5, "exponent": 2.5E+10, "tiny": -12.75e-3, "int": 12345,'
+    ' "list": [1e-7, 0, 3.0], "nested": {"n": 1.0}, "text": "1.5", "yes": true, "none": null}'
+)
+
+
+class IterJsonObjectTest(unittest.TestCase):
+    def test_every_chunk_size_yields_the_same_object(self):
+        expected = json.loads(DOCUMENT)
+        for chunk_size in range(1, len(DOCUMENT) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(dict(iter_json_object(io.StringIO(DOCUMENT), chunk_size)), expected)
+
+    def test_invalid_number_is_still_rejected(self):
+        with self.assertRaises(json.JSONDecodeError):
+            dict(iter_json_object(io.StringIO('{"n": 1.}'), chunk_size=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
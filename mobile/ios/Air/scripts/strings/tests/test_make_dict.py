@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Regression tests for make_dict's .strings parser."""
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+STRINGS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(STRINGS_DIR))
+
+from make_dict import parse_strings  # noqa: E402
+
+PARSE_TIMEOUT = 10
+
+
+def parse_in_subprocess(text: str) -> dict:
+    """parse_strings(text) in a child process, so a runaway regex fails the test instead of hanging it."""
+    code = (
+        "import json, sys; from make_dict import parse_strings; "
+        "print(json.dumps(parse_strings(sys.stdin.read())))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        input=text, capture_output=True, text=True, cwd=STRINGS_DIR, timeout=PARSE_TIMEOUT, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+class ParseStringsTest(unittest.TestCase):
+    def test_entries_comments_and_unquoted_words(self):
+        text = (
+            '/* Block\n * comment */\n'
+            '"greeting" = "Hello // not a comment";\n'
+            '// line comment\n'
+            'key/* c */ = value; "url" = "a/*b*/c";\n'
+            '"escaped" = "Say \\"hi\\"\\n";\n'
+        )
+        self.assertEqual(parse_strings(text), {
+            "greeting": "Hello // not a comment",
+            "key": "value",
+            "url": "a/*b*/c",
+            "escaped": 'Say "hi"\n',
+        })
+
+    def test_malformed_entries_are_skipped(self):
+        self.assertEqual(parse_strings('"a" = ;\n"b" = "c";\n"d" "e";\n'), {"b": "c"})
+
+    def test_missing_semicolon_before_whitespace_run_parses_in_bounded_time(self):
+        # Once backtracked exponentially in the length of the whitespace run.
+        text = '"a" = "b"\n\n' + " " * 5000 + '"c" = "d";'
+        self.assertEqual(parse_in_subprocess(text), {"c": "d"})
+
+    def test_unterminated_comment_runs_parse_in_bounded_time(self):
+        for text in ('"a" = "b"' + "//" * 20000, "k" + " /**/" * 20000 + " = v", '"a" = ' + "x/" * 20000):
+            with self.subTest(text=text[:12]):
+                self.assertEqual(parse_in_subprocess(text), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Keep the localization and asset checks warm in a long-running process.
+
+`serve` loads the locales and reads the iOS sources once, then polls for changes every
+--interval seconds. It re-extracts only the files whose mtime or size changed, and reloads
+only the locale files that changed. Queries are answered from memory over a Unix socket,
+usually in a few milliseconds:
+
+    missing-keys          lang("key") usages whose key is not in en.yaml
+    unused-assets         asset catalog entries no source references
+    impact MODULE|FILE    SubModules that import the module (or the file's module), directly or not
+    diagnostics           missing keys and unused assets as `file:line:col: warning: ...` lines
+    status                what is loaded and when it last changed
+
+Usage:
+    python3 watch_checks.py serve &
+    python3 watch_checks.py query missing-keys
+    python3 watch_checks.py query impact WalletCore
+    python3 watch_checks.py query diagnostics
+
+`query diagnostics` prints the gcc-style lines most editors parse out of the box (a VS Code
+task with the "$gcc" problem matcher, Vim's quickfix, Xcode "Run Script" warnings), so the
+checks show up next to the code.
+
+The daemon watches src/i18n and the iOS tree (mobile/ios) only. Android sources are not polled,
+since none of the queries above reads them; use find_air_localizations.py for cross-platform key
+usage.
+
+Changes are found by polling rather than inotify/FSEvents, so the daemon behaves the same on
+macOS and Linux without extra packages. A directory is listed again only when its mtime changed;
+otherwise each poll stats the directories and the files they hold, about 10 ms on this tree when
+nothing changed. After a change the poll loop recomputes missing-keys, unused-assets and
+diagnostics, so the next query is answered from memory.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+import yaml
+
+from run_checks import AIR_ROOT, BASE_LOCALE, IOS_ROOT, PROJECT_ROOT, assets_tool, scan_directory
+
+sys.path.insert(0, str(AIR_ROOT / "scripts" / "dependency_graph"))
+
+from build_dependency_graph import IMPORT_PATTERN  # noqa: E402
+from find_unused_localization_keys import (  # noqa: E402
+    UsageSite,
+    extract_localization_keys_from_content,
+    merge_key_usage,
+)
+from i18n_core import flatten_keys, load_locale  # noqa: E402
+
+SUBMODULES_ROOT = AIR_ROOT / "SubModules"
+DEFAULT_ASSETS_PATH = SUBMODULES_ROOT / "WalletResources/Resources/Assets.xcassets"
+DEFAULT_I18N_DIR = PROJECT_ROOT / "src/i18n"
+# Kept short and outside the checkout: Unix socket paths are limited to ~104 bytes on macOS.
+DEFAULT_SOCKET_PATH = Path(tempfile.gettempdir()) / (
+    f"air-checks-{hashlib.sha1(str(PROJECT_ROOT).encode()).hexdigest()[:10]}.sock"
+)
+DEFAULT_POLL_INTERVAL = 1.0
+
+QUERIES = ("missing-keys", "unused-assets", "impact", "diagnostics", "status")
+
+# (mtime_ns, size)
+Signature = Tuple[int, int]
+# (mtime_ns, subdirectories, scan targets directly inside, whether it is inside SubModules)
+DirectoryListing = Tuple[int, List[Path], List[Tuple[Path, bool, bool]], bool]
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def directory_mtime(path: Union[str, Path]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class WatchState:
+    """
+    In-memory key, literal and import indexes of the iOS sources plus the loaded locales and
+    asset catalog. Only the polling thread mutates it; queries read it under `lock`.
+    """
+
+    def __init__(self, i18n_dir: Path, assets_path: Path, jobs: int):
+        self.i18n_dir = i18n_dir
+        self.assets_path = assets_path
+        self.jobs = jobs
+        self.lock = threading.Lock()
+
+        self.directories: Dict[Path, DirectoryListing] = {}
+        self.signatures: Dict[Path, Signature] = {}
+        self.key_usage: Dict[Path, Dict[str, List[UsageSite]]] = {}
+        self.literals: Dict[Path, Optional[Set[str]]] = {}
+        self.imports: Dict[Path, Set[str]] = {}
+        self.locale_signatures: Dict[Path, Signature] = {}
+        self.locales: Dict[str, Any] = {}
+        self.assets: Dict[str, Path] = {}
+        self.asset_directories: Dict[str, int] = {}
+
+        self.generation = 0
+        self.changed_at = 0.0
+        self.last_poll_ms = 0.0
+        self._cache: Dict[Tuple[str, str], Any] = {}
+
+    # Polling
+
+    def poll(self) -> List[str]:
+        """Bring every index up to date; returns a description of what changed."""
+        started = time.perf_counter()
+        changes = self._poll_locales() + self._poll_sources() + self._poll_assets()
+        with self.lock:
+            if changes:
+                self.generation += 1
+                self.changed_at = time.time()
+                self._cache.clear()
+            self.last_poll_ms = (time.perf_counter() - started) * 1000
+        return changes
+
+    def _poll_locales(self) -> List[str]:
+        changes = []
+        current = {path: file_signature(path) for path in sorted(self.i18n_dir.glob("*.yaml"))}
+        for path, signature in current.items():
+            if signature is None or self.locale_signatures.get(path) == signature:
+                continue
+            try:
+                data = load_locale(path)
+            except (OSError, yaml.YAMLError) as e:
+                # Keep serving the last good version while the file is mid-edit.
+                print(f"Warning: could not load {path}: {e}", file=sys.stderr)
+                continue
+            with self.lock:
+                self.locales[path.stem] = data
+                self.locale_signatures[path] = signature
+            changes.append(f"locale {path.name}")
+        for path in set(self.locale_signatures) - set(current):
+            with self.lock:
+                del self.locale_signatures[path]
+                self.locales.pop(path.stem, None)
+            changes.append(f"locale {path.name} removed")
+        return changes
+
+    def _list_directories(self) -> Dict[Path, DirectoryListing]:
+        """
+        Walk IOS_ROOT like iter_scan_targets, listing again only the directories whose mtime
+        changed. Adding, removing or renaming an entry bumps its directory's mtime; editing a
+        file in place does not, so file signatures are still checked on every poll.
+        """
+        listings: Dict[Path, DirectoryListing] = {}
+        pending = [IOS_ROOT.resolve()]
+        while pending:
+            directory = pending.pop()
+            mtime = directory_mtime(directory)
+            if mtime is None:
+                continue
+            listing = self.directories.get(directory)
+            if listing is None or listing[0] != mtime:
+                subdirs, targets = scan_directory(directory, True, True)
+                in_submodules = directory == SUBMODULES_ROOT or SUBMODULES_ROOT in directory.parents
+                listing = (mtime, [directory / name for name in subdirs], targets, in_submodules)
+            listings[directory] = listing
+            pending.extend(listing[1])
+        return listings
+
+    def _poll_sources(self) -> List[str]:
+        listings = self._list_directories()
+        targets: Dict[Path, Tuple[bool, bool, bool, Signature]] = {}
+        for _, _, directory_targets, in_submodules in listings.values():
+            for path, wants_keys, wants_literals in directory_targets:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signature = (st.st_mtime_ns, st.st_size)
+                targets[path] = (wants_keys, wants_literals, wants_keys and in_submodules, signature)
+        self.directories = listings
+
+        changed = [path for path, target in targets.items() if self.signatures.get(path) != target[3]]
+        removed = [path for path in self.signatures if path not in targets]
+        if not changed and not removed:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as executor:
+            extracted = list(executor.map(lambda path: extract_file(path, *targets[path][:3]), changed))
+
+        with self.lock:
+            for path in removed:
+                for index in (self.signatures, self.key_usage, self.literals, self.imports):
+                    index.pop(path, None)
+            for path, (keys, literals, imports) in zip(changed, extracted):
+                wants_keys, wants_literals, wants_imports, signature = targets[path]
+                self.signatures[path] = signature
+                for index, wanted, value in (
+                    (self.key_usage, wants_keys, keys),
+                    (self.literals, wants_literals, literals),
+                    (self.imports, wants_imports, imports),
+                ):
+                    if wanted:
+                        index[path] = value
+                    else:
+                        index.pop(path, None)
+
+        if len(changed) + len(removed) > 5:
+            return [f"{len(changed)} source files changed, {len(removed)} removed"]
+        return [str(path.relative_to(IOS_ROOT)) for path in changed] + [
+            f"{path.relative_to(IOS_ROOT)} removed" for path in removed
+        ]
+
+    def _poll_assets(self) -> List[str]:
+        # Asset names come from directory names alone, so a catalog whose directories all kept
+        # their mtimes cannot have changed.
+        if self.asset_directories and all(
+            directory_mtime(directory) == mtime for directory, mtime in self.asset_directories.items()
+        ):
+            return []
+        asset_directories = {root: directory_mtime(root) for root, _, _ in os.walk(self.assets_path)}
+        try:
+            assets = assets_tool.collect_asset_names(
+                self.assets_path, assets_tool.normalize_asset_types(assets_tool.DEFAULT_ASSET_TYPES)
+            )
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not read {self.assets_path}: {e}", file=sys.stderr)
+            return []
+        self.asset_directories = asset_directories
+        if assets == self.assets:
+            return []
+        with self.lock:
+            self.assets = assets
+        return ["asset catalog"]
+
+    # Queries
+
+    def answer(self, query: str, arg: str = "") -> Any:
+        if query not in QUERIES:
+            raise ValueError(f"unknown query '{query}', expected one of: {', '.join(QUERIES)}")
+        if query == "impact" and not arg:
+            raise ValueError("impact needs a module name or a Swift file path")
+        with self.lock:
+            if query == "status":
+                return self._status()
+            return self._cached(query, arg)
+
+    def _cached(self, query: str, arg: str = "") -> Any:
+        """The answer to `query` for the current generation; call with `lock` held."""
+        cache_key = (query, arg)
+        if cache_key not in self._cache:
+            handler = {
+                "missing-keys": self._missing_keys,
+                "unused-assets": self._unused_assets,
+                "impact": self._impact,
+                "diagnostics": self._diagnostics,
+            }[query]
+            self._cache[cache_key] = handler(arg) if query == "impact" else handler()
+        return self._cache[cache_key]
+
+    def _status(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "changed_at": self.changed_at,
+            "last_poll_ms": round(self.last_poll_ms, 1),
+            "locales": sorted(self.locales),
+            "swift_files": len(self.key_usage),
+            "literal_files": len(self.literals),
+            "module_files": len(self.imports),
+            "assets": len(self.assets),
+        }
+
+    def _missing_keys(self) -> List[Dict[str, Any]]:
+        swift_keys, usage_sites = merge_key_usage((str(path), keys) for path, keys in self.key_usage.items())
+        localized = flatten_keys(self.locales.get(BASE_LOCALE, {}))
+        return [
+            {
+                "key": key,
+                "sites": sorted(({"file": file_path, "line": line} for file_path, line, _ in usage_sites[key]),
+                                key=lambda site: (site["file"], site["line"])),
+            }
+            for key in sorted(set(swift_keys) - localized)
+        ]
+
+    def _unused_assets(self) -> List[Dict[str, Any]]:
+        exact, possible, _ = assets_tool.find_asset_usage_in_literals(self.assets, self.literals.items())
+        _, _, unused = assets_tool.classify_asset_usage(self.assets, exact, possible, strict_literals=False)
+        sizes = {name: assets_tool.measure_asset_size(self.assets[name]) for name in unused}
+        return [
+            {"name": name, "path": str(self.assets[name]), "bytes": sizes[name].total_bytes}
+            for name in assets_tool.sort_by_reclaimable_bytes(unused, sizes)
+        ]
+
+    def _module_of(self, path: Path) -> Optional[str]:
+        try:
+            return path.resolve().relative_to(SUBMODULES_ROOT).parts[0]
+        except (ValueError, IndexError):
+            return None
+
+    def _impact(self, target: str) -> Dict[str, Any]:
+        module = target
+        if target.endswith(".swift") or os.sep in target:
+            module = self._module_of(Path(target))
+            if module is None:
+                raise ValueError(f"{target} is not inside {SUBMODULES_ROOT}")
+
+        imports_by_module: Dict[str, Set[str]] = {}
+        for path, imports in self.imports.items():
+            importer = self._module_of(path)
+            if importer is not None:
+                imports_by_module.setdefault(importer, set()).update(imports)
+        if module not in imports_by_module:
+            raise ValueError(f"unknown module '{module}'")
+
+        dependents: Dict[str, Set[str]] = {name: set() for name in imports_by_module}
+        for importer, imports in imports_by_module.items():
+            for imported in imports & dependents.keys():
+                if imported != importer:
+                    dependents[imported].add(importer)
+
+        seen: Set[str] = set()
+        queue = deque([module])
+        while queue:
+            for dependent in dependents[queue.popleft()]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        seen.discard(module)
+        return {
+            "module": module,
+            "direct_dependents": sorted(dependents[module]),
+            "all_dependents": sorted(seen),
+        }
+
+    def _diagnostics(self) -> List[str]:
+        lines = [
+            f"{site['file']}:{site['line']}:1: warning: localization key '{entry['key']}' is missing from "
+            f"{BASE_LOCALE}.yaml"
+            for entry in self._cached("missing-keys")
+            for site in entry["sites"]
+        ]
+        lines += [
+            f"{Path(asset['path']) / 'Contents.json'}:1:1: warning: asset '{asset['name']}' is not referenced "
+            f"({assets_tool.format_bytes(asset['bytes'])})"
+            for asset in self._cached("unused-assets")
+        ]
+        return lines
+
+
+def extract_file(
+    path: Path,
+    wants_keys: bool,
+    wants_literals: bool,
+    wants_imports: bool,
+) -> Tuple[Dict[str, List[UsageSite]], Optional[Set[str]], Set[str]]:
+    """Read a file once and extract keys, literals and imports as requested."""
+    try:
+        content = path.read_bytes().decode("utf-8", errors="ignore")
+    except OSError:
+        return {}, None, set()
+    keys = extract_localization_keys_from_content(content, str(path)) if wants_keys else {}
+    literals = assets_tool.extract_string_literals(content) if wants_literals else None
+    imports = set(IMPORT_PATTERN.findall(content)) if wants_imports else set()
+    return keys, literals, imports
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON response line out."""
+
+    def handle(self):
+        started = time.perf_counter()
+        state: WatchState = self.server.state
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+            result = state.answer(str(request.get("query", "")), str(request.get("arg") or ""))
+            response = {"ok": True, "generation": state.generation, "result": result}
+        except ValueError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Anything else is a daemon bug or a file that vanished mid-query; the client still
+            # gets an answer, and the traceback stays in the daemon's log.
+            traceback.print_exc()
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class QueryServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, state: WatchState):
+        self.state = state
+        super().__init__(str(socket_path), QueryHandler)
+
+
+def send_request(socket_path: Path, query: str, arg: str = "", timeout: float = 30.0) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps({"query": query, "arg": arg}).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ValueError("the daemon closed the connection without answering")
+    response = json.loads(line)
+    if not isinstance(response, dict) or "ok" not in response:
+        raise ValueError(f"unexpected response {line[:200]!r}")
+    return response
+
+
+def serve(args) -> int:
+    socket_path: Path = args.socket
+    if socket_path.exists():
+        try:
+            send_request(socket_path, "status", timeout=1.0)
+        except OSError:
+            socket_path.unlink()  # left behind by a daemon that did not shut down cleanly
+        except ValueError:
+            print(f"Error: {socket_path} is in use by something that is not a check daemon", file=sys.stderr)
+            return 1
+        else:
+            print(f"Error: a daemon is already listening on {socket_path}", file=sys.stderr)
+            return 1
+
+    state = WatchState(args.i18n_dir, args.assets, args.jobs)
+    started = time.perf_counter()
+    state.poll()
+    status = state.answer("status")
+    print(
+        f"Loaded {len(status['locales'])} locales, {status['swift_files']} Swift files, "
+        f"{status['literal_files']} files with literals and {status['assets']} assets "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+
+    # Ctrl+C raises KeyboardInterrupt; make `kill` clean up the socket the same way.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server = QueryServer(socket_path, state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Listening on {socket_path}, polling every {args.interval:g}s (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            changes = state.poll()
+            if changes:
+                # Warm every generation-wide query so the next editor request is a cache hit;
+                # diagnostics is built from the other two.
+                state.answer("diagnostics")
+                missing = len(state.answer("missing-keys"))
+                unused = len(state.answer("unused-assets"))
+                print(
+                    f"[{time.strftime('%H:%M:%S')}] {', '.join(changes)}: {missing} missing keys, "
+                    f"{unused} unused assets (poll {state.last_poll_ms:.0f} ms)"
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def print_result(query: str, result: Any):
+    if query == "missing-keys":
+        for entry in result:
+            sites = ", ".join(
+                f"{os.path.relpath(site['file'], IOS_ROOT)}:{site['line']}" for site in entry["sites"]
+            )
+            print(f"  - '{entry['key']}' ({sites})")
+        print(f"{len(result)} missing keys")
+    elif query == "unused-assets":
+        for asset in result:
+            print(f"  - {asset['name']} ({assets_tool.format_bytes(asset['bytes'])})")
+        print(f"{len(result)} unused assets")
+    elif query == "impact":
+        print(f"{result['module']}: {len(result['direct_dependents'])} direct, "
+              f"{len(result['all_dependents'])} total dependents")
+        for module in result["all_dependents"]:
+            marker = "*" if module in result["direct_dependents"] else " "
+            print(f"  {marker} {module}")
+    elif query == "diagnostics":
+        for line in result:
+            print(line)
+    else:
+        for key, value in result.items():
+            print(f"{key}: {value}")
+
+
+def query(args) -> int:
+    try:
+        response = send_request(args.socket, args.query, args.arg or "")
+    except OSError as e:
+        print(f"Error: no daemon on {args.socket} ({e}); start one with: {sys.argv[0]} serve", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(f"Error: invalid response from the daemon on {args.socket}: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+    elif not response["ok"]:
+        print(f"Error: {response['error']}", file=sys.stderr)
+    else:
+        print_result(args.query, response["result"])
+    if not response["ok"]:
+        return 2
+    has_issues = args.query in ("missing-keys", "unused-assets", "diagnostics") and response["result"]
+    return 1 if has_issues else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Keep localization and asset checks warm and answer queries")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket the daemon listens on (default: {DEFAULT_SOCKET_PATH})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the watcher and answer queries")
+    serve_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Seconds between polls (default: {DEFAULT_POLL_INTERVAL:g})"
+    )
+    serve_parser.add_argument(
+        "--i18n-dir",
+        type=Path,
+        default=DEFAULT_I18N_DIR,
+        help="Folder with the locale YAML files (default: src/i18n)"
+    )
+    serve_parser.add_argument(
+        "--assets",
+        type=Path,
+        default=DEFAULT_ASSETS_PATH,
+        help="Asset catalog to check for unused entries"
+    )
+    serve_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Threads used to read changed files (default: 8)"
+    )
+    serve_parser.set_defaults(handler=serve)
+
+    query_parser = subparsers.add_parser("query", help="Ask a running daemon")
+    query_parser.add_argument("query", choices=QUERIES)
+    query_parser.add_argument("arg", nargs="?", help="Module name or Swift file for impact")
+    query_parser.add_argument("--json", action="store_true", help="Print the raw JSON response")
+    query_parser.set_defaults(handler=query)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
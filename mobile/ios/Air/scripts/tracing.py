@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Phase tracing and profiling shared by the i18n and asset scripts.
+
+Scripts mark their phases (walk, read, parse_yaml, extract, match, serialize, write) with span():
+
+    from tracing import span
+
+    with span("parse_yaml", path=str(path)) as info:
+        data = yaml.load(...)
+        info["keys"] = len(data)
+
+Spans cost next to nothing until a run enables tracing. Scripts opt in with two flags:
+
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    with tracing.session(args, "find_unused_assets"):
+        ...
+
+--trace out.json writes every span in Chrome trace-event format; open it in chrome://tracing,
+https://ui.perfetto.dev or speedscope. --profile [N] runs the session under cProfile and prints the
+N functions with the highest cumulative time to stderr.
+
+Work done in worker processes can be added with record(), given the start and duration the worker
+measured with time.perf_counter(). That clock is system-wide on Linux and macOS, so worker spans
+line up with the parent's.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_PROFILE_LINES = 30
+
+# Handed out by span() while tracing is off; whatever callers store in it is ignored.
+_DISCARDED_ARGS: Dict[str, Any] = {}
+_DISABLED_SPAN = contextlib.nullcontext(_DISCARDED_ARGS)
+
+
+class Tracer:
+    """Collects complete ("X") trace events; appends are atomic, so threads can share one."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self.pid = os.getpid()
+
+    def record(
+        self,
+        name: str,
+        started: float,
+        duration: float,
+        args: Optional[Dict[str, Any]] = None,
+        pid: Optional[int] = None,
+        tid: Optional[int] = None,
+    ):
+        """Add a span from perf_counter() seconds, measured here or in a worker process."""
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": started * 1e6,
+            "dur": duration * 1e6,
+            "pid": self.pid if pid is None else pid,
+            "tid": threading.get_native_id() if tid is None else tid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record(name, started, time.perf_counter() - started, args)
+
+    def span(self, name: str, **args: Any):
+        """Time the enclosed block as `name`; the yielded dict becomes the span's args."""
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return self._span(name, args)
+
+    def write(self, path: Path, process_name: str):
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": process_name}}]
+        for pid in sorted({event["pid"] for event in self.events} - {self.pid}):
+            metadata.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{process_name} worker"}})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **args: Any):
+    return TRACER.span(name, **args)
+
+
+def record(name: str, started: float, duration: float, args: Optional[Dict[str, Any]] = None, pid: Optional[int] = None):
+    TRACER.record(name, started, duration, args, pid=pid, tid=pid)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--trace", type=Path, metavar="OUT.json",
+                        help="Write phase timings in Chrome trace-event format (chrome://tracing, Perfetto)")
+    parser.add_argument("--profile", nargs="?", type=int, const=DEFAULT_PROFILE_LINES, metavar="N",
+                        help=f"Run under cProfile and print the top N functions by cumulative time "
+                             f"(default: {DEFAULT_PROFILE_LINES})")
+
+
+def print_profile(profiler: cProfile.Profile, lines: int):
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).strip_dirs().sort_stats("cumulative").print_stats(lines)
+    print(output.getvalue().rstrip(), file=sys.stderr)
+
+
+@contextlib.contextmanager
+def session(args: argparse.Namespace, name: str) -> Iterator[None]:
+    """Trace and/or profile the enclosed run as requested by add_arguments()'s flags."""
+    trace_path = getattr(args, "trace", None)
+    profile_lines = getattr(args, "profile", None)
+    profiler = cProfile.Profile() if profile_lines else None
+    TRACER.enabled = trace_path is not None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        with span(name, argv=sys.argv[1:]):
+            yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            print_profile(profiler, profile_lines)
+        if trace_path is not None:
+            TRACER.write(trace_path, name)
+            TRACER.enabled = False
+            print(f"Trace with {len(TRACER.events)} spans written to {trace_path}", file=sys.stderr)